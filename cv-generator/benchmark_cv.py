@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Scaling benchmark for the CV generator.
+
+Builds synthetic copies of the website data with journals.json and
+projects.json scaled to N entries each (cloned from the real entries, with
+Korean titles, journals and author names mixed in) and times every stage of
+one CV build on them: imports, load_cv_data, validate_inputs, font
+registration, context/style setup, each entry of SECTION_BUILDERS and
+doc.build. Each size runs in a fresh process, so import costs, caches and the
+peak memory (max RSS after each stage) are those of a cold single build. Each
+size is run --repeat times (3 by default) and the median time of every stage
+is reported and compared, so one slow run does not read as a regression.
+
+    python benchmark_cv.py                                  # 1k and 10k entries
+    python benchmark_cv.py --sizes 1000,10000,100000 --save-baseline
+    python benchmark_cv.py --compare                        # exit 1 on regressions
+
+Results are written to output/benchmarks/ (local only). The baseline is
+benchmarks/baseline.json, committed next to this script (1k and 10k entries,
+English, medians of 5 runs). Timings depend on the machine: re-record it with
+--save-baseline where --compare runs, and commit it when a change is meant to
+move the numbers.
+"""
+
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: no peak-RSS measurement
+    resource = None
+
+SCRIPT_DIR = Path(__file__).parent
+REAL_DATA_DIR = SCRIPT_DIR.parent / "src" / "data"
+BENCH_DIR = SCRIPT_DIR / "output" / "benchmarks"
+BASELINE = SCRIPT_DIR / "benchmarks" / "baseline.json"
+
+DEFAULT_SIZES = [1000, 10000]
+
+# Copied unchanged into every synthetic data set.
+STATIC_FILES = ["professor.json", "IF.json", "members.json", "preprints.json", "conferences.json"]
+
+KOREAN_SURNAMES = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임"]
+KOREAN_GIVEN = ["민준", "서연", "도윤", "지우", "하준", "서윤", "예준", "하은", "주원", "지호"]
+KOREAN_JOURNALS = ["대한금속·재료학회지", "소성가공", "대한기계학회논문집 A권", "한국정밀공학회지"]
+KOREAN_TITLE_ENDINGS = ["에 관한 연구", "의 예측 및 검증", "을 위한 데이터 기반 접근", "의 미세조직 해석"]
+
+
+def synthesize(dest, size, seed=0, source=REAL_DATA_DIR):
+    """Write a data set with `size` journal articles and `size` projects to dest."""
+    rng = random.Random(seed)
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    for name in STATIC_FILES:
+        (dest / name).write_bytes((source / name).read_bytes())
+
+    journals = json.loads((source / "journals.json").read_text(encoding="utf-8"))
+    projects = json.loads((source / "projects.json").read_text(encoding="utf-8"))
+    # Korean vocabulary taken from the real (Korean) project titles
+    words = [w for p in projects if isinstance(p['title'], dict)
+             for w in p['title'].get('ko', '').split() if len(w) > 1]
+
+    def korean_name():
+        return rng.choice(KOREAN_SURNAMES) + rng.choice(KOREAN_GIVEN)
+
+    out = []
+    for i in range(size):
+        pub = copy.deepcopy(rng.choice(journals))
+        pub['id'] = f"pub{i + 1}"
+        pub.pop('status', None)
+        if rng.random() < 0.15:
+            pub['title'] = " ".join(rng.sample(words, 4)) + rng.choice(KOREAN_TITLE_ENDINGS)
+            pub['journal'] = rng.choice(KOREAN_JOURNALS)
+            pub['authors'] = [korean_name() for _ in range(rng.randint(2, 5))] + ["Ho Won Lee^*"]
+        elif rng.random() < 0.02:
+            pub['status'] = 'submitted'
+        out.append(pub)
+    out_projects = []
+    for i in range(size):
+        proj = copy.deepcopy(rng.choice(projects))
+        proj['id'] = f"proj{i + 1}"
+        if isinstance(proj['title'], dict) and proj['title'].get('ko'):
+            proj['title']['ko'] += f" ({i + 1}차)"
+        out_projects.append(proj)
+
+    (dest / "journals.json").write_text(json.dumps(out, ensure_ascii=False), encoding="utf-8")
+    (dest / "projects.json").write_text(json.dumps(out_projects, ensure_ascii=False), encoding="utf-8")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1 << 20 if sys.platform == 'darwin' else 1 << 10), 1)
+
+
+def run_stages(lang, full_history, workdir, stream=False):
+    """Time one CV build stage by stage in this process (LABDATA_DIR must
+    already point at the data set). Returns {'stages': ..., 'counts': ...}.
+
+    With stream, the sections are streamed into layout as render_pdf() does,
+    and are timed together with it as one "stream build" stage."""
+    import importlib
+    stages = {}
+
+    def stage(name, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        stages[name] = {'seconds': round(time.perf_counter() - start, 4), 'peak_rss_mb': peak_rss_mb()}
+        return result
+
+    cv_inputs = stage("import cv_inputs", importlib.import_module, "cv_inputs")
+    cv_pdf = stage("import cv_pdf", importlib.import_module, "cv_pdf")
+    data = stage("load_cv_data", cv_inputs.load_cv_data)
+    scope = cv_inputs.FULL_HISTORY if full_history else cv_inputs.PublicationScope()
+    stage("validate_inputs", cv_inputs.validate_inputs, data, lang, scope)
+    person = cv_inputs.professor_person(data['professor'])
+    stage("fonts", cv_pdf.ensure_fonts_registered)
+    ctx = stage("context", cv_pdf.cv_context, data, lang, person, scope)
+
+    output = Path(workdir) / "benchmark.pdf"
+    doc = cv_pdf.cv_document(output)
+    if stream:
+        story = cv_pdf.StreamingStory(f for build_section in cv_pdf.SECTION_BUILDERS
+                                      for f in build_section(ctx))
+        stage("stream build", doc.build, story)
+        flowables = story.consumed
+    else:
+        story = []
+        for build_section in cv_pdf.SECTION_BUILDERS:
+            story.extend(stage(f"section {build_section.__name__}", lambda: list(build_section(ctx))))
+        flowables = len(story)  # doc.build() consumes the story
+        stage("doc.build", doc.build, story)
+    return {
+        'stages': stages,
+        'counts': {'journals': len(data['journals']), 'projects': len(data['projects']),
+                   'flowables': flowables, 'pages': doc.page, 'pdf_bytes': output.stat().st_size},
+    }
+
+
+def run_size(size, args):
+    """Synthesize one data set and benchmark it in fresh processes (median of
+    args.repeat runs per stage; peak memory is the maximum)."""
+    with tempfile.TemporaryDirectory(prefix="cv-bench-") as tmp:
+        data_dir = Path(tmp) / "data"
+        # In a child process: Linux carries the max RSS across fork/exec, so a
+        # large data set built here would show up in every worker's peak.
+        subprocess.run([sys.executable, str(Path(__file__).resolve()), "--synthesize", str(data_dir),
+                        "--sizes", str(size), "--seed", str(args.seed)], check=True)
+        cmd = [sys.executable, str(Path(__file__).resolve()), "--worker", "--lang", args.lang]
+        if args.full_history:
+            cmd.append("--full-history")
+        if args.stream:
+            cmd.append("--stream")
+        # Compiled pickles of the synthetic data go to the tempdir too, not labdata/.cache/
+        env = {**os.environ, "LABDATA_DIR": str(data_dir), "LABDATA_CACHE": str(Path(tmp) / "cache"),
+               "BENCH_WORKDIR": tmp}
+        runs = []
+        for _ in range(args.repeat):
+            proc = subprocess.run(cmd, env=env, cwd=SCRIPT_DIR, capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise RuntimeError(f"benchmark worker failed for {size} entries:\n{proc.stderr}")
+            runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    stages = {}
+    for name in runs[0]['stages']:
+        samples = [run['stages'][name] for run in runs]
+        rss = [s['peak_rss_mb'] for s in samples if s['peak_rss_mb'] is not None]
+        stages[name] = {'seconds': round(statistics.median(s['seconds'] for s in samples), 4),
+                        'peak_rss_mb': max(rss) if rss else None}
+    return {'stages': stages, 'counts': runs[0]['counts']}
+
+
+def print_results(results, baseline=None):
+    for size, result in results.items():
+        counts = result['counts']
+        print(f"\n== {int(size):,} journals / projects: {counts['flowables']:,} flowables, "
+              f"{counts['pages']:,} pages, {counts['pdf_bytes'] / 1024:,.0f} KB")
+        base = (baseline or {}).get(size, {}).get('stages', {})
+        total = 0.0
+        for name, s in result['stages'].items():
+            total += s['seconds']
+            line = f"  {name:<28} {s['seconds']:>9.3f} s  {s['peak_rss_mb'] or 0:>8.1f} MB"
+            if name in base and base[name]['seconds']:
+                line += f"  ({s['seconds'] / base[name]['seconds']:.2f}x baseline)"
+            print(line)
+        print(f"  {'total':<28} {total:>9.3f} s")
+
+
+def regressions(results, baseline, time_tolerance, memory_tolerance, min_delta):
+    """Stages slower (or more memory-hungry) than the baseline beyond the tolerances."""
+    found = []
+    for size, result in results.items():
+        base = baseline.get(size)
+        if not base:
+            continue
+        for name, s in result['stages'].items():
+            b = base['stages'].get(name)
+            if not b:
+                continue
+            if (s['seconds'] > b['seconds'] * (1 + time_tolerance) and
+                    s['seconds'] - b['seconds'] > min_delta):
+                found.append(f"{int(size):,}: {name} {b['seconds']:.3f} s -> {s['seconds']:.3f} s")
+        peak = max((s['peak_rss_mb'] or 0) for s in result['stages'].values())
+        base_peak = max((s['peak_rss_mb'] or 0) for s in base['stages'].values())
+        if base_peak and peak > base_peak * (1 + memory_tolerance):
+            found.append(f"{int(size):,}: peak memory {base_peak:.0f} MB -> {peak:.0f} MB")
+    return found
+
+
+def parse_sizes(text):
+    return [int(float(s)) for s in text.split(",") if s.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=parse_sizes, default=DEFAULT_SIZES,
+                        help="comma-separated journal/project counts (default: 1000,10000)")
+    parser.add_argument('--lang', choices=['en', 'ko'], default='en')
+    parser.add_argument('--full-history', action='store_true',
+                        help="list every publication instead of the default 2024- range")
+    parser.add_argument('--stream', action='store_true',
+                        help="stream the sections into layout (as the generator does) instead of "
+                             "building and timing them one by one")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="runs per size; the median time per stage is reported (default: 3, "
+                             "at least 3 with --save-baseline)")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic data seed")
+    parser.add_argument('--save-baseline', action='store_true',
+                        help=f"store the results as the baseline ({BASELINE.relative_to(SCRIPT_DIR)})")
+    parser.add_argument('--compare', nargs='?', const=BASELINE, type=Path, metavar='FILE',
+                        help="compare with a baseline and exit 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed slowdown per stage (default: 0.25 = 25%%)")
+    parser.add_argument('--memory-tolerance', type=float, default=0.20,
+                        help="allowed growth of peak memory (default: 0.20)")
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help="ignore slowdowns below this many seconds (default: 0.05; short "
+                             "stages such as the imports jitter by tens of ms)")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--synthesize', type=Path, metavar='DIR',
+                        help="only write a synthetic data set of the first --sizes entry to DIR "
+                             "(use it with LABDATA_DIR=DIR)")
+    args = parser.parse_args(argv)
+    if args.save_baseline and args.repeat < 3:
+        parser.error("--save-baseline needs --repeat 3 or more (one run is too noisy to compare with)")
+
+    if args.synthesize:
+        synthesize(args.synthesize, args.sizes[0], seed=args.seed)
+        return None
+    if args.worker:
+        result = run_stages(args.lang, args.full_history, os.environ.get("BENCH_WORKDIR", tempfile.gettempdir()),
+                            stream=args.stream)
+        print(json.dumps(result))
+        return result
+
+    results = {}
+    for size in args.sizes:
+        print(f"benchmarking {size:,} entries...", file=sys.stderr)
+        results[str(size)] = run_size(size, args)
+
+    baseline = None
+    if args.compare:
+        if not args.compare.exists():
+            parser.error(f"no baseline at {args.compare} (run with --save-baseline first)")
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))['results']
+    print_results(results, baseline)
+
+    report = {
+        'meta': {'date': datetime.now().isoformat(timespec='seconds'), 'python': platform.python_version(),
+                 'platform': platform.platform(), 'lang': args.lang, 'full_history': args.full_history,
+                 'stream': args.stream,
+                 'repeat': args.repeat, 'seed': args.seed},
+        'results': results,
+    }
+    BENCH_DIR.mkdir(parents=True, exist_ok=True)
+    out = BENCH_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nresults: {out}")
+    if args.save_baseline:
+        BASELINE.parent.mkdir(exist_ok=True)
+        BASELINE.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline: {BASELINE}")
+
+    if baseline is not None:
+        found = regressions(results, baseline, args.tolerance, args.memory_tolerance, args.min_delta)
+        for message in found:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+        print("no regressions against the baseline")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Inputs of the AIMAP Lab CV generator: data files, profile photo and font
+candidates, plus loading and validation. Kept free of reportlab so that
+validation (generate_cv.py --check) and the build-cache fingerprint run
+without importing the PDF toolchain.
+"""
+
+import os
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from labdata import DATA_DIR, store, trace  # noqa: E402  shared src/data loader
+
+# Korean font files, in preference order (registered by cv_pdf).
+KOREAN_FONT_PATHS = [
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # macOS
+    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",  # macOS alternative
+    "/Library/Fonts/NanumGothic.ttf",  # If installed
+    "C:/Windows/Fonts/malgun.ttf",  # Windows
+]
+
+HOME = os.path.expanduser("~")
+KFONT_CANDIDATES = [
+    (HOME + "/Library/Fonts/NanumSquareNeo-bRg.ttf", HOME + "/Library/Fonts/NanumSquareNeo-cBd.ttf"),
+    ("/Library/Fonts/NanumSquareNeo-bRg.ttf", "/Library/Fonts/NanumSquareNeo-cBd.ttf"),
+    ("/Library/Fonts/NanumGothic.ttf", "/Library/Fonts/NanumGothicBold.ttf"),
+]
+
+
+# Paths
+SCRIPT_DIR = Path(__file__).parent
+OUTPUT_DIR = SCRIPT_DIR / "output"
+CACHE_DIR = OUTPUT_DIR / ".cache"
+FONT_CACHE_DIR = CACHE_DIR / "fonts"
+
+# Everything load_cv_data() reads, keyed by its bundle name.
+CV_DATA_FILES = {
+    'professor': "professor.json",
+    'journals': "journals.json",
+    'preprints': "preprints.json",
+    'conferences': "conferences.json",
+    'projects': "projects.json",
+    'if_data': "IF.json",
+}
+MEMBERS_FILE = "members.json"
+MEMBER_GROUPS = ['researchers', 'phdStudents', 'msStudents', 'Intern', 'alumni']
+
+LANGS = ['en', 'ko']
+
+
+def read_json(filename):
+    """Parse one data file (through the shared labdata store, so repeated reads
+    in one process are free); raise ValueError with a one-line reason on failure.
+    The result is shared and must not be modified."""
+    filepath = DATA_DIR / filename
+    if not filepath.exists():
+        raise ValueError(f"data file not found: {filepath}")
+    try:
+        return store.load(Path(filename).stem)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"{filename}: {e}") from e
+
+
+def load_json(filename):
+    """Load JSON data from the data directory."""
+    try:
+        return read_json(filename)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def load_cv_data():
+    """Load and bundle all CV data files."""
+    with trace.span("load_cv_data"):
+        return {key: load_json(filename) for key, filename in CV_DATA_FILES.items()}
+
+
+KO_REQUIRED_KEYS = [
+    'name', 'header_title', 'header_org', 'experience', 'education',
+    'Research Interests', 'Honors and Awards',
+    'Professional Activities/Memberships',
+]
+
+
+def input_errors(data, lang, scope=None):
+    """Every structural problem in the loaded CV data for one language.
+    preprints.json and conferences.json are only checked when scope lists
+    them (all files when scope is None, as --check does)."""
+    errors = []
+    professor = data['professor']
+    for key in ['name', 'email', 'phone', 'experience', 'education']:
+        if not professor.get(key):
+            errors.append(f"professor.json: missing required key '{key}'")
+    sources = [('journals', 'journal')]
+    if scope is None or scope.preprints:
+        sources.append(('preprints', 'journal'))
+    if scope is None or scope.conferences:
+        sources.append(('conferences', 'Conference Name'))
+    for name, venue in sources:
+        for pub in data[name]:
+            for key in ['year', 'id', 'authors', 'title', venue]:
+                if key not in pub:
+                    errors.append(f"{name}.json: entry {pub.get('id', '?')} missing '{key}'")
+    for proj in data['projects']:
+        for key in ['title', 'period', 'role']:
+            if key not in proj:
+                errors.append(f"projects.json: entry missing '{key}': {str(proj)[:60]}")
+    if lang == 'ko':
+        kod = professor.get('ko')
+        if not kod:
+            errors.append("professor.json: Korean CV requires a 'ko' key")
+        else:
+            for key in KO_REQUIRED_KEYS:
+                if key not in kod:
+                    errors.append(f"professor.json: 'ko' missing '{key}'")
+    return errors
+
+
+def validate_inputs(data, lang, scope=None):
+    """Fail loudly on structurally broken data instead of silently rendering
+    an incomplete CV. scope is the PublicationScope being rendered."""
+    errors = input_errors(data, lang, scope)
+    if errors:
+        for err in errors:
+            print(f"error: {err}", file=sys.stderr)
+        sys.exit(1)
+
+
+def member_errors(members):
+    """Problems in members.json that would break a member CV."""
+    errors, seen = [], set()
+    for group in MEMBER_GROUPS:
+        for m in members.get(group, []):
+            if not m.get('id') or not m.get('name'):
+                errors.append(f"{MEMBERS_FILE}: {group} entry missing 'id' or 'name': {str(m)[:60]}")
+            elif m['id'] in seen:
+                errors.append(f"{MEMBERS_FILE}: duplicate id '{m['id']}'")
+            seen.add(m.get('id'))
+    return errors
+
+
+def check_inputs(langs):
+    """All input errors for the given languages, without stopping at the first
+    bad file. Unreadable files are reported and the rest is still checked."""
+    errors, data = [], {}
+    for key, filename in {**CV_DATA_FILES, 'members': MEMBERS_FILE}.items():
+        try:
+            data[key] = read_json(filename)
+        except ValueError as e:
+            errors.append(str(e))
+    if all(key in data for key in CV_DATA_FILES):
+        for lang in langs:
+            errors.extend(e for e in input_errors(data, lang) if e not in errors)
+    if 'members' in data:
+        errors.extend(member_errors(data['members']))
+    return errors
+
+
+# ---------------------------------------------------------------------------
+# Publication scope
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class PublicationScope:
+    """Which publications the CV lists. The default is the journal articles
+    (and in-submission journal entries) from 2024 on."""
+    first: int = 2024           # earliest year listed (None: no lower bound)
+    last: int = None            # latest year listed (None: no upper bound)
+    conferences: bool = False   # add a Conference Presentations subsection
+    preprints: bool = False     # list preprints.json under In Submission
+
+    def includes(self, year):
+        return ((self.first is None or year >= self.first) and
+                (self.last is None or year <= self.last))
+
+    @property
+    def tag(self):
+        """File name suffix telling this scope's CV apart from the default one:
+        '' (default), '_full' (--full-history), '_2018-2022', '_2020-', '_all'
+        (--pub-years), or both ('_full_2018-2022')."""
+        full = self.conferences or self.preprints
+        base = FULL_HISTORY if full else PublicationScope()
+        parts = ['full'] if full else []
+        if (self.first, self.last) != (base.first, base.last):
+            if self.first is None and self.last is None:
+                parts.append('all')
+            elif self.first == self.last:
+                parts.append(str(self.first))
+            else:
+                parts.append(f"{self.first or ''}-{self.last or ''}")
+        return ''.join(f"_{part}" for part in parts)
+
+
+FULL_HISTORY = PublicationScope(first=None, conferences=True, preprints=True)
+
+
+def parse_year_range(text):
+    """'2024-' / '2018-2022' / '-2020' / '2021' / 'all' -> (first, last),
+    None for an open end. Raises ValueError on anything else."""
+    text = text.strip().lower()
+    if text == 'all':
+        return None, None
+    match = re.fullmatch(r'(\d{4})?\s*(-)?\s*(\d{4})?', text)
+    if not text or not match or not (match.group(1) or match.group(3)):
+        raise ValueError(f"invalid year range '{text}' (expected e.g. 2024-, 2018-2022 or all)")
+    first, dash, last = match.groups()
+    if not dash:
+        if first and last:
+            raise ValueError(f"invalid year range '{text}'")
+        first = last = first or last
+    first, last = (int(first) if first else None), (int(last) if last else None)
+    if first and last and first > last:
+        raise ValueError(f"invalid year range '{text}': {first} is after {last}")
+    return first, last
+
+
+def profile_image_path(professor):
+    """Header photo for the professor (may not exist)."""
+    image_path = SCRIPT_DIR.parent / "public" / professor.get("image", "").lstrip("/")
+    if not image_path.exists():
+        image_path = SCRIPT_DIR.parent / "src" / "assets" / "images" / "members" / "professor.jpeg"
+    return image_path
+
+
+# ---------------------------------------------------------------------------
+# People
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class CVPerson:
+    """Whose CV to render: the profile to print and whose publications to list."""
+    key: str                 # 'professor' or the members.json id
+    slug: str                # output file tag: YYYYMMDD_CV_<slug>[<scope tag>][_KR].pdf
+    highlight: str           # author name to bold and to match authorship roles
+    profile: dict            # professor.json-shaped record
+    photo: Path              # header photo (may not exist)
+    own_publications_only: bool = False
+    grants: bool = False     # PI/Co-PI grants section (projects.json is the PI's)
+
+    @property
+    def langs(self):
+        """Languages this person's data supports (Korean needs a 'ko' overlay)."""
+        return LANGS if self.profile.get('ko') else ['en']
+
+
+def name_slug(name):
+    """'Ho Won Lee' -> 'HLee' (first initial + last name)."""
+    parts = [re.sub(r'[^A-Za-z0-9]', '', p) for p in name.split()]
+    parts = [p for p in parts if p]
+    if not parts:
+        return "member"
+    return parts[0] if len(parts) == 1 else f"{parts[0][0]}{parts[-1]}"
+
+
+def current_affiliation(professor):
+    """Department and institution of the professor's current position; lab
+    members share it in their CV header."""
+    for exp in professor.get("experience", []):
+        if isinstance(exp, dict) and "present" in exp.get("period", "").lower():
+            department, institution = exp.get("Department", ""), exp.get("institution", "")
+            return f"{department}<br/>{institution}" if department else institution
+    return ""
+
+
+def professor_person(professor):
+    return CVPerson(
+        key='professor',
+        slug=name_slug(professor['name']),
+        highlight=professor['name'],
+        profile=professor,
+        photo=profile_image_path(professor),
+        grants=True,
+    )
+
+
+def member_people(members, professor):
+    """A CVPerson for everyone in members.json, in file order. Member CVs list
+    only their own publications and carry no grants section."""
+    affiliation = current_affiliation(professor)
+    people, slugs = [], {name_slug(professor['name'])}
+    for group in MEMBER_GROUPS:
+        for m in members.get(group, []):
+            slug = name_slug(m['name'])
+            if slug in slugs:
+                slug = f"{slug}_{m['id']}"
+            slugs.add(slug)
+            profile = {
+                'name': m['name'],
+                'email': m.get('email', ''),
+                'title': m.get('position', ''),
+                'affiliation': affiliation,
+                'image': m.get('image', ''),
+                'Research Interests': [r.strip() for r in m.get('research', '').split(',') if r.strip()],
+            }
+            people.append(CVPerson(
+                key=m['id'],
+                slug=slug,
+                highlight=m['name'],
+                profile=profile,
+                photo=SCRIPT_DIR.parent / "public" / m.get('image', '').lstrip("/"),
+                own_publications_only=True,
+            ))
+    return people
+
+
+def resolve_people(data, keys):
+    """CVPersons for keys: 'professor', 'members' (everyone in members.json)
+    or individual members.json ids. Raises ValueError for unknown ids."""
+    people = [professor_person(data['professor'])]
+    if any(key != 'professor' for key in keys):
+        people += member_people(load_json(MEMBERS_FILE), data['professor'])
+    by_key = {p.key: p for p in people}
+    selected = []
+    for key in keys:
+        if key == 'members':
+            chosen = people[1:]
+        elif key in by_key:
+            chosen = [by_key[key]]
+        else:
+            raise ValueError(f"unknown person '{key}' (use 'professor', 'members' or a members.json id)")
+        selected += [p for p in chosen if p not in selected]
+    return selected
+
+
+def candidate_font_files():
+    """Font files ensure_fonts_registered() could pick up on this machine.
+
+    Fingerprinting every existing candidate (rather than the ones actually
+    registered) lets a cache hit skip font parsing entirely; installing or
+    removing a font still changes the fingerprint."""
+    paths = KOREAN_FONT_PATHS + [p for pair in KFONT_CANDIDATES for p in pair]
+    return [p for p in paths if os.path.exists(p)]
@@ -0,0 +1,1505 @@
+"""
+PDF rendering for the AIMAP Lab CV generator (reportlab): Korean fonts,
+styles, flowables and the section builders. generate_cv.py imports this
+module only when a PDF is actually rendered.
+"""
+
+import functools
+import hashlib
+import mmap
+import os
+import pickle
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.lib.colors import HexColor, white, black
+from reportlab.platypus import (
+    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
+    HRFlowable, Flowable, Image
+)
+from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
+from reportlab import Version as REPORTLAB_VERSION, rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
+
+from cv_inputs import (
+    FONT_CACHE_DIR, KFONT_CANDIDATES, KOREAN_FONT_PATHS, PublicationScope, profile_image_path,
+)
+from labdata import (  # on sys.path via cv_inputs
+    RecordIndex, atomic_open, funding_billion, parse_authors, pub_sort_key, record_year, trace,
+)
+from labdata.query import LabDB
+
+# ---------------------------------------------------------------------------
+# Korean fonts
+# ---------------------------------------------------------------------------
+# Two registrations are needed:
+#  - 'KoreanFont' (single weight): used by the English CV for parenthesized
+#    Korean project titles.
+#  - 'KFont'/'KFont-Bold' family: used by the Korean CV body, which needs a
+#    true bold weight. NanumSquareNeo renders both Hangul and Latin well;
+#    falls back to NanumGothic, then the single-weight KoreanFont, then
+#    Helvetica.
+# Candidate font files live in cv_inputs (they are part of the build-cache
+# fingerprint).
+
+# Fallback font names until ensure_fonts_registered() runs.
+KOREAN_FONT_NAME = "Helvetica"  # single-weight Korean font
+KFONT = "Helvetica"             # Korean family, regular
+KFONT_BOLD = "Helvetica"        # Korean family, bold
+_FONTS_REGISTERED = False
+
+
+# Bump to invalidate cached font metrics (e.g. a change to what is pickled).
+FONT_CACHE_VERSION = 1
+
+
+class MappedTTFontFace(TTFontFace):
+    """TTFontFace restored from the font-metrics cache.
+
+    The parsed tables (cmap, widths, glyph offsets, ...) come from the cache;
+    the font file itself is only memory-mapped when reportlab first needs raw
+    table bytes, i.e. when it embeds a subset while saving the PDF."""
+
+    @property
+    def _ttf_data(self):
+        data = self.__dict__.get('_mapped')
+        if data is None:
+            with open(self.filename, 'rb') as f:
+                data = self.__dict__['_mapped'] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return data
+
+    @_ttf_data.setter
+    def _ttf_data(self, value):
+        self.__dict__['_mapped'] = value
+
+    def _pdfScale(self, x):
+        # extractInfo() stores this as a lambda, which can't be pickled
+        return x if self.unitsPerEm == 1000 else x * (1000 / self.unitsPerEm)
+
+
+class CachedTTFont(TTFont):
+    """TTFont built around an already-parsed face (mirrors TTFont.__init__)."""
+
+    def __init__(self, name, face):
+        from weakref import WeakKeyDictionary
+        self.fontName = name
+        self.face = face
+        self.encoding = TTEncoding()
+        self.state = WeakKeyDictionary()
+        self._asciiReadable = rl_config.ttfAsciiReadable
+        # Shaping would hand the mapped file to harfbuzz; the CV never shapes.
+        self.shapable = False
+
+
+def font_cache_path(path, subfont_index):
+    """Cache file for one font face, keyed by path, size, mtime and subfont."""
+    st = os.stat(path)
+    key = hashlib.sha256(
+        f"{FONT_CACHE_VERSION}:{REPORTLAB_VERSION}:{os.path.abspath(path)}:"
+        f"{st.st_size}:{st.st_mtime_ns}:{subfont_index}".encode()
+    ).hexdigest()[:20]
+    return FONT_CACHE_DIR / f"{Path(path).stem}-{subfont_index}-{key}.pickle"
+
+
+def load_ttfont(name, path, subfont_index=None):
+    """TTFont for path, parsing the file only when the metrics cache misses.
+
+    A hit unpickles the parsed face and leaves the font file unread until a
+    PDF actually embeds it, so cold starts and every worker process skip the
+    full TrueType parse of large collections like AppleSDGothicNeo.ttc."""
+    index = subfont_index or 0
+    cache_path = font_cache_path(path, index)
+    try:
+        with trace.span("font cache load", font=Path(path).name):
+            with open(cache_path, 'rb') as f:
+                state = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        with trace.span("font parse", font=Path(path).name):
+            face = TTFontFace(path, subfontIndex=index)
+        state = {k: v for k, v in face.__dict__.items() if k not in ('_ttf_data', '_pos', '_pdfScale')}
+        FONT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in FONT_CACHE_DIR.glob(f"{Path(path).stem}-{index}-*.pickle"):
+            stale.unlink(missing_ok=True)
+        with atomic_open(cache_path) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return CachedTTFont(name, face)
+    face = MappedTTFontFace.__new__(MappedTTFontFace)
+    face.__dict__.update(state)
+    return CachedTTFont(name, face)
+
+
+def _try_register_font(name, path, subfont_index=None):
+    """Register a single TTF/TTC font; return True on success."""
+    try:
+        pdfmetrics.registerFont(load_ttfont(name, path, subfont_index))
+        return True
+    except Exception as e:
+        print(f"warning: could not register font {path}: {e}", file=sys.stderr)
+        return False
+
+
+def ensure_fonts_registered():
+    """Idempotently register Korean fonts and update the module-level font
+    names. Registration is lazy so importing this module has no side effects."""
+    global KOREAN_FONT_NAME, KFONT, KFONT_BOLD, _FONTS_REGISTERED
+    if _FONTS_REGISTERED:
+        return
+    _FONTS_REGISTERED = True
+
+    for font_path in KOREAN_FONT_PATHS:
+        if os.path.exists(font_path):
+            subfont = 0 if font_path.endswith('.ttc') else None
+            if _try_register_font('KoreanFont', font_path, subfont):
+                KOREAN_FONT_NAME = "KoreanFont"
+                break
+
+    KFONT = KOREAN_FONT_NAME
+    KFONT_BOLD = KOREAN_FONT_NAME
+    for reg_path, bold_path in KFONT_CANDIDATES:
+        if os.path.exists(reg_path) and os.path.exists(bold_path):
+            if (_try_register_font('KFont', reg_path)
+                    and _try_register_font('KFont-Bold', bold_path)):
+                pdfmetrics.registerFontFamily(
+                    'KFont', normal='KFont', bold='KFont-Bold',
+                    italic='KFont', boldItalic='KFont-Bold')
+                KFONT = 'KFont'
+                KFONT_BOLD = 'KFont-Bold'
+                break
+
+
+# Colors
+NAVY = HexColor('#2d3748')
+ACCENT = HexColor('#4a5568')
+LIGHT_GRAY_HEX = '#718096'
+LIGHT_GRAY = HexColor(LIGHT_GRAY_HEX)
+LINK_BLUE = '#2563eb'        # Tailwind blue-600 for journal/IF text and links
+HIGHLIGHT_BG = '#f0f4f8'     # shaded background for first/corresponding entries
+ROLE_GRAY = '#6b7280'        # non-PI role label
+HEADER_TEXT_HEX = '#e2e8f0'  # light text on the navy header band
+
+
+def ko_sanitize(text):
+    """Replace punctuation glyphs missing from the Korean CV font (NanumSquareNeo)
+    with supported equivalents so they don't render as tofu boxes."""
+    if not text:
+        return text
+    return (text
+            .replace('・', '·')   # ・ KATAKANA MIDDLE DOT -> · MIDDLE DOT
+            .replace('ㆍ', '·'))   # ㆍ HANGUL ARAEA -> · MIDDLE DOT
+
+
+# ---------------------------------------------------------------------------
+# Bilingual labels and Korean content
+# ---------------------------------------------------------------------------
+LABELS = {
+    'en': {
+        'cv_title': 'CURRICULUM VITAE',
+        'phone': 'Phone', 'email': 'E-mail',
+        'research_interests': 'Research Interests',
+        'experience': 'Professional Experience',
+        'education': 'Education',
+        'awards': 'Honors and Awards',
+        'activities': 'Professional Activities',
+        'publications': 'Publications',
+        'pub_note': '* Shaded entries indicate first author or corresponding author publications.',
+        'journal_articles': 'Journal Articles',
+        'in_submission': 'In Submission',
+        'conferences': 'Conference Presentations',
+        'total': 'Total', 'corresponding': 'Corresponding', 'coauthor': 'Co-Author',
+        'submitted': 'Submitted',
+        'grants': 'Research Grants',
+        'grant_note': '* Shaded entries indicate grants with funding ≥ 10B KRW.',
+        'ongoing': 'Ongoing Grants', 'completed': 'Completed Grants',
+        'since': 'since',
+    },
+    'ko': {
+        'cv_title': '이력서',
+        'phone': '전화', 'email': '이메일',
+        'research_interests': '연구 분야',
+        'experience': '주요 경력',
+        'education': '학력',
+        'awards': '수상 경력',
+        'activities': '학회 및 대외 활동',
+        'publications': '연구 논문',
+        'pub_note': '* 음영 표시는 제1저자 또는 교신저자 논문입니다.',
+        'journal_articles': '학술지 논문',
+        'in_submission': '투고 중',
+        'conferences': '학술대회 발표',
+        'total': '총', 'corresponding': '교신저자', 'coauthor': '공저자',
+        'submitted': '투고 중',
+        'grants': '연구 과제',
+        'grant_note': '* 음영 표시는 100억 원 이상 과제입니다.',
+        'ongoing': '진행 중 과제', 'completed': '완료 과제',
+        'since': '이후',
+    },
+}
+
+class SectionHeader(Flowable):
+    """Custom flowable for section headers with icon."""
+    def __init__(self, text, icon_char="●", subtitle=None,
+                 title_font="Helvetica-Bold", subtitle_font="Helvetica", uppercase=True):
+        Flowable.__init__(self)
+        self.text = text
+        self.icon_char = icon_char
+        self.subtitle = subtitle
+        self.title_font = title_font
+        self.subtitle_font = subtitle_font
+        self.uppercase = uppercase
+        self.width = 17*cm
+        self.height = 1.2*cm
+        # Never let a section header sit alone at the bottom of a page,
+        # separated from the content that follows it.
+        self.keepWithNext = 1
+
+    def draw(self):
+        title = self.text.upper() if self.uppercase else self.text
+
+        # Draw icon circle
+        self.canv.setFillColor(NAVY)
+        self.canv.circle(0.4*cm, 0.4*cm, 0.35*cm, fill=1, stroke=0)
+
+        # Draw icon character (white)
+        self.canv.setFillColor(white)
+        self.canv.setFont("Helvetica-Bold", 10)
+        self.canv.drawCentredString(0.4*cm, 0.25*cm, self.icon_char)
+
+        # Draw section title
+        self.canv.setFillColor(NAVY)
+        self.canv.setFont(self.title_font, 13)
+        self.canv.drawString(1.2*cm, 0.25*cm, title)
+
+        # Draw subtitle if present (lighter color)
+        if self.subtitle:
+            title_width = self.canv.stringWidth(title, self.title_font, 13)
+            self.canv.setFillColor(LIGHT_GRAY)
+            self.canv.setFont(self.subtitle_font, 11)
+            self.canv.drawString(1.2*cm + title_width + 0.2*cm, 0.25*cm, self.subtitle)
+
+
+class TimelineItem(Flowable):
+    """Custom flowable for timeline items with bullet."""
+    def __init__(self, has_bullet=True):
+        Flowable.__init__(self)
+        self.has_bullet = has_bullet
+        self.width = 0.5*cm
+        self.height = 0.5*cm
+
+    def draw(self):
+        if self.has_bullet:
+            self.canv.setFillColor(NAVY)
+            # Diamond shape
+            self.canv.saveState()
+            self.canv.translate(0.15*cm, 0.15*cm)
+            self.canv.rotate(45)
+            self.canv.rect(-0.08*cm, -0.08*cm, 0.16*cm, 0.16*cm, fill=1, stroke=0)
+            self.canv.restoreState()
+
+
+def create_styles(lang='en'):
+    """Create custom paragraph styles. In Korean mode, text styles that carry
+    Hangul use the Korean font family (with a real bold weight); the publication
+    list stays in Helvetica since those entries are English."""
+    ko = (lang == 'ko')
+    base = KFONT if ko else 'Helvetica'
+    bold = KFONT_BOLD if ko else 'Helvetica-Bold'
+    oblique = KFONT if ko else 'Helvetica-Oblique'
+
+    styles = getSampleStyleSheet()
+
+    # Header name style (white on dark)
+    styles.add(ParagraphStyle(
+        name='HeaderName',
+        fontName=base,
+        fontSize=18,
+        textColor=white,
+        alignment=TA_LEFT,
+        leading=22,
+        spaceAfter=4,
+    ))
+
+    # Header affiliation style with tighter leading
+    styles.add(ParagraphStyle(
+        name='HeaderAffiliation',
+        fontName=base,
+        fontSize=9,
+        textColor=HexColor(HEADER_TEXT_HEX),
+        alignment=TA_LEFT,
+        leading=12,
+        spaceAfter=6,
+    ))
+
+    # Header contact style
+    styles.add(ParagraphStyle(
+        name='HeaderContact',
+        fontName=base,
+        fontSize=10,
+        textColor=white,
+        alignment=TA_LEFT,
+        spaceAfter=1,
+    ))
+
+    # Summary style
+    styles.add(ParagraphStyle(
+        name='Summary',
+        fontName=base,
+        fontSize=10,
+        textColor=black,
+        alignment=TA_JUSTIFY,
+        leading=14,
+        spaceBefore=10,
+        spaceAfter=10,
+    ))
+
+    # Date style (left column)
+    styles.add(ParagraphStyle(
+        name='Date',
+        fontName=base,
+        fontSize=10,
+        textColor=ACCENT,
+        alignment=TA_LEFT,
+        leading=14,
+    ))
+
+    # Item title style
+    styles.add(ParagraphStyle(
+        name='ItemTitle',
+        fontName=bold,
+        fontSize=10,
+        textColor=black,
+        alignment=TA_LEFT,
+        leading=14,
+    ))
+
+    # Item subtitle style (institution)
+    styles.add(ParagraphStyle(
+        name='ItemSubtitle',
+        fontName=oblique,
+        fontSize=10,
+        textColor=ACCENT,
+        alignment=TA_LEFT,
+        leading=13,
+    ))
+
+    # Item description style
+    styles.add(ParagraphStyle(
+        name='ItemDesc',
+        fontName=base,
+        fontSize=9,
+        textColor=LIGHT_GRAY,
+        alignment=TA_LEFT,
+        leading=12,
+    ))
+
+    # Publication style (with hanging indent)
+    styles.add(ParagraphStyle(
+        name='Publication',
+        fontName='Helvetica',
+        fontSize=9,
+        textColor=black,
+        alignment=TA_JUSTIFY,
+        leading=12,
+        spaceBefore=2,
+        spaceAfter=4,
+        leftIndent=10,
+        firstLineIndent=-10,
+    ))
+
+    # Highlighted publication style (for first author or corresponding, with hanging indent)
+    styles.add(ParagraphStyle(
+        name='PublicationHighlight',
+        fontName='Helvetica',
+        fontSize=9,
+        textColor=black,
+        alignment=TA_JUSTIFY,
+        leading=12,
+        spaceBefore=2,
+        spaceAfter=4,
+        backColor=HexColor(HIGHLIGHT_BG),
+        leftIndent=10,
+        firstLineIndent=-10,
+    ))
+
+    # Subsection style
+    styles.add(ParagraphStyle(
+        name='Subsection',
+        fontName=bold,
+        fontSize=10,
+        textColor=NAVY,
+        alignment=TA_LEFT,
+        spaceBefore=8,
+        spaceAfter=4,
+    ))
+
+    # Centered document title ("CURRICULUM VITAE" / "이력서")
+    styles.add(ParagraphStyle(
+        name='CVTitle',
+        fontName=bold,
+        fontSize=22,
+        textColor=NAVY,
+        alignment=TA_CENTER,
+        spaceAfter=6,
+    ))
+
+    # Research-interest bullet line
+    styles.add(ParagraphStyle(
+        name='Interest',
+        fontName=base,
+        fontSize=9,
+        textColor=black,
+        alignment=TA_LEFT,
+        leading=12,
+        spaceBefore=1,
+        spaceAfter=1,
+        leftIndent=12,
+        firstLineIndent=-7,
+    ))
+
+    # Professional-activity bullet line
+    styles.add(ParagraphStyle(
+        name='Activity',
+        fontName=base,
+        fontSize=9,
+        textColor=black,
+        alignment=TA_LEFT,
+        leading=12,
+        spaceBefore=2,
+        spaceAfter=2,
+        leftIndent=12,
+        firstLineIndent=-7,
+    ))
+
+    # Right-aligned footnotes under section headers
+    styles.add(ParagraphStyle(
+        name='PubNote',
+        fontName=base,
+        fontSize=8,
+        textColor=LIGHT_GRAY,
+        alignment=TA_RIGHT,
+    ))
+    styles.add(ParagraphStyle(
+        name='GrantNote',
+        fontName=base,
+        fontSize=8,
+        textColor=LIGHT_GRAY,
+        alignment=TA_RIGHT,
+    ))
+
+    # Compact one-line project entries (plain / large-grant highlight)
+    styles.add(ParagraphStyle(
+        name='ProjectCompact',
+        fontName=base,
+        fontSize=9,
+        textColor=black,
+        alignment=TA_LEFT,
+        leading=12,
+        spaceBefore=2,
+        spaceAfter=3,
+        leftIndent=12,
+        firstLineIndent=-7,
+    ))
+    styles.add(ParagraphStyle(
+        name='ProjectHighlight',
+        fontName=base,
+        fontSize=9,
+        textColor=black,
+        alignment=TA_LEFT,
+        leading=12,
+        spaceBefore=2,
+        spaceAfter=3,
+        leftIndent=12,
+        firstLineIndent=-7,
+        backColor=HexColor(HIGHLIGHT_BG),
+    ))
+
+    return styles
+
+
+# Stylesheets by language, built once per process and shared by every CV
+# rendered in it (batch runs render many people with the same styles).
+_STYLES = {}
+
+
+def get_styles(lang='en'):
+    """The shared stylesheet for lang; treat it as read-only. Fonts are
+    registered first, so the Korean styles never capture the Helvetica
+    fallbacks that KFONT/KFONT_BOLD hold before registration."""
+    styles = _STYLES.get(lang)
+    if styles is None:
+        ensure_fonts_registered()
+        with trace.span("create_styles", lang=lang):
+            styles = _STYLES[lang] = create_styles(lang)
+    return styles
+
+
+def create_header_table(professor, lang='en', image_path=None):
+    """Create the header with dark background, photo, and affiliation.
+    image_path defaults to the professor's photo."""
+    ko = (lang == 'ko')
+    styles = get_styles(lang)
+    L = LABELS[lang]
+    kod = professor.get('ko') or {}  # Korean overlay from professor.json
+
+    # Name styling: regular font
+    name_html = kod['name'] if ko else professor["name"]
+
+    # Current affiliations
+    affiliation_line1 = ""
+    affiliation_line2 = ""
+    if ko:
+        affiliation_line1 = kod.get('header_title', '')
+        affiliation_line2 = kod.get('header_org', '')
+    else:
+        for exp in professor.get("experience", []):
+            if isinstance(exp, dict):
+                # New object format
+                position = exp.get("position", "")
+                institution = exp.get("institution", "")
+                period = exp.get("period", "")
+                if "Director" in position and ("Present" in period or "present" in period):
+                    affiliation_line1 = position
+                    department = exp.get("Department", "")
+                    if department:
+                        affiliation_line2 = f"{department}<br/>{institution}"
+                    else:
+                        affiliation_line2 = institution.replace(", ", "<br/>")
+                    break
+            else:
+                # Legacy string format
+                if "Director" in exp and ("Present" in exp or "present" in exp):
+                    parts = exp.split(", ")
+                    if len(parts) >= 3:
+                        affiliation_line1 = parts[0]  # Director
+                        affiliation_line2 = f"{parts[1]}, {parts[2]}"  # Division, Institution
+                        break
+        if not affiliation_line1 and professor.get('title'):
+            # Lab member profiles: position + the lab's affiliation
+            affiliation_line1 = professor['title']
+            affiliation_line2 = professor.get('affiliation', '')
+
+    name_para = Paragraph(name_html, styles['HeaderName'])
+    affiliation_para = None
+    if affiliation_line1:
+        affiliation_text = f'{affiliation_line1}<br/>{affiliation_line2}'
+        affiliation_para = Paragraph(affiliation_text, styles['HeaderAffiliation'])
+
+    contact_paras = [
+        Paragraph(f"<b>{L[key]}</b>  {professor[key]}", styles['HeaderContact'])
+        for key in ('phone', 'email') if professor.get(key)
+    ]
+
+    # Right column: photo
+    if image_path is None:
+        image_path = profile_image_path(professor)
+    if image_path.is_file():
+        try:
+            prof_image = Image(str(image_path), width=2.5*cm, height=3.2*cm)
+        except Exception as e:
+            print(f"warning: could not load profile image {image_path}: {e}", file=sys.stderr)
+            prof_image = Spacer(1, 1)
+    else:
+        prof_image = Spacer(1, 1)
+
+    # Left column content stacked vertically
+    left_content = [[name_para]]
+    if affiliation_para:
+        left_content.append([affiliation_para])
+    left_content.extend([para] for para in contact_paras)
+    left_table = Table(left_content, colWidths=[12*cm])
+    left_table.setStyle(TableStyle([
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+
+    # Combine left and right
+    header_row = [[left_table, prof_image]]
+    header_table = Table(header_row, colWidths=[13*cm, 4*cm])
+    header_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, -1), NAVY),
+        ('LEFTPADDING', (0, 0), (0, 0), 15),
+        ('RIGHTPADDING', (1, 0), (1, 0), 15),
+        ('TOPPADDING', (0, 0), (-1, -1), 15),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
+        # center text so photo-driven banner height leaves no dead band below the contact lines
+        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),
+        ('VALIGN', (1, 0), (1, 0), 'MIDDLE'),
+        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+    ]))
+
+    return header_table
+
+
+def make_section_header(title, icon="●", subtitle=None, gap=6, lang='en'):
+    """Section header followed by a gap, chained with keepWithNext so the
+    header is never stranded at the bottom of a page away from its first content."""
+    if lang == 'ko':
+        header = SectionHeader(title, icon, subtitle,
+                               title_font=KFONT_BOLD, subtitle_font=KFONT, uppercase=False)
+    else:
+        header = SectionHeader(title, icon, subtitle)
+    spacer = Spacer(1, gap)
+    spacer.keepWithNext = 1  # chain header -> gap -> first content flowable
+    return [header, spacer]
+
+
+def create_timeline_entry(date_text, title, subtitle=None, description=None, styles=None):
+    """Create a timeline entry with date, bullet, and content."""
+    content_parts = [Paragraph(title, styles['ItemTitle'])]
+    if subtitle:
+        content_parts.append(Paragraph(subtitle, styles['ItemSubtitle']))
+    if description:
+        content_parts.append(Paragraph(description, styles['ItemDesc']))
+
+    # Stack content vertically
+    content_table = Table([[p] for p in content_parts], colWidths=[13*cm])
+    content_table.setStyle(TableStyle([
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+
+    # Create timeline row: [bullet] [date] [content]
+    date_para = Paragraph(date_text, styles['Date'])
+    bullet = TimelineItem(has_bullet=True)
+
+    row = [[bullet, date_para, content_table]]
+    entry_table = Table(row, colWidths=[0.6*cm, 2.2*cm, 13*cm])
+    entry_table.setStyle(TableStyle([
+        ('LEFTPADDING', (0, 0), (-1, -1), 0),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+        ('TOPPADDING', (0, 0), (-1, -1), 2),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]))
+
+    return entry_table
+
+
+def extract_years(text):
+    """All 4-digit years found in a string."""
+    return re.findall(r'(\d{4})', text or "")
+
+
+def first_year(text):
+    """First 4-digit year in a string as int, or 0 (used for sorting)."""
+    years = extract_years(text)
+    return int(years[0]) if years else 0
+
+
+def format_year_range(period):
+    """Education-style year display: 'Y0 - Y1', 'Y0', or ''."""
+    years = extract_years(period)
+    if len(years) >= 2:
+        return f"{years[0]} - {years[1]}"
+    if len(years) == 1:
+        return years[0]
+    return ""
+
+
+def format_period_range(period_str):
+    """Parse date range string and return formatted display.
+
+    Handles formats like:
+    - "2023.3-Present"
+    - "2011.8-2011.12"
+    - "2025.05 - 2025.12"
+    """
+    # Clean up the string
+    period = period_str.strip()
+
+    # Check for Present
+    is_present = "present" in period.lower()
+
+    # Find all year.month patterns
+    date_pattern = r'(\d{4})\.(\d{1,2})'
+    matches = re.findall(date_pattern, period)
+
+    if not matches:
+        # Try just year pattern
+        year_pattern = r'(\d{4})'
+        years = re.findall(year_pattern, period)
+        if years:
+            if is_present:
+                return f"{years[0]} -\nPresent"
+            elif len(years) >= 2:
+                return f"{years[0]} -\n{years[1]}"
+            else:
+                return years[0]
+        return period
+
+    # Format: YYYY.MM
+    if len(matches) >= 1:
+        start_year, start_month = matches[0]
+        start_str = f"{start_year}.{int(start_month):02d}"
+
+        if is_present:
+            return f"{start_str} -\nPresent"
+        elif len(matches) >= 2:
+            end_year, end_month = matches[1]
+            end_str = f"{end_year}.{int(end_month):02d}"
+            return f"{start_str} -\n{end_str}"
+        else:
+            return start_str
+
+    return period
+
+
+def format_authors(authors, highlight_name="Ho Won Lee"):
+    """Format author list, highlighting highlight_name. Only show * for the highlighted author if corresponding."""
+    return _format_authors(tuple(authors or ()), highlight_name)
+
+
+@functools.lru_cache(maxsize=4096)
+def _format_authors(authors, highlight_name):
+    formatted = []
+    for author in parse_authors(authors):
+        if author.matches(highlight_name):
+            # Only show * for Ho Won Lee when he is corresponding author
+            if author.corresponding:
+                formatted.append(f"<b>{author.abbrev}</b><super>*</super>")
+            else:
+                formatted.append(f"<b>{author.abbrev}</b>")
+        else:
+            # Other authors: don't show * marker
+            formatted.append(author.abbrev)
+    return ", ".join(formatted)
+
+
+def pick(value, lang='en'):
+    """Return value[lang] for {'en':.., 'ko':..} bilingual dicts, else value itself."""
+    return value.get(lang, value) if isinstance(value, dict) else value
+
+
+def doi_link_markup(doi):
+    """Blue [DOI]/[SSRN]/[arXiv] link markup for a DOI string."""
+    doi_url = f"https://doi.org/{doi}"
+    if 'ssrn' in doi.lower():
+        link_text = 'SSRN'
+    elif 'arxiv' in doi.lower():
+        link_text = 'arXiv'
+    else:
+        link_text = 'DOI'
+    return f' <font color="{LINK_BLUE}"><link href="{doi_url}">[{link_text}]</link></font>'
+
+
+def journal_with_if(journal, if_data):
+    """Italic journal name, with blue impact-factor info when IF.json has the
+    journal (also under another spelling or abbreviation, see labdata.impact;
+    never a fuzzy near match)."""
+    match = if_data.lookup(journal)
+    if match:
+        return f'<i>{journal}</i><font color="{LINK_BLUE}"> ({match.text})</font>'
+    return f'<i>{journal}</i>'
+
+
+# Grants listed in the CV: PI/Co-PI roles with at least 0.1B KRW (1억원)
+GRANT_ROLES = ('PI', 'CO-PI')
+MIN_GRANT_FUNDING = 0.1
+
+
+def is_large_grant(proj):
+    """Grants with funding >= 10B KRW get the shaded highlight."""
+    return funding_billion(proj) >= 10
+
+
+# ---------------------------------------------------------------------------
+# Section builders
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class CVContext:
+    """Everything a section builder needs to render one language's CV."""
+    lang: str
+    professor: dict
+    kod: dict        # Korean overlay from professor['ko'] ({} when absent)
+    journals: RecordIndex
+    projects: RecordIndex
+    if_data: dict
+    labels: dict
+    styles: object
+    highlight: str = "Ho Won Lee"  # author whose publications these are
+    photo: object = None           # header photo path (None: professor's photo)
+    scope: PublicationScope = PublicationScope()
+    pub_span: tuple = (2024, 2026)  # years in the Publications header
+    preprints: RecordIndex = None   # listed when scope.preprints
+    conferences: RecordIndex = None  # listed when scope.conferences
+
+    @property
+    def ko(self):
+        return self.lang == 'ko'
+
+    def fund_amount(self, billion):
+        """Localized funding amount: '23.2B KRW' (en) or '232억 원' (ko)."""
+        if self.ko:
+            eok = billion * 10  # 1B KRW = 10억 원
+            return (f"{int(eok)}억 원" if abs(eok - round(eok)) < 1e-6 else f"{eok:.1f}억 원")
+        return f"{billion:.1f}B KRW"
+
+
+# Parsed fragments of publication entries, keyed by markup and style. The
+# publication list is English with the same Helvetica styles in both
+# languages, so the KO build of a CV reuses what the EN build parsed. Only
+# the EN build of a CV that also has a KO build stores entries, at most
+# PARAGRAPH_CACHE_SIZE of them (enough for the default scope); longer lists
+# are parsed again rather than held, so streamed layout stays bounded.
+PARAGRAPH_CACHE_SIZE = 500
+_PARAGRAPHS = {}
+_PARAGRAPHS_CV = None
+_PARAGRAPHS_STORE = False
+_STYLE_KEYS = {}
+
+
+def reset_paragraphs(cv, store):
+    """Start a build of cv (any key naming one CV, the same in all its
+    languages): cached fragments of another CV are dropped, and new ones are
+    stored only when store is set."""
+    global _PARAGRAPHS_CV, _PARAGRAPHS_STORE
+    if cv != _PARAGRAPHS_CV:
+        _PARAGRAPHS.clear()
+        _PARAGRAPHS_CV = cv
+    _PARAGRAPHS_STORE = store
+
+
+def _style_key(style):
+    """Everything about a style that affects parsing, i.e. all but its name."""
+    cached = _STYLE_KEYS.get(id(style))
+    if cached is None or cached[0] is not style:
+        key = tuple(sorted((k, repr(v)) for k, v in vars(style).items() if k not in ('name', 'parent')))
+        cached = _STYLE_KEYS[id(style)] = (style, key)
+    return cached[1]
+
+
+def cached_paragraph(text, style):
+    """Paragraph(text, style), reusing the fragments of an earlier Paragraph
+    with the same markup and an equivalent style instead of parsing again."""
+    key = (text, _style_key(style))
+    parsed = _PARAGRAPHS.get(key)
+    if parsed is not None:
+        return Paragraph(parsed[0], style, frags=parsed[1])
+    paragraph = Paragraph(text, style)
+    if _PARAGRAPHS_STORE and len(_PARAGRAPHS) < PARAGRAPH_CACHE_SIZE:
+        _PARAGRAPHS[key] = (paragraph.text, paragraph.frags)
+    return paragraph
+
+
+def publication_style(pub, index, ctx):
+    """Highlighted style if ctx.highlight is first or corresponding author."""
+    role = index.authors.role(pub, ctx.highlight)
+    return ctx.styles['PublicationHighlight' if role and (role.first or role.corresponding) else 'Publication']
+
+
+def render_publication(pub, number, ctx, status=None, index=None):
+    """One numbered publication line; status switches to the in-submission format.
+    index is the RecordIndex pub comes from (default: ctx.journals)."""
+    authors = format_authors(pub['authors'], ctx.highlight)
+    title = pub['title']
+    journal = pub['journal']
+
+    if status is None:
+        vol_info = ""
+        if pub.get('volume'):
+            vol_info += f", {pub['volume']}"
+        if pub.get('pages'):
+            vol_info += f", {pub['pages']}"
+        text = f"{number}. {authors}, \"{title}\", {journal_with_if(journal, ctx.if_data)}{vol_info}."
+    else:
+        # Skip the journal name when it just restates the status/preprint server
+        skip_journal = (
+            journal.lower() == status.lower() or
+            'preprint' in journal.lower() or
+            journal.lower() in ['submitted', 'ssrn', 'arxiv']
+        )
+        if skip_journal:
+            text = f"{number}. {authors}, \"{title}\", {status}."
+        else:
+            text = f"{number}. {authors}, \"{title}\", {journal_with_if(journal, ctx.if_data)}, {status}."
+
+    if pub.get('doi'):
+        text += doi_link_markup(pub['doi'])
+
+    return cached_paragraph(text, publication_style(pub, index or ctx.journals, ctx))
+
+
+def render_conference(pub, number, ctx):
+    """One numbered conference presentation line."""
+    authors = format_authors(pub['authors'], ctx.highlight)
+    text = f"{number}. {authors}, \"{pub['title']}\", <i>{pub['Conference Name']}</i>"
+    for key in ['Venue', 'start date']:
+        if pub.get(key):
+            text += f", {pub[key]}"
+    return cached_paragraph(text + ".", publication_style(pub, ctx.conferences, ctx))
+
+
+def format_project_line(proj, ctx):
+    """Create a compact one-line project entry."""
+    title_en = pick(proj['title'])
+    title_ko = proj['title'].get('ko', '') if isinstance(proj['title'], dict) else ''
+    if ctx.ko:
+        title_ko = ko_sanitize(title_ko)
+    period = pick(proj['period'])
+    role = pick(proj['role'])
+    agency = pick(proj['fundingAgency'])
+
+    # Role color (PI and Co-PI both blue) and localized label
+    role_upper = role.upper()
+    role_hex = LINK_BLUE if role_upper in ['PI', 'CO-PI'] else ROLE_GRAY
+    role_label = ({'PI': '연구책임', 'CO-PI': '공동연구'}.get(role_upper, role)
+                  if ctx.ko else role)
+
+    # Localized funding amount
+    amount = ''
+    if proj.get('fundingAmount'):
+        amount = ctx.fund_amount(funding_billion(proj))
+
+    # Shorten year format: 2021.01 => 21.01, and replace " - " with "~"
+    period = re.sub(r'(\d{4})\.', lambda m: m.group(1)[2:] + '.', period).replace(' - ', ' ~ ')
+
+    # Format: Title | Period | Agency | Role | Budget — all in one line.
+    # Korean CV leads with the Korean title; English CV leads with English.
+    if ctx.ko and title_ko:
+        line = f'•&nbsp;&nbsp;{title_ko}'
+    else:
+        line = f'•&nbsp;&nbsp;{title_en}'
+        if title_ko:
+            line += f' <font face="{KOREAN_FONT_NAME}" color="{LIGHT_GRAY_HEX}">({title_ko})</font>'
+    line += f' | {period} | {agency} |'
+    line += f' <font color="{role_hex}"><b>{role_label}</b></font>'
+    if amount:
+        line += f' | <font color="{LINK_BLUE}">{amount}</font>'
+
+    return line
+
+
+def build_title(ctx):
+    return [
+        Paragraph(ctx.labels['cv_title'], ctx.styles['CVTitle']),
+        Spacer(1, 12),
+    ]
+
+
+def build_header(ctx):
+    return [
+        create_header_table(ctx.professor, ctx.lang, ctx.photo),
+        Spacer(1, 4),
+        # Horizontal line under header
+        HRFlowable(width="100%", thickness=2, color=NAVY, spaceAfter=8),
+    ]
+
+
+def build_summary(ctx):
+    summary_text = ctx.professor.get("bio", "")
+    if not summary_text:
+        return []
+    return [Paragraph(summary_text, ctx.styles['Summary'])]
+
+
+def build_interests(ctx):
+    if not ctx.professor.get("Research Interests"):
+        return []
+    flow = make_section_header(ctx.labels['research_interests'], "◈", lang=ctx.lang)
+    interests = ctx.kod['Research Interests'] if ctx.ko else ctx.professor["Research Interests"]
+    for interest in interests:
+        flow.append(Paragraph(f"•&nbsp;&nbsp;{interest}", ctx.styles['Interest']))
+    flow.append(Spacer(1, 6))
+    return flow
+
+
+def build_experience(ctx):
+    if not ctx.professor.get("experience"):
+        return []
+    flow = make_section_header(ctx.labels['experience'], "◆", lang=ctx.lang)
+
+    # Sort experience by start year (newest first)
+    def exp_start_year(exp):
+        if isinstance(exp, dict):
+            period = exp.get("period", "")
+        else:
+            parts = exp.split(", ")
+            period = parts[-1] if parts else ""
+        return first_year(period)
+
+    for exp in sorted(ctx.professor["experience"], key=exp_start_year, reverse=True):
+        if isinstance(exp, dict):
+            # New object format
+            position = exp.get("position", "")
+            department = exp.get("Department", "")
+            institution = exp.get("institution", "")
+            period = exp.get("period", "")
+            if ctx.ko:
+                # Look up Korean translation by period key
+                ko_exp = ctx.kod.get('experience', {}).get(period)
+                if ko_exp:
+                    position = ko_exp['position']
+                    subtitle = ko_exp['org']
+                else:
+                    subtitle = f"{department}<br/>{institution}" if department else institution
+            # Combine department and institution with line break
+            elif department:
+                subtitle = f"{department}<br/>{institution}"
+            else:
+                subtitle = institution
+        else:
+            # Legacy string format: "Position, Institution, Period"
+            parts = exp.split(", ")
+            if len(parts) >= 3:
+                position = parts[0]
+                subtitle = ", ".join(parts[1:-1])
+                period = parts[-1]
+            else:
+                position = exp
+                subtitle = ""
+                period = ""
+
+        flow.append(create_timeline_entry(
+            format_period_range(period),
+            position,
+            subtitle if subtitle else None,
+            None,
+            ctx.styles
+        ))
+    return flow
+
+
+def build_education(ctx):
+    if not ctx.professor.get("education"):
+        return []
+    flow = [Spacer(1, 6)]
+    flow.extend(make_section_header(ctx.labels['education'], "◇", lang=ctx.lang))
+
+    for edu in ctx.professor["education"]:
+        if isinstance(edu, dict):
+            # New object format
+            degree = edu.get("degree", "")
+            field = edu.get("field", "")
+            institution = edu.get("institution", "")
+            period = edu.get("period", "")
+            thesis = edu.get("thesis", "")
+            advisor = edu.get("advisor", "")
+
+            if ctx.ko:
+                ko_edu = ctx.kod.get('education', {}).get(period, {})
+                degree = ko_edu.get('degree', degree)
+                field = ko_edu.get('field', field)
+                institution = ko_edu.get('institution', institution)
+                advisor = ko_edu.get('advisor', advisor)
+
+            title = f"{degree}, {field}, {institution}"
+
+            # Thesis and advisor as subtitle (thesis kept in English)
+            subtitle = None
+            description = None
+            if thesis:
+                if advisor:
+                    subtitle = f"{thesis} ({advisor})"
+                else:
+                    subtitle = thesis
+            elif ctx.ko and advisor:
+                subtitle = f"지도교수: {advisor}"
+
+            # Extract start and end years from period like "2003.3-2010.1"
+            date_display = format_year_range(period)
+        else:
+            # Legacy string format: "Degree, Field, Institution, Year"
+            parts = edu.split(", ")
+            if len(parts) >= 3:
+                title = parts[0]
+                subtitle = ", ".join(parts[1:-1])
+                year = parts[-1]
+            else:
+                title = edu
+                subtitle = ""
+                year = ""
+
+            description = None
+            legacy_years = extract_years(year)
+            date_display = legacy_years[0] if legacy_years else ""
+
+        flow.append(create_timeline_entry(
+            date_display,
+            title,
+            subtitle if subtitle else None,
+            description,
+            ctx.styles
+        ))
+    return flow
+
+
+def build_awards(ctx):
+    awards_list = ctx.professor.get("Honors and Awards") or ctx.professor.get("Grants and Awards")
+    if not awards_list:
+        return []
+
+    flow = [Spacer(1, 6)]
+    flow.extend(make_section_header(ctx.labels['awards'], "★", lang=ctx.lang))
+
+    if ctx.ko:
+        for a in ctx.kod.get('Honors and Awards', []):
+            flow.append(create_timeline_entry(
+                a.get('year', ''), a.get('name', ''),
+                a.get('org') or None, None, ctx.styles
+            ))
+        return flow
+
+    for award in awards_list:
+        # Parse: "Award Name, Date, Institution"
+        parts = award.split(", ")
+        if len(parts) >= 2:
+            # Try to find date pattern
+            date_str = ""
+            award_parts = []
+            for part in parts:
+                if re.search(r'\d{4}', part):
+                    date_str = part
+                else:
+                    award_parts.append(part)
+
+            award_name = award_parts[0] if award_parts else parts[0]
+            institution = ", ".join(award_parts[1:]) if len(award_parts) > 1 else ""
+
+            # Extract year for display
+            award_years = extract_years(date_str)
+            date_display = award_years[0] if award_years else ""
+
+            flow.append(create_timeline_entry(
+                date_display,
+                award_name,
+                institution if institution else None,
+                None,
+                ctx.styles
+            ))
+    return flow
+
+
+def build_activities(ctx):
+    if not ctx.professor.get("Professional Activities/Memberships"):
+        return []
+    flow = [Spacer(1, 6)]
+    flow.extend(make_section_header(ctx.labels['activities'], "●", lang=ctx.lang))
+    activities = (ctx.kod['Professional Activities/Memberships'] if ctx.ko
+                  else ctx.professor["Professional Activities/Memberships"])
+    for activity in activities:
+        flow.append(Paragraph(f"•&nbsp;&nbsp;{activity}", ctx.styles['Activity']))
+    return flow
+
+
+def group_by_year(index, scope):
+    """Published (status-less) records of index within scope as
+    [(year, records)], newest year first and sorted within the year. One pass
+    over the year index, so the cost stays linear in the number of records."""
+    groups = []
+    for year in index.years(reverse=True):
+        if scope.includes(year):
+            pubs = [p for p in index.by_year[year] if not p.get('status')]
+            if pubs:
+                groups.append((year, sorted(pubs, key=pub_sort_key)))
+    return groups
+
+
+def in_submission(ctx):
+    """Submitted/preprint entries within scope, as (record, source index) pairs,
+    newest first."""
+    sources = [ctx.journals]
+    if ctx.scope.preprints and ctx.preprints is not None:
+        sources.append(ctx.preprints)
+    pubs = [(p, index) for index in sources for p in index.status('submitted', 'preprint')
+            if ctx.scope.includes(record_year(p))]
+    return sorted(pubs, key=lambda item: pub_sort_key(item[0]))
+
+
+def build_publications(ctx):
+    """Publications section. A generator, like build_grants: these two sections
+    grow with the data, so their flowables are created only as layout consumes
+    them (see StreamingStory). Left out when the CV lists no publications."""
+    L = ctx.labels
+    # Publications within the scope's years, split into published vs in-submission
+    journal_groups = group_by_year(ctx.journals, ctx.scope)
+    submitted = in_submission(ctx)
+    conference_groups = (group_by_year(ctx.conferences, ctx.scope)
+                         if ctx.scope.conferences and ctx.conferences is not None else [])
+    if not (journal_groups or submitted or conference_groups):
+        return
+
+    yield Spacer(1, 6)
+    first, last = ctx.pub_span
+    yield from make_section_header(L['publications'], "■", subtitle=f"({first}-{last})", gap=4, lang=ctx.lang)
+    yield Paragraph(L['pub_note'], ctx.styles['PubNote'])
+
+    # Count corresponding-author vs co-author publications
+    def stats(pubs):
+        """Format publication statistics, omitting zero values."""
+        total = corresponding = 0
+        for pub, index in pubs:
+            role = index.authors.role(pub, ctx.highlight)
+            total += 1
+            corresponding += bool(role and role.corresponding)
+        parts = [f"{L['total']}: {total}"]
+        if corresponding > 0:
+            parts.append(f"{L['corresponding']}: {corresponding}")
+        if total - corresponding > 0:
+            parts.append(f"{L['coauthor']}: {total - corresponding}")
+        return ", ".join(parts)
+
+    def grouped(groups, index):
+        return ((pub, index) for _, pubs in groups for pub in pubs)
+
+    def year_groups(groups, render):
+        """Year headings with the entries numbered continuously across years."""
+        number = 1
+        for year, pubs in groups:
+            yield Spacer(1, 2)
+            yield Paragraph(f"<b><font size='10'>{year}</font></b>", ctx.styles['ItemDesc'])
+            for pub in pubs:
+                yield render(pub, number, ctx)
+                number += 1
+
+    # Journal Articles
+    if journal_groups:
+        yield Spacer(1, 4)
+        journal_stats = stats(grouped(journal_groups, ctx.journals))
+        yield Paragraph(f"<b>{L['journal_articles']}</b> ({journal_stats})", ctx.styles['Subsection'])
+        yield from year_groups(journal_groups, render_publication)
+
+    # In Submission (numbering restarts)
+    if submitted:
+        yield Spacer(1, 4)
+        yield Paragraph(f"<b>{L['in_submission']}</b> ({stats(submitted)})", ctx.styles['Subsection'])
+        for i, (pub, index) in enumerate(submitted, 1):
+            yield render_publication(pub, i, ctx, status=L['submitted'], index=index)
+
+    # Conference Presentations (numbering restarts)
+    if conference_groups:
+        yield Spacer(1, 4)
+        conference_stats = stats(grouped(conference_groups, ctx.conferences))
+        yield Paragraph(f"<b>{L['conferences']}</b> ({conference_stats})", ctx.styles['Subsection'])
+        yield from year_groups(conference_groups, render_conference)
+
+
+def build_grants(ctx):
+    # Only PI/Co-PI projects with funding >= 0.1B KRW (1억원), selected and
+    # summed by the query engine over the CV's projects
+    if not ctx.projects:
+        return
+    db = grants_db(ctx.projects.records)
+    pi = dict(roles=GRANT_ROLES, min_funding=MIN_GRANT_FUNDING)
+    totals = db.grant_totals(**pi)
+    if not totals['count']:
+        return
+    ongoing = db.records(db.grants(status='ongoing', **pi))
+    completed = db.records(db.grants(status='completed', **pi))
+
+    # Total funding amount and date range for the header subtitle
+    total_funding, earliest_year = totals['funding'], totals['first_year']
+    if total_funding > 0:
+        if ctx.ko:
+            total_funding_str = f"{ctx.fund_amount(total_funding)}, {earliest_year}년 이후"
+        else:
+            total_funding_str = f"{ctx.fund_amount(total_funding)} {ctx.labels['since']} {earliest_year}"
+    else:
+        total_funding_str = ""
+
+    yield Spacer(1, 6)
+    yield from make_section_header(
+        ctx.labels['grants'], "◆",
+        subtitle=f"({total_funding_str})" if total_funding_str else None,
+        gap=4, lang=ctx.lang)
+    yield Paragraph(ctx.labels['grant_note'], ctx.styles['GrantNote'])
+
+    if ongoing:
+        yield Spacer(1, 4)  # match the gap before the Journal Articles subsection
+        ongoing_total = db.grant_totals(status='ongoing', **pi)['funding']
+        ongoing_total_str = f"({ctx.fund_amount(ongoing_total)})" if ongoing_total > 0 else ""
+        yield Paragraph(f"<b>{ctx.labels['ongoing']}</b> {ongoing_total_str}", ctx.styles['Subsection'])
+        for proj in ongoing:
+            style_name = 'ProjectHighlight' if is_large_grant(proj) else 'ProjectCompact'
+            yield Paragraph(format_project_line(proj, ctx), ctx.styles[style_name])
+
+    if completed:
+        completed_total = db.grant_totals(status='completed', **pi)['funding']
+        yield Spacer(1, 4)
+        completed_total_str = f"({ctx.fund_amount(completed_total)})" if completed_total > 0 else ""
+        yield Paragraph(f"<b>{ctx.labels['completed']}</b> {completed_total_str}", ctx.styles['Subsection'])
+        for proj in completed:
+            style_name = 'ProjectHighlight' if is_large_grant(proj) else 'ProjectCompact'
+            yield Paragraph(format_project_line(proj, ctx), ctx.styles[style_name])
+
+
+SECTION_BUILDERS = [
+    build_title,
+    build_header,
+    build_summary,
+    build_interests,
+    build_experience,
+    build_education,
+    build_awards,
+    build_activities,
+    build_publications,
+    build_grants,
+]
+
+
+# Indexes over the loaded record lists, keyed by list identity so the EN and
+# KO builds of one CV (and every CV sharing the full list) build them once.
+_INDEXES = {}
+
+
+def _record_index(records):
+    idx = _INDEXES.get(id(records))
+    if idx is None or idx.records is not records:
+        if len(_INDEXES) >= 64:  # long-running (--watch) processes see many reloads
+            _INDEXES.clear()
+        idx = _INDEXES[id(records)] = RecordIndex(records)
+    return idx
+
+
+# In-memory query databases over the bundle's projects list (grant selection
+# and totals), keyed by list identity like _INDEXES.
+_GRANT_DBS = {}
+
+
+def grants_db(projects):
+    records, db = _GRANT_DBS.get(id(projects), (None, None))
+    if records is not projects:
+        if len(_GRANT_DBS) >= 16:
+            _GRANT_DBS.clear()
+        db = LabDB.over(projects=projects)
+        _GRANT_DBS[id(projects)] = (projects, db)
+    return db
+
+
+def publication_span(scope, indexes):
+    """(first, last) years for the Publications header: the scope's bounds,
+    open ends filled in from the years of the listed publications."""
+    years = [y for index in indexes for y in index.years()]
+    first = scope.first if scope.first is not None else min(years, default=0)
+    last = scope.last if scope.last is not None else max(years, default=first)
+    return first, last
+
+
+def cv_context(data, lang, person, scope=PublicationScope()):
+    """CVContext for one person's CV in one language, with the shared
+    stylesheet from get_styles()."""
+    profile = person.profile
+    lab = {key: _record_index(data[key]) for key in ['journals', 'preprints', 'conferences']}
+    own = lab
+    if person.own_publications_only:
+        own = {key: RecordIndex(index.authors.publications(person.highlight)) for key, index in lab.items()}
+    listed = [own['journals']] + [own[key] for key in ['preprints', 'conferences'] if getattr(scope, key)]
+
+    return CVContext(
+        lang=lang,
+        professor=profile,
+        kod=profile.get('ko') or {},
+        journals=own['journals'],
+        projects=_record_index(data['projects'] if person.grants else []),
+        if_data=data['if_data'],
+        labels=LABELS[lang],
+        styles=get_styles(lang),
+        highlight=person.highlight,
+        photo=person.photo,
+        scope=scope,
+        pub_span=publication_span(scope, listed),
+        preprints=own['preprints'],
+        conferences=own['conferences'],
+    )
+
+
+def cv_document(output_path):
+    """The A4 page template every CV is laid out on."""
+    return SimpleDocTemplate(
+        str(output_path),
+        pagesize=A4,
+        rightMargin=1.5*cm,
+        leftMargin=1.5*cm,
+        topMargin=0.5*cm,
+        bottomMargin=1.5*cm
+    )
+
+
+class StreamingStory:
+    """A story for doc.build() that pulls flowables from an iterator as layout
+    consumes them, so only the flowables around the current page are alive
+    instead of the whole document.
+
+    doc.build() treats the story as a list it pops from the front (and pushes
+    split parts back onto). len() reports the buffered flowables only; the
+    buffer is topped up to hold at least one flowable plus any keepWithNext
+    chain at its end and the flowable following it, which is all that
+    handle_keepWithNext() looks at."""
+
+    def __init__(self, flowables):
+        self._source = iter(flowables)
+        self._buffer = []
+        self.consumed = 0  # flowables pulled from the source so far
+
+    def _pull(self):
+        for f in self._source:
+            self._buffer.append(f)
+            self.consumed += 1
+            return True
+        return False
+
+    def _fill(self):
+        if not self._buffer:
+            self._pull()
+        while (self._buffer and getattr(self._buffer[-1], 'getKeepWithNext', lambda: False)()
+               and self._pull()):
+            pass
+        return self._buffer
+
+    def __len__(self):
+        return len(self._fill())
+
+    def __getitem__(self, index):
+        return self._fill()[index]
+
+    def __delitem__(self, index):
+        del self._fill()[index]
+
+    def __setitem__(self, index, value):
+        self._fill()[index] = value
+
+    def insert(self, index, flowable):
+        self._buffer.insert(index, flowable)
+
+
+def render_pdf(data, lang, output_path, person, scope=PublicationScope()):
+    """Lay out one person's CV in one language from validated data and write
+    it to output_path. scope selects the publications listed.
+
+    The section builders' flowables are streamed into layout (StreamingStory),
+    so memory does not grow with the number of entries. With tracing on, each
+    section is built up front instead, to give every builder its own span."""
+    with trace.span("fonts"):
+        ensure_fonts_registered()
+    with trace.span("context"):
+        ctx = cv_context(data, lang, person, scope)
+    # A reloaded bundle (--watch) is a new CV: drop the old entries' fragments.
+    # Only the EN build stores fragments, for the KO build to reuse.
+    reset_paragraphs((person.key, scope, id(data)), store=lang == 'en' and 'ko' in person.langs)
+
+    if trace.enabled():
+        flowables = []
+        for build_section in SECTION_BUILDERS:
+            with trace.span(f"section {build_section.__name__}") as args:
+                section = list(build_section(ctx))
+                args['flowables'] = len(section)
+            flowables.extend(section)
+    else:
+        flowables = (f for build_section in SECTION_BUILDERS for f in build_section(ctx))
+    story = StreamingStory(flowables)
+
+    doc = cv_document(output_path)
+    with trace.span("doc.build"):
+        doc.build(story)
+    if trace.enabled():
+        trace.counter("pdf", flowables=story.consumed, pages=doc.page, bytes=os.path.getsize(output_path))
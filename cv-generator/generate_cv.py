@@ -4,1323 +4,290 @@ CV Generator for AIMAP Lab Website
 Generates professional bilingual (English/Korean) PDF CVs with modern design.
 """
 
+import argparse
+import dataclasses
+import hashlib
 import json
 import os
-import re
+import shutil
 import sys
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
-from pathlib import Path
 
-from reportlab.lib.pagesizes import A4
-
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import cm
-from reportlab.lib.colors import HexColor, white, black
-from reportlab.platypus import (
-    SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    HRFlowable, Flowable, Image
+from cv_inputs import (
+    CACHE_DIR, CV_DATA_FILES, DATA_DIR, FULL_HISTORY, LANGS, MEMBERS_FILE, OUTPUT_DIR, SCRIPT_DIR,
+    PublicationScope, candidate_font_files, check_inputs, load_cv_data, parse_year_range,
+    professor_person, resolve_people, validate_inputs,
 )
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-
-# ---------------------------------------------------------------------------
-# Korean fonts
-# ---------------------------------------------------------------------------
-# Two registrations are needed:
-#  - 'KoreanFont' (single weight): used by the English CV for parenthesized
-#    Korean project titles.
-#  - 'KFont'/'KFont-Bold' family: used by the Korean CV body, which needs a
-#    true bold weight. NanumSquareNeo renders both Hangul and Latin well;
-#    falls back to NanumGothic, then the single-weight KoreanFont, then
-#    Helvetica.
-KOREAN_FONT_PATHS = [
-    "/System/Library/Fonts/AppleSDGothicNeo.ttc",  # macOS
-    "/System/Library/Fonts/Supplemental/AppleGothic.ttf",  # macOS alternative
-    "/Library/Fonts/NanumGothic.ttf",  # If installed
-    "C:/Windows/Fonts/malgun.ttf",  # Windows
-]
-
-HOME = os.path.expanduser("~")
-KFONT_CANDIDATES = [
-    (HOME + "/Library/Fonts/NanumSquareNeo-bRg.ttf", HOME + "/Library/Fonts/NanumSquareNeo-cBd.ttf"),
-    ("/Library/Fonts/NanumSquareNeo-bRg.ttf", "/Library/Fonts/NanumSquareNeo-cBd.ttf"),
-    ("/Library/Fonts/NanumGothic.ttf", "/Library/Fonts/NanumGothicBold.ttf"),
-]
-
-# Fallback font names until ensure_fonts_registered() runs.
-KOREAN_FONT_NAME = "Helvetica"  # single-weight Korean font
-KFONT = "Helvetica"             # Korean family, regular
-KFONT_BOLD = "Helvetica"        # Korean family, bold
-_FONTS_REGISTERED = False
-
-
-def _try_register_font(name, path, subfont_index=None):
-    """Register a single TTF/TTC font; return True on success."""
-    try:
-        if subfont_index is not None:
-            pdfmetrics.registerFont(TTFont(name, path, subfontIndex=subfont_index))
-        else:
-            pdfmetrics.registerFont(TTFont(name, path))
-        return True
-    except Exception as e:
-        print(f"warning: could not register font {path}: {e}", file=sys.stderr)
-        return False
-
-
-def ensure_fonts_registered():
-    """Idempotently register Korean fonts and update the module-level font
-    names. Registration is lazy so importing this module has no side effects."""
-    global KOREAN_FONT_NAME, KFONT, KFONT_BOLD, _FONTS_REGISTERED
-    if _FONTS_REGISTERED:
-        return
-    _FONTS_REGISTERED = True
-
-    for font_path in KOREAN_FONT_PATHS:
-        if os.path.exists(font_path):
-            subfont = 0 if font_path.endswith('.ttc') else None
-            if _try_register_font('KoreanFont', font_path, subfont):
-                KOREAN_FONT_NAME = "KoreanFont"
-                break
-
-    KFONT = KOREAN_FONT_NAME
-    KFONT_BOLD = KOREAN_FONT_NAME
-    for reg_path, bold_path in KFONT_CANDIDATES:
-        if os.path.exists(reg_path) and os.path.exists(bold_path):
-            if (_try_register_font('KFont', reg_path)
-                    and _try_register_font('KFont-Bold', bold_path)):
-                pdfmetrics.registerFontFamily(
-                    'KFont', normal='KFont', bold='KFont-Bold',
-                    italic='KFont', boldItalic='KFont-Bold')
-                KFONT = 'KFont'
-                KFONT_BOLD = 'KFont-Bold'
-                break
-
-
-# Paths
-SCRIPT_DIR = Path(__file__).parent
-DATA_DIR = SCRIPT_DIR.parent / "src" / "data"
-OUTPUT_DIR = SCRIPT_DIR / "output"
-
-# Colors
-NAVY = HexColor('#2d3748')
-ACCENT = HexColor('#4a5568')
-LIGHT_GRAY_HEX = '#718096'
-LIGHT_GRAY = HexColor(LIGHT_GRAY_HEX)
-LINK_BLUE = '#2563eb'        # Tailwind blue-600 for journal/IF text and links
-HIGHLIGHT_BG = '#f0f4f8'     # shaded background for first/corresponding entries
-ROLE_GRAY = '#6b7280'        # non-PI role label
-HEADER_TEXT_HEX = '#e2e8f0'  # light text on the navy header band
-
-
-def load_json(filename):
-    """Load JSON data from the data directory."""
-    filepath = DATA_DIR / filename
-    if not filepath.exists():
-        print(f"error: data file not found: {filepath}", file=sys.stderr)
-        sys.exit(1)
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-
-def load_cv_data():
-    """Load and bundle all CV data files."""
-    return {
-        'professor': load_json("professor.json"),
-        'journals': load_json("journals.json"),
-        'projects': load_json("projects.json"),
-        'if_data': load_json("IF.json"),
-    }
-
-
-KO_REQUIRED_KEYS = [
-    'name', 'header_title', 'header_org', 'experience', 'education',
-    'Research Interests', 'Honors and Awards',
-    'Professional Activities/Memberships',
-]
-
-
-def validate_inputs(data, lang):
-    """Fail loudly on structurally broken data instead of silently rendering
-    an incomplete CV."""
-    errors = []
-    professor = data['professor']
-    for key in ['name', 'email', 'phone', 'experience', 'education']:
-        if not professor.get(key):
-            errors.append(f"professor.json: missing required key '{key}'")
-    for pub in data['journals']:
-        for key in ['year', 'id', 'authors', 'title', 'journal']:
-            if key not in pub:
-                errors.append(f"journals.json: entry {pub.get('id', '?')} missing '{key}'")
-    for proj in data['projects']:
-        for key in ['title', 'period', 'role']:
-            if key not in proj:
-                errors.append(f"projects.json: entry missing '{key}': {str(proj)[:60]}")
-    if lang == 'ko':
-        kod = professor.get('ko')
-        if not kod:
-            errors.append("professor.json: Korean CV requires a 'ko' key")
-        else:
-            for key in KO_REQUIRED_KEYS:
-                if key not in kod:
-                    errors.append(f"professor.json: 'ko' missing '{key}'")
-    if errors:
-        for err in errors:
-            print(f"error: {err}", file=sys.stderr)
-        sys.exit(1)
+from labdata import atomic_open, trace  # on sys.path via cv_inputs
 
+# Modules whose source is part of the build-cache fingerprint: the generator
+# and all of labdata, globbed so new modules are never left out.
+SOURCE_FILES = [SCRIPT_DIR / "generate_cv.py", SCRIPT_DIR / "cv_inputs.py", SCRIPT_DIR / "cv_pdf.py"] + sorted(
+    (SCRIPT_DIR.parent / "labdata").glob("*.py"))
 
-def ko_sanitize(text):
-    """Replace punctuation glyphs missing from the Korean CV font (NanumSquareNeo)
-    with supported equivalents so they don't render as tofu boxes."""
-    if not text:
-        return text
-    return (text
-            .replace('・', '·')   # ・ KATAKANA MIDDLE DOT -> · MIDDLE DOT
-            .replace('ㆍ', '·'))   # ㆍ HANGUL ARAEA -> · MIDDLE DOT
+# Part of the build-cache fingerprint, together with the generator source.
+# Bump to invalidate cached PDFs for changes the source hash can't see
+# (e.g. a reportlab upgrade).
+GENERATOR_VERSION = 1
 
 
 # ---------------------------------------------------------------------------
-# Bilingual labels and Korean content
+# Build cache
 # ---------------------------------------------------------------------------
-LABELS = {
-    'en': {
-        'cv_title': 'CURRICULUM VITAE',
-        'phone': 'Phone', 'email': 'E-mail',
-        'research_interests': 'Research Interests',
-        'experience': 'Professional Experience',
-        'education': 'Education',
-        'awards': 'Honors and Awards',
-        'activities': 'Professional Activities',
-        'publications': 'Publications',
-        'pub_note': '* Shaded entries indicate first author or corresponding author publications.',
-        'journal_articles': 'Journal Articles',
-        'in_submission': 'In Submission',
-        'total': 'Total', 'corresponding': 'Corresponding', 'coauthor': 'Co-Author',
-        'submitted': 'Submitted',
-        'grants': 'Research Grants',
-        'grant_note': '* Shaded entries indicate grants with funding ≥ 10B KRW.',
-        'ongoing': 'Ongoing Grants', 'completed': 'Completed Grants',
-        'since': 'since',
-    },
-    'ko': {
-        'cv_title': '이력서',
-        'phone': '전화', 'email': '이메일',
-        'research_interests': '연구 분야',
-        'experience': '주요 경력',
-        'education': '학력',
-        'awards': '수상 경력',
-        'activities': '학회 및 대외 활동',
-        'publications': '연구 논문',
-        'pub_note': '* 음영 표시는 제1저자 또는 교신저자 논문입니다.',
-        'journal_articles': '학술지 논문',
-        'in_submission': '투고 중',
-        'total': '총', 'corresponding': '교신저자', 'coauthor': '공저자',
-        'submitted': '투고 중',
-        'grants': '연구 과제',
-        'grant_note': '* 음영 표시는 100억 원 이상 과제입니다.',
-        'ongoing': '진행 중 과제', 'completed': '완료 과제',
-        'since': '이후',
-    },
-}
-
-class SectionHeader(Flowable):
-    """Custom flowable for section headers with icon."""
-    def __init__(self, text, icon_char="●", subtitle=None,
-                 title_font="Helvetica-Bold", subtitle_font="Helvetica", uppercase=True):
-        Flowable.__init__(self)
-        self.text = text
-        self.icon_char = icon_char
-        self.subtitle = subtitle
-        self.title_font = title_font
-        self.subtitle_font = subtitle_font
-        self.uppercase = uppercase
-        self.width = 17*cm
-        self.height = 1.2*cm
-        # Never let a section header sit alone at the bottom of a page,
-        # separated from the content that follows it.
-        self.keepWithNext = 1
-
-    def draw(self):
-        title = self.text.upper() if self.uppercase else self.text
-
-        # Draw icon circle
-        self.canv.setFillColor(NAVY)
-        self.canv.circle(0.4*cm, 0.4*cm, 0.35*cm, fill=1, stroke=0)
-
-        # Draw icon character (white)
-        self.canv.setFillColor(white)
-        self.canv.setFont("Helvetica-Bold", 10)
-        self.canv.drawCentredString(0.4*cm, 0.25*cm, self.icon_char)
-
-        # Draw section title
-        self.canv.setFillColor(NAVY)
-        self.canv.setFont(self.title_font, 13)
-        self.canv.drawString(1.2*cm, 0.25*cm, title)
-
-        # Draw subtitle if present (lighter color)
-        if self.subtitle:
-            title_width = self.canv.stringWidth(title, self.title_font, 13)
-            self.canv.setFillColor(LIGHT_GRAY)
-            self.canv.setFont(self.subtitle_font, 11)
-            self.canv.drawString(1.2*cm + title_width + 0.2*cm, 0.25*cm, self.subtitle)
-
-
-class TimelineItem(Flowable):
-    """Custom flowable for timeline items with bullet."""
-    def __init__(self, has_bullet=True):
-        Flowable.__init__(self)
-        self.has_bullet = has_bullet
-        self.width = 0.5*cm
-        self.height = 0.5*cm
-
-    def draw(self):
-        if self.has_bullet:
-            self.canv.setFillColor(NAVY)
-            # Diamond shape
-            self.canv.saveState()
-            self.canv.translate(0.15*cm, 0.15*cm)
-            self.canv.rotate(45)
-            self.canv.rect(-0.08*cm, -0.08*cm, 0.16*cm, 0.16*cm, fill=1, stroke=0)
-            self.canv.restoreState()
-
-
-def create_styles(lang='en'):
-    """Create custom paragraph styles. In Korean mode, text styles that carry
-    Hangul use the Korean font family (with a real bold weight); the publication
-    list stays in Helvetica since those entries are English."""
-    ko = (lang == 'ko')
-    base = KFONT if ko else 'Helvetica'
-    bold = KFONT_BOLD if ko else 'Helvetica-Bold'
-    oblique = KFONT if ko else 'Helvetica-Oblique'
-
-    styles = getSampleStyleSheet()
-
-    # Header name style (white on dark)
-    styles.add(ParagraphStyle(
-        name='HeaderName',
-        fontName=base,
-        fontSize=28,
-        textColor=white,
-        alignment=TA_LEFT,
-        spaceAfter=2,
-    ))
-
-    # Header contact style
-    styles.add(ParagraphStyle(
-        name='HeaderContact',
-        fontName=base,
-        fontSize=10,
-        textColor=white,
-        alignment=TA_LEFT,
-        spaceAfter=1,
-    ))
-
-    # Summary style
-    styles.add(ParagraphStyle(
-        name='Summary',
-        fontName=base,
-        fontSize=10,
-        textColor=black,
-        alignment=TA_JUSTIFY,
-        leading=14,
-        spaceBefore=10,
-        spaceAfter=10,
-    ))
-
-    # Date style (left column)
-    styles.add(ParagraphStyle(
-        name='Date',
-        fontName=base,
-        fontSize=10,
-        textColor=ACCENT,
-        alignment=TA_LEFT,
-        leading=14,
-    ))
-
-    # Item title style
-    styles.add(ParagraphStyle(
-        name='ItemTitle',
-        fontName=bold,
-        fontSize=10,
-        textColor=black,
-        alignment=TA_LEFT,
-        leading=14,
-    ))
-
-    # Item subtitle style (institution)
-    styles.add(ParagraphStyle(
-        name='ItemSubtitle',
-        fontName=oblique,
-        fontSize=10,
-        textColor=ACCENT,
-        alignment=TA_LEFT,
-        leading=13,
-    ))
-
-    # Item description style
-    styles.add(ParagraphStyle(
-        name='ItemDesc',
-        fontName=base,
-        fontSize=9,
-        textColor=LIGHT_GRAY,
-        alignment=TA_LEFT,
-        leading=12,
-    ))
-
-    # Publication style (with hanging indent)
-    styles.add(ParagraphStyle(
-        name='Publication',
-        fontName='Helvetica',
-        fontSize=9,
-        textColor=black,
-        alignment=TA_JUSTIFY,
-        leading=12,
-        spaceBefore=2,
-        spaceAfter=4,
-        leftIndent=10,
-        firstLineIndent=-10,
-    ))
-
-    # Highlighted publication style (for first author or corresponding, with hanging indent)
-    styles.add(ParagraphStyle(
-        name='PublicationHighlight',
-        fontName='Helvetica',
-        fontSize=9,
-        textColor=black,
-        alignment=TA_JUSTIFY,
-        leading=12,
-        spaceBefore=2,
-        spaceAfter=4,
-        backColor=HexColor(HIGHLIGHT_BG),
-        leftIndent=10,
-        firstLineIndent=-10,
-    ))
-
-    # Subsection style
-    styles.add(ParagraphStyle(
-        name='Subsection',
-        fontName=bold,
-        fontSize=10,
-        textColor=NAVY,
-        alignment=TA_LEFT,
-        spaceBefore=8,
-        spaceAfter=4,
-    ))
-
-    # Centered document title ("CURRICULUM VITAE" / "이력서")
-    styles.add(ParagraphStyle(
-        name='CVTitle',
-        fontName=bold,
-        fontSize=22,
-        textColor=NAVY,
-        alignment=TA_CENTER,
-        spaceAfter=6,
-    ))
-
-    # Research-interest bullet line
-    styles.add(ParagraphStyle(
-        name='Interest',
-        fontName=base,
-        fontSize=9,
-        textColor=black,
-        alignment=TA_LEFT,
-        leading=12,
-        spaceBefore=1,
-        spaceAfter=1,
-        leftIndent=12,
-        firstLineIndent=-7,
-    ))
-
-    # Professional-activity bullet line
-    styles.add(ParagraphStyle(
-        name='Activity',
-        fontName=base,
-        fontSize=9,
-        textColor=black,
-        alignment=TA_LEFT,
-        leading=12,
-        spaceBefore=2,
-        spaceAfter=2,
-        leftIndent=12,
-        firstLineIndent=-7,
-    ))
-
-    # Right-aligned footnotes under section headers
-    styles.add(ParagraphStyle(
-        name='PubNote',
-        fontName=base,
-        fontSize=8,
-        textColor=LIGHT_GRAY,
-        alignment=TA_RIGHT,
-    ))
-    styles.add(ParagraphStyle(
-        name='GrantNote',
-        fontName=base,
-        fontSize=8,
-        textColor=LIGHT_GRAY,
-        alignment=TA_RIGHT,
-    ))
-
-    # Compact one-line project entries (plain / large-grant highlight)
-    styles.add(ParagraphStyle(
-        name='ProjectCompact',
-        fontName=base,
-        fontSize=9,
-        textColor=black,
-        alignment=TA_LEFT,
-        leading=12,
-        spaceBefore=2,
-        spaceAfter=3,
-        leftIndent=12,
-        firstLineIndent=-7,
-    ))
-    styles.add(ParagraphStyle(
-        name='ProjectHighlight',
-        fontName=base,
-        fontSize=9,
-        textColor=black,
-        alignment=TA_LEFT,
-        leading=12,
-        spaceBefore=2,
-        spaceAfter=3,
-        leftIndent=12,
-        firstLineIndent=-7,
-        backColor=HexColor(HIGHLIGHT_BG),
-    ))
-
-    return styles
-
-
-def create_header_table(professor, lang='en'):
-    """Create the header with dark background, photo, and affiliation."""
-    ko = (lang == 'ko')
-    styles = create_styles(lang)
-    base = KFONT if ko else 'Helvetica'
-    L = LABELS[lang]
-    kod = professor.get('ko') or {}  # Korean overlay from professor.json
-
-    # Name styling: regular font
-    name_html = kod['name'] if ko else professor["name"]
-
-    # Current affiliations
-    affiliation_line1 = ""
-    affiliation_line2 = ""
-    if ko:
-        affiliation_line1 = kod.get('header_title', '')
-        affiliation_line2 = kod.get('header_org', '')
-    else:
-        for exp in professor.get("experience", []):
-            if isinstance(exp, dict):
-                # New object format
-                position = exp.get("position", "")
-                institution = exp.get("institution", "")
-                period = exp.get("period", "")
-                if "Director" in position and ("Present" in period or "present" in period):
-                    affiliation_line1 = position
-                    department = exp.get("Department", "")
-                    if department:
-                        affiliation_line2 = f"{department}<br/>{institution}"
-                    else:
-                        affiliation_line2 = institution.replace(", ", "<br/>")
-                    break
-            else:
-                # Legacy string format
-                if "Director" in exp and ("Present" in exp or "present" in exp):
-                    parts = exp.split(", ")
-                    if len(parts) >= 3:
-                        affiliation_line1 = parts[0]  # Director
-                        affiliation_line2 = f"{parts[1]}, {parts[2]}"  # Division, Institution
-                        break
-
-    # Name style
-    name_style = ParagraphStyle(
-        name='HeaderName',
-        fontName=base,
-        fontSize=18,
-        textColor=white,
-        alignment=TA_LEFT,
-        leading=22,
-        spaceAfter=4,
-    )
-
-    # Affiliation style with tighter leading
-    affiliation_style = ParagraphStyle(
-        name='HeaderAffiliation',
-        fontName=base,
-        fontSize=9,
-        textColor=HexColor(HEADER_TEXT_HEX),
-        alignment=TA_LEFT,
-        leading=12,
-        spaceAfter=6,
-    )
+def cv_data_files(person, scope=PublicationScope()):
+    """The data files one person's CV is rendered from."""
+    keys = ['professor', 'journals', 'projects', 'if_data']
+    keys += [key for key in ['preprints', 'conferences'] if getattr(scope, key)]
+    files = [CV_DATA_FILES[key] for key in keys]
+    if person.key != 'professor':
+        files.append(MEMBERS_FILE)
+    return files
+
+
+def cv_fingerprint(lang, person, scope=PublicationScope()):
+    """Hash of every input that affects the rendered PDF, or None when an
+    input is missing (the regular build path then reports it)."""
+    h = hashlib.sha256(f"v{GENERATOR_VERSION}:{lang}\0".encode())
+    h.update(json.dumps([person.key, person.slug, person.highlight,
+                         person.own_publications_only, person.grants,
+                         dataclasses.astuple(scope)]).encode())
+    data_files = cv_data_files(person, scope)
+    try:
+        for source in SOURCE_FILES:
+            h.update(f"{source.name}\0".encode())
+            h.update(source.read_bytes())
+        for filename in data_files:
+            raw = (DATA_DIR / filename).read_bytes()
+            h.update(f"{filename}:{len(raw)}\0".encode())
+            h.update(raw)
+        if person.photo.is_file():
+            h.update(person.photo.read_bytes())
+    except (OSError, ValueError):
+        return None
+    for path in candidate_font_files():
+        st = os.stat(path)
+        h.update(f"{path}:{st.st_size}:{st.st_mtime_ns}\0".encode())
+    return h.hexdigest()
+
+
+def cached_pdf_path(person, lang, fingerprint, scope=PublicationScope()):
+    return CACHE_DIR / f"CV_{person.slug}{scope.tag}_{lang}_{fingerprint[:20]}.pdf"
+
+
+def store_cached_pdf(person, lang, fingerprint, pdf_path, scope=PublicationScope()):
+    """Copy a fresh build into the cache, replacing older builds of the same CV
+    (same person, language and scope)."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    target = cached_pdf_path(person, lang, fingerprint, scope)
+    for stale in CACHE_DIR.glob(f"CV_{person.slug}{scope.tag}_{lang}_*.pdf"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+    with atomic_open(target) as f, open(pdf_path, 'rb') as src:
+        shutil.copyfileobj(src, f)
+
+
+def generate_cv(lang='en', use_cache=True, person=None, data=None, scope=PublicationScope()):
+    """Generate one CV PDF in the given language ('en' or 'ko').
+
+    person defaults to the professor; data is the load_cv_data() bundle and
+    is loaded here when not given (batch runs pass one shared bundle).
+    scope selects the publications listed (default: journal articles from 2024).
+    When use_cache is set and nothing the CV depends on has changed since a
+    previous build, the cached PDF is copied instead of rebuilding it."""
+    if data is None:
+        data = load_cv_data()
+    if person is None:
+        person = professor_person(data['professor'])
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    suffix = "_KR" if lang == 'ko' else ""
+    output_path = OUTPUT_DIR / f"{datetime.now().strftime('%Y%m%d')}_CV_{person.slug}{scope.tag}{suffix}.pdf"
+
+    with trace.span(f"cv {person.slug} {lang}") as span:
+        with trace.span("fingerprint"):
+            fingerprint = cv_fingerprint(lang, person, scope) if use_cache else None
+        if fingerprint and cached_pdf_path(person, lang, fingerprint, scope).exists():
+            with trace.span("copy cached pdf"):
+                shutil.copyfile(cached_pdf_path(person, lang, fingerprint, scope), output_path)
+            span['cached'] = True
+            print(f"PDF CV up to date (cached): {output_path}")
+            return output_path
+
+        with trace.span("validate_inputs"):
+            validate_inputs(data, lang, scope)
+        # Deferred so that validation failures and cache hits never pay for
+        # importing reportlab.
+        with trace.span("import cv_pdf"):
+            from cv_pdf import render_pdf
+        with trace.span("render_pdf"):
+            render_pdf(data, lang, output_path, person, scope)
+        if fingerprint:
+            with trace.span("store cached pdf"):
+                store_cached_pdf(person, lang, fingerprint, output_path, scope)
+    print(f"PDF CV generated successfully: {output_path}")
+    return output_path
 
-    name_para = Paragraph(name_html, name_style)
-    affiliation_para = None
-    if affiliation_line1:
-        affiliation_text = f'{affiliation_line1}<br/>{affiliation_line2}'
-        affiliation_para = Paragraph(affiliation_text, affiliation_style)
 
-    phone_para = Paragraph(f"<b>{L['phone']}</b>  {professor['phone']}", styles['HeaderContact'])
-    email_para = Paragraph(f"<b>{L['email']}</b>  {professor['email']}", styles['HeaderContact'])
+def generate_batch(tasks, use_cache=True, scope=PublicationScope()):
+    """Render many CVs, given as (person key, lang) pairs, in this process.
 
-    # Right column: photo
-    image_path = SCRIPT_DIR.parent / "public" / professor.get("image", "").lstrip("/")
-    if not image_path.exists():
-        image_path = SCRIPT_DIR.parent / "src" / "assets" / "images" / "members" / "professor.jpeg"
+    The data files are loaded once, and fonts and styles are registered and
+    compiled once per process, so N CVs cost one startup. Every CV is
+    attempted even if another one fails. Returns
+    ({(key, lang): output_path}, {(key, lang): error message})."""
+    outputs, errors = {}, {}
+    try:
+        data = load_cv_data()
+        people = {p.key: p for p in resolve_people(data, list(dict.fromkeys(k for k, _ in tasks)))}
+    except (SystemExit, ValueError) as e:
+        message = "input validation failed" if isinstance(e, SystemExit) else str(e)
+        return outputs, {task: message for task in tasks}
 
-    if image_path.exists():
+    for key, lang in tasks:
         try:
-            prof_image = Image(str(image_path), width=2.5*cm, height=3.2*cm)
+            outputs[key, lang] = generate_cv(lang, use_cache, people[key], data, scope)
+        except SystemExit:
+            # validate_inputs() already printed the details
+            errors[key, lang] = "input validation failed"
         except Exception as e:
-            print(f"warning: could not load profile image {image_path}: {e}", file=sys.stderr)
-            prof_image = Spacer(1, 1)
-    else:
-        prof_image = Spacer(1, 1)
-
-    # Left column content stacked vertically
-    left_content = [[name_para]]
-    if affiliation_para:
-        left_content.append([affiliation_para])
-    left_content.append([phone_para])
-    left_content.append([email_para])
-    left_table = Table(left_content, colWidths=[12*cm])
-    left_table.setStyle(TableStyle([
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ('TOPPADDING', (0, 0), (-1, -1), 0),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
-
-    # Combine left and right
-    header_row = [[left_table, prof_image]]
-    header_table = Table(header_row, colWidths=[13*cm, 4*cm])
-    header_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), NAVY),
-        ('LEFTPADDING', (0, 0), (0, 0), 15),
-        ('RIGHTPADDING', (1, 0), (1, 0), 15),
-        ('TOPPADDING', (0, 0), (-1, -1), 15),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 15),
-        ('VALIGN', (0, 0), (0, 0), 'MIDDLE'),  # center text so photo-driven banner height leaves no dead band below the contact lines
-        ('VALIGN', (1, 0), (1, 0), 'MIDDLE'),
-        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-    ]))
-
-    return header_table
-
-
-def make_section_header(title, icon="●", subtitle=None, gap=6, lang='en'):
-    """Section header followed by a gap, chained with keepWithNext so the
-    header is never stranded at the bottom of a page away from its first content."""
-    if lang == 'ko':
-        header = SectionHeader(title, icon, subtitle,
-                               title_font=KFONT_BOLD, subtitle_font=KFONT, uppercase=False)
-    else:
-        header = SectionHeader(title, icon, subtitle)
-    spacer = Spacer(1, gap)
-    spacer.keepWithNext = 1  # chain header -> gap -> first content flowable
-    return [header, spacer]
-
-
-def create_timeline_entry(date_text, title, subtitle=None, description=None, styles=None):
-    """Create a timeline entry with date, bullet, and content."""
-    content_parts = [Paragraph(title, styles['ItemTitle'])]
-    if subtitle:
-        content_parts.append(Paragraph(subtitle, styles['ItemSubtitle']))
-    if description:
-        content_parts.append(Paragraph(description, styles['ItemDesc']))
-
-    # Stack content vertically
-    content_table = Table([[p] for p in content_parts], colWidths=[13*cm])
-    content_table.setStyle(TableStyle([
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ('TOPPADDING', (0, 0), (-1, -1), 0),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
-
-    # Create timeline row: [bullet] [date] [content]
-    date_para = Paragraph(date_text, styles['Date'])
-    bullet = TimelineItem(has_bullet=True)
-
-    row = [[bullet, date_para, content_table]]
-    entry_table = Table(row, colWidths=[0.6*cm, 2.2*cm, 13*cm])
-    entry_table.setStyle(TableStyle([
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ('TOPPADDING', (0, 0), (-1, -1), 2),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-    ]))
-
-    return entry_table
-
-
-def extract_years(text):
-    """All 4-digit years found in a string."""
-    return re.findall(r'(\d{4})', text or "")
-
-
-def first_year(text):
-    """First 4-digit year in a string as int, or 0 (used for sorting)."""
-    years = extract_years(text)
-    return int(years[0]) if years else 0
-
-
-def format_year_range(period):
-    """Education-style year display: 'Y0 - Y1', 'Y0', or ''."""
-    years = extract_years(period)
-    if len(years) >= 2:
-        return f"{years[0]} - {years[1]}"
-    if len(years) == 1:
-        return years[0]
-    return ""
-
-
-def format_period_range(period_str):
-    """Parse date range string and return formatted display.
-
-    Handles formats like:
-    - "2023.3-Present"
-    - "2011.8-2011.12"
-    - "2025.05 - 2025.12"
-    """
-    # Clean up the string
-    period = period_str.strip()
-
-    # Check for Present
-    is_present = "present" in period.lower()
-
-    # Find all year.month patterns
-    date_pattern = r'(\d{4})\.(\d{1,2})'
-    matches = re.findall(date_pattern, period)
-
-    if not matches:
-        # Try just year pattern
-        year_pattern = r'(\d{4})'
-        years = re.findall(year_pattern, period)
-        if years:
-            if is_present:
-                return f"{years[0]} -\nPresent"
-            elif len(years) >= 2:
-                return f"{years[0]} -\n{years[1]}"
-            else:
-                return years[0]
-        return period
-
-    # Format: YYYY.MM
-    if len(matches) >= 1:
-        start_year, start_month = matches[0]
-        start_str = f"{start_year}.{int(start_month):02d}"
-
-        if is_present:
-            return f"{start_str} -\nPresent"
-        elif len(matches) >= 2:
-            end_year, end_month = matches[1]
-            end_str = f"{end_year}.{int(end_month):02d}"
-            return f"{start_str} -\n{end_str}"
-        else:
-            return start_str
-
-    return period
-
-
-def abbreviate_name(full_name):
-    """Convert full name to abbreviated format:
-    'Ho Won Lee' -> 'H.W. Lee'
-    'Dong-Kyu Kim' -> 'D.-K. Kim'
-    """
-    parts = full_name.strip().split()
-    if len(parts) < 2:
-        return full_name
-    # Last word is the last name, everything else becomes initials
-    last_name = parts[-1]
-
-    initials_parts = []
-    for p in parts[:-1]:
-        # Handle hyphenated names like "Dong-Kyu" -> "D.-K."
-        if '-' in p:
-            hyphen_parts = p.split('-')
-            hyphen_initials = '-'.join([hp[0].upper() + '.' for hp in hyphen_parts if hp])
-            initials_parts.append(hyphen_initials)
-        else:
-            initials_parts.append(p[0].upper() + '.')
-
-    initials = ''.join(initials_parts)
-    return f"{initials} {last_name}"
-
-
-def format_authors(authors, highlight_name="Ho Won Lee"):
-    """Format author list, highlighting the professor's name. Only show * for Ho Won Lee if corresponding."""
-    formatted = []
-    for author in authors:
-        is_corresponding = '*' in author
-        clean_name = author.replace('^', '').replace('*', '').replace('+', '')
-        abbrev_name = abbreviate_name(clean_name)
-
-        if highlight_name.lower() in clean_name.lower():
-            # Only show * for Ho Won Lee when he is corresponding author
-            if is_corresponding:
-                formatted.append(f"<b>{abbrev_name}</b><super>*</super>")
-            else:
-                formatted.append(f"<b>{abbrev_name}</b>")
-        else:
-            # Other authors: don't show * marker
-            formatted.append(abbrev_name)
-    return ", ".join(formatted)
-
-
-def is_first_or_corresponding(authors, name="Ho Won Lee"):
-    """Check if the name is first author or corresponding author."""
-    if not authors:
-        return False
-
-    # Check first author
-    first_author = authors[0].replace('^', '').replace('*', '').replace('+', '')
-    if name.lower() in first_author.lower():
-        return True
-
-    return is_corresponding_author(authors, name)
-
-
-def is_corresponding_author(authors, name="Ho Won Lee"):
-    """Check if the name is marked (*) as corresponding author."""
-    for author in authors or []:
-        if '*' in author:
-            clean_name = author.replace('^', '').replace('*', '').replace('+', '')
-            if name.lower() in clean_name.lower():
-                return True
-    return False
-
-
-def pick(value, lang='en'):
-    """Return value[lang] for {'en':.., 'ko':..} bilingual dicts, else value itself."""
-    return value.get(lang, value) if isinstance(value, dict) else value
-
-
-def doi_link_markup(doi):
-    """Blue [DOI]/[SSRN]/[arXiv] link markup for a DOI string."""
-    doi_url = f"https://doi.org/{doi}"
-    if 'ssrn' in doi.lower():
-        link_text = 'SSRN'
-    elif 'arxiv' in doi.lower():
-        link_text = 'arXiv'
-    else:
-        link_text = 'DOI'
-    return f' <font color="{LINK_BLUE}"><link href="{doi_url}">[{link_text}]</link></font>'
-
-
-def journal_with_if(journal, if_data):
-    """Italic journal name, with blue impact-factor info when known."""
-    if journal in if_data:
-        return f'<i>{journal}</i><font color="{LINK_BLUE}"> ({if_data[journal]})</font>'
-    return f'<i>{journal}</i>'
-
-
-def get_pub_sort_key(pub):
-    """Sort newest year first, then highest id number first."""
-    match = re.search(r'\d+', pub['id'])
-    num = -int(match.group()) if match else 0
-    return (-pub['year'], num)
-
-
-def is_pi_role(proj):
-    return pick(proj['role']).upper() in ['PI', 'CO-PI']
-
-
-def get_project_start_year(proj):
-    return first_year(pick(proj['period']))
-
+            errors[key, lang] = f"{type(e).__name__}: {e}"
+    return outputs, errors
+
+
+def _worker_batch(tasks, use_cache, scope, tracing):
+    """generate_batch() in a pool worker; also hands back the worker's trace
+    events when the parent is tracing."""
+    if tracing:
+        trace.enable(f"cv worker {os.getpid()}")
+    outputs, errors = generate_batch(tasks, use_cache, scope)
+    return outputs, errors, trace.drain()
+
+
+def plan_tasks(people, langs=LANGS):
+    """(person key, lang) pairs to render; languages a person's data doesn't
+    support (Korean without a 'ko' overlay) are skipped."""
+    return [(person.key, lang) for person in people for lang in langs if lang in person.langs]
+
+
+def generate_all(langs=LANGS, jobs=1, use_cache=True, people=('professor',),
+                 scope=PublicationScope()):
+    """Render every requested person's CV in every language, split across a
+    process pool when jobs > 1 (each worker renders its share as one batch).
+
+    people are keys for resolve_people(): 'professor', 'members' or
+    members.json ids. Returns ({(key, lang): output_path},
+    {(key, lang): error message})."""
+    tasks = plan_tasks(resolve_people(load_cv_data(), list(people)), langs)
+    if jobs <= 1 or len(tasks) <= 1:
+        return generate_batch(tasks, use_cache, scope)
+
+    # Workers share nothing with the parent; each one registers the fonts on
+    # its first real build (module globals are per-process), so cache hits
+    # never pay for font parsing.
+    outputs, errors = {}, {}
+    workers = min(jobs, len(tasks))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_worker_batch, tasks[i::workers], use_cache, scope, trace.enabled())
+                   for i in range(workers)]
+        for future in as_completed(futures):
+            done, failed, events = future.result()
+            outputs.update(done)
+            errors.update(failed)
+            trace.merge(events)
+    return outputs, errors
+
+
+def report_errors(errors):
+    for (key, lang), message in errors.items():
+        print(f"error: {key} {lang} CV failed: {message}", file=sys.stderr)
+
+
+def watch_cvs(langs=LANGS, people=('professor',), use_cache=True, scope=PublicationScope()):
+    """Build the requested CVs, then stay resident and rebuild only the CVs
+    whose data files change. Fonts, styles and reportlab stay loaded, and
+    unchanged data files are not re-read. The set of people is fixed at start."""
+    from labdata.watch import watch
+    resolved = {p.key: p for p in resolve_people(load_cv_data(), list(people))}
+    tasks = plan_tasks(resolved.values(), langs)
+    deps = {f"{key}/{lang}": cv_data_files(resolved[key], scope) for key, lang in tasks}
+    task_of = dict(zip(deps, tasks))
+
+    report_errors(generate_batch(tasks, use_cache, scope)[1])
+
+    def rebuild(targets, changed):
+        report_errors(generate_batch([task_of[t] for t in targets], use_cache, scope)[1])
+
+    watch(deps, rebuild)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lang', action='append', choices=LANGS,
+                        help="language to render (repeatable; default: all)")
+    parser.add_argument('--person', action='append', metavar='ID',
+                        help="whose CV to render: 'professor' (default), 'members' for "
+                             "everyone in members.json, or a members.json id (repeatable)")
+    parser.add_argument('--all', action='store_true',
+                        help="render the professor and every lab member (same as "
+                             "--person professor --person members)")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="render CVs in N worker processes (default: 1)")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild even if the build cache is up to date")
+    parser.add_argument('--pub-years', metavar='RANGE',
+                        help="years of the publications section, e.g. 2018-2022, 2020- or "
+                             "all (default: 2024-)")
+    parser.add_argument('--full-history', action='store_true',
+                        help="list every publication: all years of journal articles, "
+                             "preprints and conference presentations")
+    parser.add_argument('--trace', metavar='FILE',
+                        help="write a Chrome/Perfetto trace of the build to FILE (JSON)")
+    parser.add_argument('--watch', action='store_true',
+                        help="keep running and rebuild the CVs whose data files change")
+    parser.add_argument('--check', action='store_true',
+                        help="only validate the input data and report every error (no PDF)")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        problems = check_inputs(args.lang or LANGS)
+        for err in problems:
+            print(f"error: {err}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+        print(f"CV inputs OK ({', '.join(args.lang or LANGS)})")
+        return {}
 
-def get_funding_amount_billion(proj):
-    """Extract funding amount in billions of KRW from a project."""
-    if not proj.get('fundingAmount'):
-        return 0.0
-    amount_str = pick(proj['fundingAmount'])
-    match = re.search(r'([\d.]+)B', amount_str)
-    if match:
+    scope = FULL_HISTORY if args.full_history else PublicationScope()
+    if args.pub_years:
         try:
-            return float(match.group(1))
-        except ValueError:
-            return 0.0
-    return 0.0
-
-
-def is_large_grant(proj):
-    """Grants with funding >= 10B KRW get the shaded highlight."""
-    return get_funding_amount_billion(proj) >= 10
-
-
-# ---------------------------------------------------------------------------
-# Section builders
-# ---------------------------------------------------------------------------
-@dataclass(frozen=True)
-class CVContext:
-    """Everything a section builder needs to render one language's CV."""
-    lang: str
-    professor: dict
-    kod: dict        # Korean overlay from professor['ko'] ({} when absent)
-    journals: list
-    projects: list
-    if_data: dict
-    labels: dict
-    styles: object
-
-    @property
-    def ko(self):
-        return self.lang == 'ko'
-
-    def fund_amount(self, billion):
-        """Localized funding amount: '23.2B KRW' (en) or '232억 원' (ko)."""
-        if self.ko:
-            eok = billion * 10  # 1B KRW = 10억 원
-            return (f"{int(eok)}억 원" if abs(eok - round(eok)) < 1e-6 else f"{eok:.1f}억 원")
-        return f"{billion:.1f}B KRW"
-
-
-def render_publication(pub, number, ctx, status=None):
-    """One numbered publication line; status switches to the in-submission format."""
-    authors = format_authors(pub['authors'])
-    title = pub['title']
-    journal = pub['journal']
-
-    if status is None:
-        vol_info = ""
-        if pub.get('volume'):
-            vol_info += f", {pub['volume']}"
-        if pub.get('pages'):
-            vol_info += f", {pub['pages']}"
-        text = f"{number}. {authors}, \"{title}\", {journal_with_if(journal, ctx.if_data)}{vol_info}."
-    else:
-        # Skip the journal name when it just restates the status/preprint server
-        skip_journal = (
-            journal.lower() == status.lower() or
-            'preprint' in journal.lower() or
-            journal.lower() in ['submitted', 'ssrn', 'arxiv']
-        )
-        if skip_journal:
-            text = f"{number}. {authors}, \"{title}\", {status}."
-        else:
-            text = f"{number}. {authors}, \"{title}\", {journal_with_if(journal, ctx.if_data)}, {status}."
-
-    if pub.get('doi'):
-        text += doi_link_markup(pub['doi'])
-
-    # Highlighted style if first author or corresponding
-    style_name = 'PublicationHighlight' if is_first_or_corresponding(pub['authors']) else 'Publication'
-    return Paragraph(text, ctx.styles[style_name])
-
-
-def format_project_line(proj, ctx):
-    """Create a compact one-line project entry."""
-    title_en = pick(proj['title'])
-    title_ko = proj['title'].get('ko', '') if isinstance(proj['title'], dict) else ''
-    if ctx.ko:
-        title_ko = ko_sanitize(title_ko)
-    period = pick(proj['period'])
-    role = pick(proj['role'])
-    agency = pick(proj['fundingAgency'])
-
-    # Role color (PI and Co-PI both blue) and localized label
-    role_upper = role.upper()
-    role_hex = LINK_BLUE if role_upper in ['PI', 'CO-PI'] else ROLE_GRAY
-    role_label = ({'PI': '연구책임', 'CO-PI': '공동연구'}.get(role_upper, role)
-                  if ctx.ko else role)
-
-    # Localized funding amount
-    amount = ''
-    if proj.get('fundingAmount'):
-        amount = ctx.fund_amount(get_funding_amount_billion(proj))
-
-    # Shorten year format: 2021.01 => 21.01, and replace " - " with "~"
-    period = re.sub(r'(\d{4})\.', lambda m: m.group(1)[2:] + '.', period).replace(' - ', ' ~ ')
-
-    # Format: Title | Period | Agency | Role | Budget — all in one line.
-    # Korean CV leads with the Korean title; English CV leads with English.
-    if ctx.ko and title_ko:
-        line = f'•&nbsp;&nbsp;{title_ko}'
-    else:
-        line = f'•&nbsp;&nbsp;{title_en}'
-        if title_ko:
-            line += f' <font face="{KOREAN_FONT_NAME}" color="{LIGHT_GRAY_HEX}">({title_ko})</font>'
-    line += f' | {period} | {agency} |'
-    line += f' <font color="{role_hex}"><b>{role_label}</b></font>'
-    if amount:
-        line += f' | <font color="{LINK_BLUE}">{amount}</font>'
-
-    return line
-
-
-def build_title(ctx):
-    return [
-        Paragraph(ctx.labels['cv_title'], ctx.styles['CVTitle']),
-        Spacer(1, 12),
-    ]
-
-
-def build_header(ctx):
-    return [
-        create_header_table(ctx.professor, ctx.lang),
-        Spacer(1, 4),
-        # Horizontal line under header
-        HRFlowable(width="100%", thickness=2, color=NAVY, spaceAfter=8),
-    ]
-
-
-def build_summary(ctx):
-    summary_text = ctx.professor.get("bio", "")
-    if not summary_text:
-        return []
-    return [Paragraph(summary_text, ctx.styles['Summary'])]
-
-
-def build_interests(ctx):
-    if not ctx.professor.get("Research Interests"):
-        return []
-    flow = make_section_header(ctx.labels['research_interests'], "◈", lang=ctx.lang)
-    interests = ctx.kod['Research Interests'] if ctx.ko else ctx.professor["Research Interests"]
-    for interest in interests:
-        flow.append(Paragraph(f"•&nbsp;&nbsp;{interest}", ctx.styles['Interest']))
-    flow.append(Spacer(1, 6))
-    return flow
-
-
-def build_experience(ctx):
-    flow = make_section_header(ctx.labels['experience'], "◆", lang=ctx.lang)
-
-    # Sort experience by start year (newest first)
-    def exp_start_year(exp):
-        if isinstance(exp, dict):
-            period = exp.get("period", "")
-        else:
-            parts = exp.split(", ")
-            period = parts[-1] if parts else ""
-        return first_year(period)
-
-    for exp in sorted(ctx.professor["experience"], key=exp_start_year, reverse=True):
-        if isinstance(exp, dict):
-            # New object format
-            position = exp.get("position", "")
-            department = exp.get("Department", "")
-            institution = exp.get("institution", "")
-            period = exp.get("period", "")
-            if ctx.ko:
-                # Look up Korean translation by period key
-                ko_exp = ctx.kod.get('experience', {}).get(period)
-                if ko_exp:
-                    position = ko_exp['position']
-                    subtitle = ko_exp['org']
-                else:
-                    subtitle = f"{department}<br/>{institution}" if department else institution
-            # Combine department and institution with line break
-            elif department:
-                subtitle = f"{department}<br/>{institution}"
-            else:
-                subtitle = institution
-        else:
-            # Legacy string format: "Position, Institution, Period"
-            parts = exp.split(", ")
-            if len(parts) >= 3:
-                position = parts[0]
-                subtitle = ", ".join(parts[1:-1])
-                period = parts[-1]
-            else:
-                position = exp
-                subtitle = ""
-                period = ""
-
-        flow.append(create_timeline_entry(
-            format_period_range(period),
-            position,
-            subtitle if subtitle else None,
-            None,
-            ctx.styles
-        ))
-    return flow
-
-
-def build_education(ctx):
-    flow = [Spacer(1, 6)]
-    flow.extend(make_section_header(ctx.labels['education'], "◇", lang=ctx.lang))
-
-    for edu in ctx.professor["education"]:
-        if isinstance(edu, dict):
-            # New object format
-            degree = edu.get("degree", "")
-            field = edu.get("field", "")
-            institution = edu.get("institution", "")
-            period = edu.get("period", "")
-            thesis = edu.get("thesis", "")
-            advisor = edu.get("advisor", "")
-
-            if ctx.ko:
-                ko_edu = ctx.kod.get('education', {}).get(period, {})
-                degree = ko_edu.get('degree', degree)
-                field = ko_edu.get('field', field)
-                institution = ko_edu.get('institution', institution)
-                advisor = ko_edu.get('advisor', advisor)
-
-            title = f"{degree}, {field}, {institution}"
-
-            # Thesis and advisor as subtitle (thesis kept in English)
-            subtitle = None
-            description = None
-            if thesis:
-                if advisor:
-                    subtitle = f"{thesis} ({advisor})"
-                else:
-                    subtitle = thesis
-            elif ctx.ko and advisor:
-                subtitle = f"지도교수: {advisor}"
-
-            # Extract start and end years from period like "2003.3-2010.1"
-            date_display = format_year_range(period)
-        else:
-            # Legacy string format: "Degree, Field, Institution, Year"
-            parts = edu.split(", ")
-            if len(parts) >= 3:
-                title = parts[0]
-                subtitle = ", ".join(parts[1:-1])
-                year = parts[-1]
-            else:
-                title = edu
-                subtitle = ""
-                year = ""
-
-            description = None
-            legacy_years = extract_years(year)
-            date_display = legacy_years[0] if legacy_years else ""
-
-        flow.append(create_timeline_entry(
-            date_display,
-            title,
-            subtitle if subtitle else None,
-            description,
-            ctx.styles
-        ))
-    return flow
-
-
-def build_awards(ctx):
-    awards_list = ctx.professor.get("Honors and Awards") or ctx.professor.get("Grants and Awards")
-    if not awards_list:
-        return []
-
-    flow = [Spacer(1, 6)]
-    flow.extend(make_section_header(ctx.labels['awards'], "★", lang=ctx.lang))
-
-    if ctx.ko:
-        for a in ctx.kod.get('Honors and Awards', []):
-            flow.append(create_timeline_entry(
-                a.get('year', ''), a.get('name', ''),
-                a.get('org') or None, None, ctx.styles
-            ))
-        return flow
-
-    for award in awards_list:
-        # Parse: "Award Name, Date, Institution"
-        parts = award.split(", ")
-        if len(parts) >= 2:
-            # Try to find date pattern
-            date_str = ""
-            award_parts = []
-            for part in parts:
-                if re.search(r'\d{4}', part):
-                    date_str = part
-                else:
-                    award_parts.append(part)
-
-            award_name = award_parts[0] if award_parts else parts[0]
-            institution = ", ".join(award_parts[1:]) if len(award_parts) > 1 else ""
-
-            # Extract year for display
-            award_years = extract_years(date_str)
-            date_display = award_years[0] if award_years else ""
-
-            flow.append(create_timeline_entry(
-                date_display,
-                award_name,
-                institution if institution else None,
-                None,
-                ctx.styles
-            ))
-    return flow
-
-
-def build_activities(ctx):
-    if not ctx.professor.get("Professional Activities/Memberships"):
-        return []
-    flow = [Spacer(1, 6)]
-    flow.extend(make_section_header(ctx.labels['activities'], "●", lang=ctx.lang))
-    activities = (ctx.kod['Professional Activities/Memberships'] if ctx.ko
-                  else ctx.professor["Professional Activities/Memberships"])
-    for activity in activities:
-        flow.append(Paragraph(f"•&nbsp;&nbsp;{activity}", ctx.styles['Activity']))
-    return flow
-
-
-def build_publications(ctx):
-    L = ctx.labels
-    flow = [Spacer(1, 6)]
-    flow.extend(make_section_header(L['publications'], "■", subtitle="(2024-2026)", gap=4, lang=ctx.lang))
-    flow.append(Paragraph(L['pub_note'], ctx.styles['PubNote']))
-
-    # Publications from 2024 onwards only, split into published vs in-submission
-    recent_journals = [j for j in ctx.journals if j.get('year', 0) >= 2024]
-    preprint_submitted = [j for j in recent_journals if j.get('status', '').lower() in ['submitted', 'preprint']]
-    published_journals = [j for j in recent_journals if not j.get('status')]
-    published_journals.sort(key=get_pub_sort_key)
-
-    years = sorted(set(pub['year'] for pub in published_journals), reverse=True)
-
-    # Count corresponding-author vs co-author publications
-    journal_corresponding = sum(1 for pub in published_journals if is_corresponding_author(pub['authors']))
-    journal_coauthor = len(published_journals) - journal_corresponding
-    submitted_corresponding = sum(1 for pub in preprint_submitted if is_corresponding_author(pub['authors']))
-    submitted_coauthor = len(preprint_submitted) - submitted_corresponding
-
-    def format_pub_stats(total, corresponding, coauthor):
-        """Format publication statistics, omitting zero values."""
-        parts = [f"{L['total']}: {total}"]
-        if corresponding > 0:
-            parts.append(f"{L['corresponding']}: {corresponding}")
-        if coauthor > 0:
-            parts.append(f"{L['coauthor']}: {coauthor}")
-        return ", ".join(parts)
-
-    # Journal Articles (numbered continuously across year groups)
-    flow.append(Spacer(1, 4))
-    journal_stats = format_pub_stats(len(published_journals), journal_corresponding, journal_coauthor)
-    flow.append(Paragraph(f"<b>{L['journal_articles']}</b> ({journal_stats})", ctx.styles['Subsection']))
-
-    pub_number = 1
-    for year in years:
-        flow.append(Spacer(1, 2))
-        flow.append(Paragraph(f"<b><font size='10'>{year}</font></b>", ctx.styles['ItemDesc']))
-        for pub in [p for p in published_journals if p['year'] == year]:
-            flow.append(render_publication(pub, pub_number, ctx))
-            pub_number += 1
-
-    # In Submission (numbering restarts)
-    if preprint_submitted:
-        flow.append(Spacer(1, 4))
-        preprint_submitted.sort(key=get_pub_sort_key)
-        submitted_stats = format_pub_stats(len(preprint_submitted), submitted_corresponding, submitted_coauthor)
-        flow.append(Paragraph(f"<b>{L['in_submission']}</b> ({submitted_stats})", ctx.styles['Subsection']))
-        for i, pub in enumerate(preprint_submitted, 1):
-            flow.append(render_publication(pub, i, ctx, status=L['submitted']))
-
-    return flow
-
-
-def build_grants(ctx):
-    # Only include PI/Co-PI projects with funding >= 0.1B KRW (1억원)
-    pi_projects = [p for p in ctx.projects
-                   if is_pi_role(p) and get_funding_amount_billion(p) >= 0.1]
-    ongoing = sorted([p for p in pi_projects if p.get('status') == 'ongoing'],
-                     key=get_project_start_year, reverse=True)
-    completed = sorted([p for p in pi_projects if p.get('status') == 'completed'],
-                       key=get_project_start_year, reverse=True)
-
-    # Total funding amount and date range for the header subtitle
-    total_funding = sum(get_funding_amount_billion(p) for p in pi_projects)
-    earliest_year = min(get_project_start_year(p) for p in pi_projects) if pi_projects else 0
-    if total_funding > 0:
-        if ctx.ko:
-            total_funding_str = f"{ctx.fund_amount(total_funding)}, {earliest_year}년 이후"
-        else:
-            total_funding_str = f"{ctx.fund_amount(total_funding)} {ctx.labels['since']} {earliest_year}"
-    else:
-        total_funding_str = ""
-
-    flow = [Spacer(1, 6)]
-    flow.extend(make_section_header(
-        ctx.labels['grants'], "◆",
-        subtitle=f"({total_funding_str})" if total_funding_str else None,
-        gap=4, lang=ctx.lang))
-    flow.append(Paragraph(ctx.labels['grant_note'], ctx.styles['GrantNote']))
-
-    if ongoing:
-        flow.append(Spacer(1, 4))  # match the gap before the Journal Articles subsection
-        ongoing_total = sum(get_funding_amount_billion(p) for p in ongoing)
-        ongoing_total_str = f"({ctx.fund_amount(ongoing_total)})" if ongoing_total > 0 else ""
-        flow.append(Paragraph(f"<b>{ctx.labels['ongoing']}</b> {ongoing_total_str}", ctx.styles['Subsection']))
-        for proj in ongoing:
-            style_name = 'ProjectHighlight' if is_large_grant(proj) else 'ProjectCompact'
-            flow.append(Paragraph(format_project_line(proj, ctx), ctx.styles[style_name]))
-
-    if completed:
-        completed_total = sum(get_funding_amount_billion(p) for p in completed)
-        flow.append(Spacer(1, 4))
-        completed_total_str = f"({ctx.fund_amount(completed_total)})" if completed_total > 0 else ""
-        flow.append(Paragraph(f"<b>{ctx.labels['completed']}</b> {completed_total_str}", ctx.styles['Subsection']))
-        for proj in completed:
-            style_name = 'ProjectHighlight' if is_large_grant(proj) else 'ProjectCompact'
-            flow.append(Paragraph(format_project_line(proj, ctx), ctx.styles[style_name]))
-
-    return flow
-
-
-SECTION_BUILDERS = [
-    build_title,
-    build_header,
-    build_summary,
-    build_interests,
-    build_experience,
-    build_education,
-    build_awards,
-    build_activities,
-    build_publications,
-    build_grants,
-]
-
-
-def generate_cv(lang='en'):
-    """Generate the CV PDF in the given language ('en' or 'ko')."""
-    ensure_fonts_registered()
-    OUTPUT_DIR.mkdir(exist_ok=True)
-
-    data = load_cv_data()
-    validate_inputs(data, lang)
-    professor = data['professor']
-
-    ctx = CVContext(
-        lang=lang,
-        professor=professor,
-        kod=professor.get('ko') or {},
-        journals=data['journals'],
-        projects=data['projects'],
-        if_data=data['if_data'],
-        labels=LABELS[lang],
-        styles=create_styles(lang),
-    )
-
-    suffix = "_KR" if ctx.ko else ""
-    output_path = OUTPUT_DIR / f"{datetime.now().strftime('%Y%m%d')}_CV_HLee{suffix}.pdf"
-    doc = SimpleDocTemplate(
-        str(output_path),
-        pagesize=A4,
-        rightMargin=1.5*cm,
-        leftMargin=1.5*cm,
-        topMargin=0.5*cm,
-        bottomMargin=1.5*cm
-    )
-
-    story = []
-    for build_section in SECTION_BUILDERS:
-        story.extend(build_section(ctx))
-
-    doc.build(story)
-    print(f"PDF CV generated successfully: {output_path}")
-    return output_path
+            first, last = parse_year_range(args.pub_years)
+        except ValueError as e:
+            parser.error(str(e))
+        scope = dataclasses.replace(scope, first=first, last=last)
 
+    people = ['professor', 'members'] if args.all else (args.person or ['professor'])
+    if args.watch:
+        try:
+            watch_cvs(args.lang or LANGS, people, use_cache=not args.force, scope=scope)
+        except ValueError as e:
+            parser.error(str(e))
+        return {}
 
-def main():
-    generate_cv('en')   # English CV
-    generate_cv('ko')   # Korean CV (이력서)
+    if args.trace:
+        trace.enable("generate_cv")
+    try:
+        with trace.span("generate_all", people=people, jobs=args.jobs):
+            outputs, errors = generate_all(args.lang or LANGS, jobs=args.jobs,
+                                           use_cache=not args.force, people=people, scope=scope)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        if args.trace:
+            print(f"trace: {trace.write(args.trace)}")
+    report_errors(errors)
+    if errors:
+        sys.exit(1)
+    return outputs
 
 
 if __name__ == "__main__":
@@ -9,6 +9,45 @@ PNG(2752x1536)로 렌더링해 public/images/hero/slide{1,2,3}.png 를 교체한
 
     python3 hero-generator/generate_heroes.py
 
+렌더 백엔드 (--backend):
+  auto     Chrome 이 있으면 session, 없고 resvg-py 가 설치돼 있으면 resvg (기본값)
+  resvg    브라우저 없이 프로세스 안에서 래스터화 (pip install resvg-py).
+           Chrome 이 없는 헤드리스 Linux 빌드 머신용. 시스템 폰트와 --font-dir /
+           --font-file 로 넘긴 폰트를 쓴다. FONT 의 이름이 하나도 없으면 sans-serif 로
+           RESVG_FAMILIES 중 실제로 글자를 그리는 첫 폰트를 쓰고 (--font-family 로 지정
+           가능), 어떤 폰트로도 텍스트를 그릴 수 없으면 렌더링하지 않고 종료한다
+  session  Chrome을 한 번만 띄워 DevTools 파이프로 모든 슬라이드를 탭 여러 개에서
+           동시에 렌더링하고, PNG를 메모리로 바로 받는다
+  cli      슬라이드마다 Chrome --screenshot 프로세스를 새로 띄운다 (예전 방식)
+
+Chrome 경로는 CHROME 환경변수로 지정할 수 있고, 없으면 macOS 기본 경로와
+PATH 의 google-chrome/chromium 을 차례로 찾는다.
+
+렌더 결과는 최종 SVG 텍스트 + 렌더러 설정(Chrome/resvg 버전, 폰트 파일 목록 포함)의 해시로
+build/cache/ 에 캐시된다.
+데이터를 쓰지 않는 slide1/2 는 보통 캐시에서 바로 나오고, 바이트가 같은 출력
+PNG는 다시 쓰지 않는다 (--no-cache 로 강제 렌더링).
+
+PNG 인코딩: 렌더러가 준 PNG는 압축이 약하므로 다시 인코딩한다. 필터 5종 고정 +
+행별 적응형과 zlib 전략(default/filtered/rle) 조합을 표본 행으로 시험해 가장
+작은 것을 고르고, 결과 크기·화질(PSNR)을 슬라이드마다 출력한다. 기본은 무손실
+(출력 픽셀이 렌더 결과와 같음). --png-colors N 은 디더링한 N색 팔레트로 양자화하되
+PSNR 이 --min-psnr 미만이거나 무손실보다 커지면 무손실로 되돌린다.
+
+반응형 변형: 슬라이드마다 래스터화는 한 번만 하고, 그 PNG를 Lanczos 로 축소해
+폭별(--widths, 기본 640/1280/1920/2752) AVIF·WebP·PNG 를 slide{n}-{폭}.{포맷}
+으로 쓴다 (Pillow 필요, --no-variants 로 끔). 원본 폭 PNG는 slide{n}.png 그대로다.
+public/images/hero/manifest.json 에 슬라이드별 <source type srcset> 목록이
+들어가므로 캐러셀은 이를 <picture> 에 그대로 꽂으면 된다. 원본 PNG 해시가
+매니페스트와 같으면 다시 인코딩하지 않는다.
+
+--watch 는 한 번 전체를 만든 뒤 상주하면서 src/data 파일이 바뀌면 그 파일을 읽는
+슬라이드(SLIDE_DATA, 현재 slide3)만 다시 만든다. session 백엔드의 Chrome 은 계속
+띄워 둔다.
+
+--trace FILE 은 SVG 조립·Chrome 실행·렌더·PNG 인코딩·변형·파일 쓰기 단계를
+Chrome 트레이스 JSON 으로 남긴다 (https://ui.perfetto.dev 에서 열기).
+
 slide1: processing map 등고선 + 최적점 마커 (로고 세계관, PI의 가공성 맵 연구 오마주)
 slide2: 압연 롤 → 노드 네트워크 (소성가공 헤리티지 x AI)
 slide3: 연도별 논문 실적 막대 + 실제 논문 제목 텍스처 (데이터 기반, 자동 갱신)
@@ -17,16 +56,45 @@ slide3: 연도별 논문 실적 막대 + 실제 논문 제목 텍스처 (데이
 가장자리·하단에 배치하고 중앙부는 어둡게 비워 둔다.
 """
 
+import argparse
+import base64
+import contextlib
+import fcntl
+import functools
+import hashlib
+import io
 import json
 import math
+import os
 import pathlib
+import shutil
+import struct
 import subprocess
 import sys
+import threading
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from importlib import metadata
+
+import numpy as np
+
+try:
+    import resvg_py
+except ImportError:  # 선택 의존성: --backend resvg 에만 필요
+    resvg_py = None
+
+try:
+    from PIL import Image
+except ImportError:  # 선택 의존성: 반응형 변형(WebP/AVIF, 축소판)에만 필요
+    Image = None
 
 ROOT = pathlib.Path(__file__).resolve().parent.parent
-DATA = ROOT / "src" / "data"
+sys.path.insert(0, str(ROOT))
+from labdata import atomic_write, store, trace  # noqa: E402  src/data 공용 로더·트레이싱·원자적 쓰기 (cv-generator 와 공유)
+
 OUT = ROOT / "public" / "images" / "hero"
 WORK = pathlib.Path(__file__).resolve().parent / "build"
+CACHE = WORK / "cache"
 
 W, H = 2752, 1536
 ORANGE = "#e0762f"
@@ -36,6 +104,23 @@ EMBER = "#f0955c"
 MUTED = "#8a7666"
 FAINT = "#5e4f42"
 FONT = "Pretendard, 'Helvetica Neue', Helvetica, Arial, sans-serif"
+# 반응형 변형: 폭(px)과 포맷. 원본 폭의 PNG는 slide{n}.png 자체가 맡는다.
+VARIANT_WIDTHS = [640, 1280, 1920, W]
+VARIANT_FORMATS = ["avif", "webp", "png"]
+ENCODE_OPTIONS = {
+    "avif": {"quality": 60, "speed": 6},
+    "webp": {"quality": 82, "method": 6},
+}
+MIME = {"avif": "image/avif", "webp": "image/webp", "png": "image/png"}
+# PNG 인코딩: 필터/zlib 전략 후보는 이 간격의 행 묶음으로만 시험 압축해 고른다
+PNG_TRIAL_STRIDE, PNG_TRIAL_ROWS = 64, 8
+PNG_STRATEGIES = {"default": zlib.Z_DEFAULT_STRATEGY, "filtered": zlib.Z_FILTERED, "rle": zlib.Z_RLE}
+PNG_FILTERS = ["none", "sub", "up", "average", "paeth"]
+PNG_SIG = b"\x89PNG\r\n\x1a\n"
+# 팔레트 양자화 결과가 이 PSNR(dB) 보다 낮으면 무손실로 되돌린다
+MIN_PSNR = 40.0
+# 등고선 폴리라인이 실제 곡선에서 벗어나도 되는 최대 거리 (px, 출력 해상도 기준)
+PATH_TOL = 0.25
 
 BG = f"""
   <defs>
@@ -55,32 +140,78 @@ BG = f"""
 """
 
 
-def svg(name: str, body: str) -> pathlib.Path:
-    WORK.mkdir(parents=True, exist_ok=True)
-    path = WORK / f"{name}.svg"
-    path.write_text(
+def svg_text(body: str) -> str:
+    return (
         f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {W} {H}" '
         f'width="{W}" height="{H}">{BG}{body}</svg>'
     )
+
+
+def svg(name: str, body: str) -> pathlib.Path:
+    WORK.mkdir(parents=True, exist_ok=True)
+    path = WORK / f"{name}.svg"
+    path.write_text(svg_text(body))
     return path
 
 
-def contour_path(cx, cy, r, phases, samples=200):
-    pts = []
-    for i in range(samples + 1):
-        t = 2 * math.pi * i / samples
-        rr = r * (1 + 0.14 * math.sin(3 * t + phases[0]) + 0.07 * math.sin(5 * t + phases[1]))
-        pts.append(f"{cx + rr * math.cos(t):.1f},{cy + rr * math.sin(t):.1f}")
-    return "M" + " L".join(pts) + " Z"
+def _ring_radius(t, r, p0, p1):
+    """등고선 반지름 r(t)와 t에 대한 1·2차 도함수 (배열 연산)."""
+    s3, c3 = np.sin(3 * t + p0), np.cos(3 * t + p0)
+    s5, c5 = np.sin(5 * t + p1), np.cos(5 * t + p1)
+    rr = r * (1 + 0.14 * s3 + 0.07 * s5)
+    d1 = r * (0.42 * c3 + 0.35 * c5)
+    d2 = -r * (1.26 * s3 + 1.75 * s5)
+    return rr, d1, d2
+
+
+def contour_paths(cx, cy, radii, phases, tol=PATH_TOL, dense=720, min_samples=24):
+    """링 여러 개의 등고선 path d 문자열을 한 번의 배열 연산으로 만든다.
+
+    링마다 샘플 수는 곡률과 허용 오차로 정한다: 곡률 k 인 곳에서 길이 s 인
+    현(chord)의 최대 편차는 k*s^2/8 이므로, 밀도 sqrt(k/(8*tol)) 를 호 길이로
+    적분한 값이 필요한 샘플 수이고, 같은 적분 구간마다 점을 놓으면 굽은 곳에
+    점이 몰린다. 큰 링은 덜, 작은 링은 더 샘플링된다."""
+    r = np.asarray(radii, dtype=float)[:, None]
+    p0 = np.asarray([p[0] for p in phases], dtype=float)[:, None]
+    p1 = np.asarray([p[1] for p in phases], dtype=float)[:, None]
+    t = np.linspace(0, 2 * np.pi, dense + 1)[None, :]
+
+    rr, d1, d2 = _ring_radius(t, r, p0, p1)
+    speed = np.hypot(rr, d1)
+    curvature = np.abs(rr ** 2 + 2 * d1 ** 2 - rr * d2) / speed ** 3
+    density = np.sqrt(curvature / (8 * tol)) * speed
+    # 사다리꼴 적분 -> 링별 누적 샘플 수
+    cum = np.concatenate(
+        [np.zeros((len(r), 1)), np.cumsum((density[:, 1:] + density[:, :-1]) / 2, axis=1)], axis=1
+    ) * (2 * np.pi / dense)
+    counts = np.maximum(np.ceil(cum[:, -1]).astype(int), min_samples)
+
+    # 링마다 누적값에 오프셋을 더해 이어 붙이면 np.interp 한 번으로 모든 링의
+    # 샘플 위치(t)를 구할 수 있다.
+    offset = np.arange(len(r)) * (cum[:, -1].max() + 1)
+    ring = np.repeat(np.arange(len(r)), counts)
+    index = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    levels = offset[ring] + index * (cum[ring, -1] / counts[ring])
+    ts = np.interp(levels, (cum + offset[:, None]).ravel(), np.broadcast_to(t, cum.shape).ravel())
+    rs, _, _ = _ring_radius(ts, r[ring, 0], p0[ring, 0], p1[ring, 0])
+    xy = np.round(np.column_stack([cx + rs * np.cos(ts), cy + rs * np.sin(ts)]), 1)
+
+    paths, start = [], 0
+    for n in counts:
+        pts = xy[start:start + n].ravel().tolist()
+        start += n
+        paths.append("M" + " L".join(["%.1f,%.1f"] * n) % tuple(pts) + " Z")
+    return paths
 
 
 def contour_cluster(cx, cy, scale=1.0, rings=7, base_opacity=0.75):
+    ks = range(rings, 0, -1)
+    paths = contour_paths(cx, cy, [92 * k * scale for k in ks], [(0.7 * k, 1.9 * k) for k in ks])
     parts = []
-    for k in range(rings, 0, -1):
-        r = 92 * k * scale
+    for k, d in zip(ks, paths):
         op = base_opacity * (0.35 + 0.65 * (rings - k + 1) / rings)
         parts.append(
-            f'<path d="{contour_path(cx, cy, r, (0.7 * k, 1.9 * k))}" fill="none" '
+            f'<path d="{d}" fill="none" '
             f'stroke="{EMBER if k % 2 else DEEP}" stroke-width="{3.2 * scale:.1f}" opacity="{op:.2f}"/>'
         )
     parts.append(f'<circle cx="{cx}" cy="{cy}" r="{60 * scale:.0f}" fill="{RUST}" opacity="0.5"/>')
@@ -96,10 +227,6 @@ def marker(cx, cy, dx, dy, scale=1.0):
     )
 
 
-def load(name):
-    return json.load(open(DATA / f"{name}.json"))
-
-
 def slide1():
     body = []
     body.append(contour_cluster(660, 1120, 1.0))
@@ -171,23 +298,19 @@ def slide2():
 
 
 def slide3():
-    journals = load("journals")
-    research = load("research")
-    conferences = load("conferences")
-    projects = load("projects")
-
-    years = {}
-    for p in journals:
-        y = int(str(p.get("year", 0))[:4] or 0)
-        if y:
-            years[y] = years.get(y, 0) + 1
+    journals = store.index("journals")
+    research = store.load("research")
+    conferences = store.load("conferences")
+    projects = store.load("projects")
+
+    years = {y: len(pubs) for y, pubs in journals.by_year.items() if y}
     y_min, y_max = min(years), max(years)
     n = y_max - y_min + 1
     peak = max(years.values())
 
     body = []
     # 상단: 실제 논문 제목 텍스처 (최신순)
-    titles = [str(p.get("title", "")) for p in reversed(journals)]
+    titles = [str(p.get("title", "")) for p in reversed(journals.records)]
     rows = [" · ".join(titles[i::3])[:400] for i in range(3)]
     for i, row in enumerate(rows):
         body.append(
@@ -231,25 +354,688 @@ def slide3():
     return "".join(body)
 
 
-CHROME = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+CHROME_CANDIDATES = [
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser",
+]
+CHROME_FLAGS = ["--headless=new", "--disable-gpu", "--hide-scrollbars"]
+
+
+SLIDES = {"slide1": slide1, "slide2": slide2, "slide3": slide3}
+# 슬라이드가 읽는 src/data 파일. --watch 는 이 파일이 바뀐 슬라이드만 다시 만든다.
+SLIDE_DATA = {
+    "slide1": [],
+    "slide2": [],
+    "slide3": ["journals.json", "research.json", "conferences.json", "projects.json"],
+}
+
 
+def chrome_path():
+    for candidate in [os.environ.get("CHROME"), *CHROME_CANDIDATES]:
+        if candidate and (path := shutil.which(candidate)):
+            return path
+    return None
 
-def main():
-    slides = {"slide1": slide1(), "slide2": slide2(), "slide3": slide3()}
+
+def find_chrome():
+    path = chrome_path()
+    if path is None:
+        sys.exit("Chrome not found: set CHROME=/path/to/chrome or use --backend resvg")
+    return path
+
+
+# resvg 의 sans-serif 후보. FONT 의 이름이 하나도 없을 때 resvg 기본값(Arial)마저 없으면
+# <text> 가 통째로 빠지므로, 실제로 글자를 그리는 첫 후보를 sans-serif 로 지정한다.
+RESVG_FAMILIES = ["Pretendard", "Helvetica Neue", "Helvetica", "Arial", "Noto Sans",
+                  "Liberation Sans", "DejaVu Sans"]
+
+
+def _resvg_draws_text(fonts):
+    """fonts(resvg 폰트 인자)로 FONT 텍스트가 그려지는지 작은 SVG 두 장을 비교해 본다."""
+    def render(text):
+        doc = (f'<svg xmlns="http://www.w3.org/2000/svg" width="96" height="48">'
+               f'<text x="4" y="36" font-family="{FONT}" font-size="32" fill="#fff">{text}</text></svg>')
+        return bytes(resvg_py.svg_to_bytes(svg_string=doc, **fonts))
+    return render("Ag") != render("")
+
+
+def resvg_fonts(font_dirs=(), font_files=(), family=None):
+    """render_resvg 에 넘길 폰트 인자. family 가 없으면 RESVG_FAMILIES 중 텍스트를
+    실제로 그리는 첫 폰트를 sans-serif 로 쓰고, 그런 폰트가 없으면 종료한다."""
+    if resvg_py is None:
+        sys.exit("resvg backend requires: pip install resvg-py")
+    base = {"font_dirs": sorted(str(pathlib.Path(d).resolve()) for d in font_dirs) or None,
+            "font_files": sorted(str(pathlib.Path(f).resolve()) for f in font_files) or None}
+    for candidate in [family] if family else RESVG_FAMILIES:
+        fonts = {**base, "sans_serif_family": candidate}
+        if _resvg_draws_text(fonts):
+            return fonts
+    sys.exit(f"resvg cannot draw the slide text with {family or 'any of ' + ', '.join(RESVG_FAMILIES)}: "
+             "install one, pass --font-dir/--font-file, or use --backend session")
+
+
+def render_resvg(slides, fonts=None):
+    """브라우저 없이 프로세스 안에서 SVG를 PNG로 래스터화한다. fonts 는 resvg_fonts() 결과."""
+    if resvg_py is None:
+        sys.exit("resvg backend requires: pip install resvg-py")
+    pngs = {}
+    for name, body in slides.items():
+        with trace.span("resvg render", slide=name):
+            pngs[name] = bytes(resvg_py.svg_to_bytes(
+                svg_string=svg_text(body), width=W, height=H, **(fonts or {})))
+    return pngs
+
+
+def render_cli(slides):
+    """슬라이드마다 Chrome을 새로 띄워 build/ 의 SVG를 스크린샷한다 (예전 방식)."""
+    pngs = {}
     for name, body in slides.items():
         path = svg(name, body)
         png = WORK / f"{name}.png"
         png.unlink(missing_ok=True)
-        subprocess.run(
-            [CHROME, "--headless=new", "--disable-gpu", "--hide-scrollbars",
-             f"--screenshot={png}", f"--window-size={W},{H}", path.as_uri()],
-            check=True, capture_output=True,
-        )
+        with trace.span("chrome cli screenshot", slide=name):
+            subprocess.run(
+                [find_chrome(), *CHROME_FLAGS, f"--screenshot={png}", f"--window-size={W},{H}", path.as_uri()],
+                check=True, capture_output=True,
+            )
         if not png.exists():
             sys.exit(f"render failed: {name}")
+        pngs[name] = png.read_bytes()
+    return pngs
+
+
+class ChromeSession:
+    """헤드리스 Chrome 하나를 띄워 두고 DevTools 프로토콜(--remote-debugging-pipe)로
+    제어한다. 명령은 fd 3, 응답은 fd 4 로 오가며 메시지는 NUL 로 구분된 JSON이다.
+    render()는 스레드 안전하므로 여러 탭에서 동시에 렌더링할 수 있다."""
+
+    def __init__(self, chrome=None, timeout=60):
+        self.timeout = timeout
+        cmd_r, self._cmd_w = os.pipe()
+        self._res_r, res_w = os.pipe()
+
+        def wire_pipes():
+            # 자식 프로세스에서 파이프를 fd 3/4 로 옮긴다. 먼저 높은 번호로 복제해
+            # 원래 fd 가 3/4 와 겹쳐도 덮어쓰지 않게 한다.
+            r = fcntl.fcntl(cmd_r, fcntl.F_DUPFD, 10)
+            w = fcntl.fcntl(res_w, fcntl.F_DUPFD, 10)
+            os.dup2(r, 3)
+            os.dup2(w, 4)
+
+        self._proc = subprocess.Popen(
+            [chrome or find_chrome(), *CHROME_FLAGS, "--remote-debugging-pipe", "about:blank"],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            preexec_fn=wire_pipes, close_fds=False,
+        )
+        os.close(cmd_r)
+        os.close(res_w)
+        self._lock = threading.Lock()
+        self._exited = False
+        self._next_id = 0
+        self._pending = {}  # 명령 id -> Future
+        self._waiters = {}  # (sessionId, 이벤트 이름) -> Future
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_loop(self):
+        buf = b""
+        with os.fdopen(self._res_r, "rb", buffering=0) as pipe:
+            while chunk := pipe.read(1 << 16):
+                buf += chunk
+                *messages, buf = buf.split(b"\0")
+                for raw in messages:
+                    self._dispatch(json.loads(raw))
+        # Chrome이 종료됨: 기다리던 호출을 모두 실패 처리
+        with self._lock:
+            self._exited = True
+            waiting = [*self._pending.values(), *self._waiters.values()]
+            self._pending.clear()
+            self._waiters.clear()
+        for fut in waiting:
+            if not fut.done():
+                fut.set_exception(RuntimeError("Chrome exited"))
+
+    def _dispatch(self, msg):
+        with self._lock:
+            if "id" in msg:
+                fut = self._pending.pop(msg["id"], None)
+            else:
+                fut = self._waiters.pop((msg.get("sessionId"), msg.get("method")), None)
+        if fut is None:
+            return
+        if "error" in msg:
+            fut.set_exception(RuntimeError(f"CDP error: {msg['error'].get('message')}"))
+        else:
+            fut.set_result(msg.get("result", msg.get("params", {})))
+
+    def expect(self, session_id, event):
+        """다음 명령을 보내기 전에 등록해 두면 해당 세션의 이벤트를 놓치지 않는다."""
+        fut = Future()
+        with self._lock:
+            self._waiters[(session_id, event)] = fut
+        return fut
+
+    def send(self, method, params=None, session_id=None):
+        fut = Future()
+        with self._lock:
+            if self._exited:
+                raise RuntimeError("Chrome exited")
+            self._next_id += 1
+            msg = {"id": self._next_id, "method": method, "params": params or {}}
+            if session_id:
+                msg["sessionId"] = session_id
+            self._pending[self._next_id] = fut
+            os.write(self._cmd_w, json.dumps(msg).encode() + b"\0")
+        return fut.result(self.timeout)
+
+    def render(self, svg_doc):
+        with trace.span("chrome render", svg_bytes=len(svg_doc)):
+            return self._render(svg_doc)
+
+    def _render(self, svg_doc):
+        target = self.send("Target.createTarget", {"url": "about:blank"})["targetId"]
+        try:
+            sid = self.send("Target.attachToTarget", {"targetId": target, "flatten": True})["sessionId"]
+            self.send("Emulation.setDeviceMetricsOverride",
+                      {"width": W, "height": H, "deviceScaleFactor": 1, "mobile": False}, sid)
+            self.send("Page.enable", None, sid)
+            loaded = self.expect(sid, "Page.loadEventFired")
+            url = "data:image/svg+xml;base64," + base64.b64encode(svg_doc.encode()).decode()
+            self.send("Page.navigate", {"url": url}, sid)
+            loaded.result(self.timeout)
+            shot = self.send("Page.captureScreenshot", {"format": "png", "fromSurface": True}, sid)
+            return base64.b64decode(shot["data"])
+        finally:
+            self.send("Target.closeTarget", {"targetId": target})
+
+    def close(self):
+        if not self._exited and self._proc.poll() is None:
+            try:
+                self.send("Browser.close")
+            except Exception:
+                self._proc.kill()
+            try:
+                self._proc.wait(10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+        try:
+            os.close(self._cmd_w)
+        except OSError:
+            pass
+        self._reader.join(5)
+
+
+def render_session(slides, tabs=3, chrome=None):
+    """Chrome 한 번 실행 + 탭 여러 개로 모든 슬라이드를 렌더링한다 (임시 파일 없음).
+    chrome 을 넘기면 이미 떠 있는 세션을 쓰고 닫지 않는다 (--watch)."""
+    docs = {name: svg_text(body) for name, body in slides.items()}
+    if chrome is None:
+        with trace.span("chrome launch"):
+            chrome = ChromeSession()
+        session = chrome
+    else:
+        session = contextlib.nullcontext()
+    with session, ThreadPoolExecutor(max_workers=max(1, tabs)) as pool:
+        futures = {name: pool.submit(chrome.render, doc) for name, doc in docs.items()}
+        return {name: fut.result() for name, fut in futures.items()}
+
+
+BACKENDS = {"resvg": render_resvg, "session": render_session, "cli": render_cli}
+
+
+# resvg(fontdb)와 Chrome 이 시스템 폰트를 찾는 폴더
+SYSTEM_FONT_DIRS = [
+    "/usr/share/fonts", "/usr/local/share/fonts", "~/.fonts", "~/.local/share/fonts",
+    "/Library/Fonts", "/System/Library/Fonts", "~/Library/Fonts",
+    os.path.join(os.environ.get("WINDIR", r"C:\Windows"), "Fonts"),
+]
+FONT_SUFFIXES = {".ttf", ".otf", ".ttc", ".otc", ".woff", ".woff2", ".pfb", ".pfa"}
+
+
+def font_fingerprint(paths=()):
+    """시스템 폰트 폴더와 paths(폴더·파일) 안 폰트 파일들의 (경로, 크기, 수정 시각) 해시.
+    폰트를 설치·교체하면 바뀌므로, 폰트 없이 렌더한 캐시를 다시 쓰지 않게 한다."""
+    h = hashlib.sha256()
+    for root in [*SYSTEM_FONT_DIRS, *paths]:
+        root = os.path.expanduser(str(root))
+        files = [root] if os.path.isfile(root) else (
+            os.path.join(d, f) for d, _, names in os.walk(root) for f in names)
+        for path in sorted(files):
+            if os.path.splitext(path)[1].lower() in FONT_SUFFIXES:
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                h.update(f"{path}:{st.st_size}:{st.st_mtime_ns}\0".encode())
+    return h.hexdigest()[:16]
+
+
+def chrome_version(chrome):
+    """`chrome --version` 출력 (실행할 수 없으면 빈 문자열)."""
+    try:
+        return subprocess.run([chrome, "--version"], capture_output=True, text=True, timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def renderer_settings(backend, fonts=None):
+    """렌더 결과를 바꿀 수 있는 설정. 캐시 키에 SVG 텍스트와 함께 들어간다.
+    fonts 는 resvg 백엔드의 resvg_fonts() 결과. 렌더러 버전과 폰트 파일 목록도
+    넣으므로 Chrome 업그레이드나 폰트 설치 뒤에는 다시 렌더링한다."""
+    settings = {"backend": backend, "size": [W, H]}
+    if backend == "resvg":
+        fonts = fonts or {}
+        settings["resvg"] = metadata.version("resvg-py")
+        settings["fonts"] = fonts
+        settings["font_files"] = font_fingerprint([*(fonts.get("font_dirs") or []),
+                                                   *(fonts.get("font_files") or [])])
+    else:
+        settings["chrome"] = find_chrome()
+        settings["chrome_version"] = chrome_version(settings["chrome"])
+        settings["flags"] = CHROME_FLAGS
+        settings["font_files"] = font_fingerprint()
+    return settings
+
+
+def cache_key(doc, settings):
+    h = hashlib.sha256(json.dumps(settings, sort_keys=True).encode())
+    h.update(b"\0")
+    h.update(doc.encode())
+    return h.hexdigest()[:32]
+
+
+def render_cached(slides, render, settings):
+    """캐시에 없는 슬라이드만 render() 로 래스터화한다. (pngs, 새로 렌더한 이름) 반환."""
+    CACHE.mkdir(parents=True, exist_ok=True)
+    backend = settings["backend"]
+    pngs, misses, paths = {}, {}, {}
+    for name, body in slides.items():
+        path = CACHE / f"{name}-{backend}-{cache_key(svg_text(body), settings)}.png"
+        if path.exists():
+            pngs[name] = path.read_bytes()
+        else:
+            misses[name] = body
+            paths[name] = path
+    if misses:
+        for name, png in render(misses).items():
+            # 슬라이드/백엔드마다 최신 결과 하나만 남긴다
+            for stale in CACHE.glob(f"{name}-{backend}-*.png"):
+                stale.unlink()
+            atomic_write(paths[name], png)
+            pngs[name] = png
+    return {name: pngs[name] for name in slides}, list(misses)
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def png_filter_rows(rows, bpp):
+    """모든 행에 PNG 필터 5종(None/Sub/Up/Average/Paeth)을 한꺼번에 적용한다.
+
+    필터는 원본(필터 전) 이웃 픽셀만 보므로 행 사이 의존성 없이 배열 연산으로
+    끝난다. (5, 행 수, 행 바이트) uint8 배열을 반환한다."""
+    x = rows.astype(np.int16)
+    a = np.zeros_like(x)
+    a[:, bpp:] = x[:, :-bpp]
+    b = np.zeros_like(x)
+    b[1:] = x[:-1]
+    c = np.zeros_like(x)
+    c[1:, bpp:] = x[:-1, :-bpp]
+    p = a + b - c
+    pa, pb, pc = np.abs(p - a), np.abs(p - b), np.abs(p - c)
+    paeth = np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+    return np.stack([x, x - a, x - b, x - (a + b) // 2, x - paeth]).astype(np.uint8)
+
+
+def png_encode(pixels, palette=None):
+    """RGB(h, w, 3) 또는 팔레트 인덱스(h, w) 배열을 가장 작은 PNG 바이트로 만든다.
+
+    필터는 다섯 가지를 이미지 전체에 고정한 경우와 행마다 부호 있는 바이트
+    절댓값 합이 가장 작은 필터를 고르는 적응형(minsum)을 후보로 두고, 각각을
+    zlib 전략(default/filtered/rle)과 조합해 표본 행만 시험 압축한 뒤 가장 작은
+    조합으로 전체를 한 번 압축한다. (PNG 바이트, 선택한 '필터/전략') 반환."""
+    h, w = pixels.shape[:2]
+    bpp = 1 if palette is not None else 3
+    filtered = png_filter_rows(pixels.reshape(h, w * bpp), bpp)
+    cost = np.abs(filtered.view(np.int8).astype(np.int32)).sum(axis=2)
+    candidates = {name: np.full(h, k, dtype=np.uint8) for k, name in enumerate(PNG_FILTERS)}
+    candidates["minsum"] = cost.argmin(axis=0).astype(np.uint8)
+
+    def stream(kinds, rows):
+        body = filtered[kinds[rows], rows]
+        return np.concatenate([kinds[rows, None], body], axis=1).tobytes()
+
+    def deflate(data, strategy):
+        z = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9, strategy)
+        return z.compress(data) + z.flush()
+
+    sample = np.nonzero(np.arange(h) % PNG_TRIAL_STRIDE < PNG_TRIAL_ROWS)[0]
+    trials = {
+        (fname, sname): len(deflate(stream(kinds, sample), strategy))
+        for fname, kinds in candidates.items()
+        for sname, strategy in PNG_STRATEGIES.items()
+    }
+    fname, sname = min(trials, key=trials.get)
+    idat = deflate(stream(candidates[fname], np.arange(h)), PNG_STRATEGIES[sname])
+
+    color_type = 3 if palette is not None else 2
+    out = [PNG_SIG, _png_chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, color_type, 0, 0, 0))]
+    if palette is not None:
+        out.append(_png_chunk(b"PLTE", bytes(palette)))
+    out += [_png_chunk(b"IDAT", idat), _png_chunk(b"IEND", b"")]
+    return b"".join(out), f"{fname}/{sname}"
+
+
+def psnr(a, b):
+    mse = np.mean((a.astype(np.float64) - b.astype(np.float64)) ** 2)
+    return math.inf if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def optimize_png(im, colors=0, min_psnr=MIN_PSNR):
+    """PIL 이미지를 크기 최적화된 PNG로 인코딩한다. (바이트, 리포트 dict) 반환.
+
+    색이 256개 이하이면 무손실 팔레트로 바꾼다. colors 를 주면 그 수로 팔레트
+    양자화하되 Floyd-Steinberg 디더링으로 그라데이션 띠(banding)를 막고, 결과
+    PSNR 이 min_psnr 보다 낮거나 무손실 RGB 보다 커지면 무손실 RGB 를 쓴다."""
+    rgb_im = im.convert("RGB")
+    rgb = np.asarray(rgb_im)
+    report = {"mode": "rgb", "psnr": None}  # psnr None = 무손실
+    index = palette = None
+    if rgb_im.getcolors(256) is not None:
+        colors_used, inverse = np.unique(rgb.reshape(-1, 3), axis=0, return_inverse=True)
+        index, palette = inverse.reshape(rgb.shape[:2]).astype(np.uint8), colors_used.ravel().tolist()
+        report["mode"] = f"palette {len(colors_used)} (lossless)"
+    elif colors:
+        # quantize()는 palette 를 줄 때만 디더링하므로 팔레트를 먼저 뽑고 다시 매핑한다
+        base = rgb_im.quantize(colors, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+        pal = rgb_im.quantize(palette=base, dither=Image.Dither.FLOYDSTEINBERG)
+        quality = psnr(rgb, np.asarray(pal.convert("RGB")))
+        if quality >= min_psnr:
+            index = np.asarray(pal)
+            palette = pal.getpalette()[:3 * (int(index.max()) + 1)]
+            report.update(mode=f"palette {colors} (dithered)", psnr=quality)
+        else:
+            report["rejected"] = f"palette {colors}: PSNR {quality:.1f} dB < {min_psnr:g}"
+    data, how = png_encode(rgb) if index is None or colors else (None, None)
+    if index is not None:
+        pal_data, pal_how = png_encode(index, palette)
+        if data is None or len(pal_data) < len(data):
+            data, how = pal_data, pal_how
+        else:
+            # 디더링 노이즈 때문에 팔레트가 오히려 커지면 무손실 RGB 를 쓴다
+            report.update(mode="rgb", psnr=None, rejected=f"palette {colors}: larger than lossless")
+    report["encoding"] = how
+    return data, report
+
+
+def format_png_report(before, after, report):
+    quality = "lossless" if report["psnr"] is None else f"PSNR {report['psnr']:.1f} dB"
+    line = (f"{before / 1024:.0f} KB -> {after / 1024:.0f} KB ({(after - before) / before:+.0%}), "
+            f"{report['mode']}, {quality}, {report['encoding']}")
+    if report.get("rejected"):
+        line += f"; rejected {report['rejected']}"
+    return line
+
+
+def encode_cached(name, png, colors, min_psnr, use_cache=True):
+    """렌더 PNG를 optimize_png()로 다시 인코딩한다. 결과와 리포트는 원본 바이트 +
+    인코딩 설정의 해시로 build/cache/ 에 남겨 다음 실행에서 재사용한다."""
+    key = hashlib.sha256(png + json.dumps([colors, min_psnr, PNG_TRIAL_STRIDE]).encode()).hexdigest()[:32]
+    path = CACHE / f"{name}-opt-{key}.png"
+    meta = path.with_suffix(".json")
+    if use_cache and path.exists() and meta.exists():
+        return path.read_bytes(), json.loads(meta.read_text(encoding="utf-8"))
+    with trace.span("optimize png", slide=name, png_bytes=len(png)) as span, Image.open(io.BytesIO(png)) as im:
+        data, report = optimize_png(im, colors, min_psnr)
+        span["optimized_bytes"] = len(data)
+    if len(data) >= len(png) and report["psnr"] is None:
+        data, report = png, {**report, "mode": "source", "encoding": "as rendered"}
+    report["line"] = format_png_report(len(png), len(data), report)
+    CACHE.mkdir(parents=True, exist_ok=True)
+    for stale in CACHE.glob(f"{name}-opt-*"):
+        stale.unlink()
+    atomic_write(path, data)
+    atomic_write(meta, json.dumps(report))
+    return data, report
+
+
+def write_if_changed(target, data):
+    """바이트가 다를 때만 파일을 쓴다 (임시 파일에 쓰고 rename). 썼으면 True."""
+    if target.exists() and target.read_bytes() == data:
+        return False
+    with trace.span("write", file=target.name, bytes=len(data)):
+        atomic_write(target, data)
+    return True
+
+
+def available_formats(formats):
+    """Pillow 가 인코딩할 수 있는 포맷만 남긴다 (AVIF 는 Pillow 11.3+ 또는 pillow-avif-plugin)."""
+    if "avif" in formats and ".avif" not in Image.registered_extensions():
+        try:
+            import pillow_avif  # noqa: F401  (import 시 AVIF 플러그인 등록)
+        except ImportError:
+            print("warning: AVIF encoder not available, skipping avif variants", file=sys.stderr)
+            return [fmt for fmt in formats if fmt != "avif"]
+    return list(formats)
+
+
+def variant_name(name, width, fmt):
+    # 원본 폭 PNG는 기존 slide{n}.png 를 그대로 쓴다 (예전 경로 호환)
+    return f"{name}.png" if (width, fmt) == (W, "png") else f"{name}-{width}.{fmt}"
+
+
+def write_variants(name, png, widths, formats, png_options, optimize=True):
+    """래스터화 결과 하나에서 폭별·포맷별 변형을 만들고 매니페스트 항목을 반환한다.
+
+    축소는 원본 해상도에서 곧바로 Lanczos 로 한 번에 한다 (단계적 축소나
+    reducing_gap 근사 없이). PNG 변형은 optimize_png(**png_options) 로 인코딩하고
+    (optimize 가 거짓이면, 즉 --no-optimize 면 Pillow 기본 PNG 인코딩),
+    변형 파일도 바이트가 같으면 다시 쓰지 않는다."""
+    sources = {fmt: [] for fmt in formats}
+    with Image.open(io.BytesIO(png)) as im:
+        im = im.convert("RGB")
+        for width in sorted(widths):
+            with trace.span("resize", slide=name, width=width):
+                scaled = im if width == W else im.resize((width, round(H * width / W)), Image.Resampling.LANCZOS)
+            for fmt in formats:
+                target = OUT / variant_name(name, width, fmt)
+                # 원본 폭 PNG(slide{n}.png)는 optimize_png 로 이미 써 두었으므로 건너뛴다
+                if target.name != f"{name}.png":
+                    with trace.span(f"encode {fmt}", slide=name, width=width) as span:
+                        if fmt == "png" and optimize:
+                            data = optimize_png(scaled, **png_options)[0]
+                        else:
+                            buf = io.BytesIO()
+                            scaled.save(buf, fmt.upper(), **ENCODE_OPTIONS.get(fmt, {}))
+                            data = buf.getvalue()
+                        span["bytes"] = len(data)
+                    write_if_changed(target, data)
+                sources[fmt].append(f"/images/hero/{target.name} {width}w")
+    return {
+        "src": f"/images/hero/{name}.png",
+        "width": W,
+        "height": H,
+        "widths": sorted(widths),
+        "png": png_options if optimize else {"optimize": False},
+        "sha256": hashlib.sha256(png).hexdigest(),
+        "sources": [{"type": MIME[fmt], "srcset": ", ".join(sources[fmt])} for fmt in formats],
+    }
+
+
+def write_manifest(pngs, widths, formats, png_options, force=False, optimize=True):
+    """public/images/hero/manifest.json 을 갱신한다. 캐러셀이 <picture>/srcset 에 쓴다.
+
+    원본 PNG 해시와 폭·포맷·PNG 설정이 이전 매니페스트와 같고 파일이 모두 있으면
+    그 슬라이드는 다시 인코딩하지 않는다."""
+    path = OUT / "manifest.json"
+    try:
+        old = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        old = {}
+    formats = available_formats(formats)
+    widths = sorted(set(widths) | {W})
+    fresh_entries, jobs = {}, {}
+    # 인코더는 GIL 을 놓으므로 슬라이드별 스레드로 동시에 인코딩한다
+    with ThreadPoolExecutor(max_workers=len(pngs) or 1) as pool:
+        for name, png in pngs.items():
+            prev = old.get(name) or {}
+            fresh = (
+                not force
+                and prev.get("sha256") == hashlib.sha256(png).hexdigest()
+                and [s["type"] for s in prev.get("sources", [])] == [MIME[fmt] for fmt in formats]
+                and prev.get("widths") == widths
+                and prev.get("png") == (png_options if optimize else {"optimize": False})
+                and all((OUT / variant_name(name, w, fmt)).exists() for w in widths for fmt in formats)
+            )
+            if fresh:
+                fresh_entries[name] = prev
+            else:
+                jobs[name] = pool.submit(write_variants, name, png, widths, formats, png_options, optimize)
+        manifest = {}
+        for name in pngs:
+            manifest[name] = jobs[name].result() if name in jobs else fresh_entries[name]
+            print(f"OK {name} variants ({'encoded' if name in jobs else 'unchanged'}: "
+                  f"{len(widths)} widths x {', '.join(formats)})")
+    write_if_changed(path, (json.dumps(manifest, indent=2) + "\n").encode())
+    return manifest
+
+
+def parse_list(value, cast=str):
+    return [cast(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AIMAP hero image generator")
+    parser.add_argument("--backend", choices=["auto", *BACKENDS], default="auto")
+    parser.add_argument("--tabs", type=int, default=3, help="session 백엔드의 동시 렌더링 탭 수")
+    parser.add_argument("--font-dir", action="append", default=[],
+                        help="resvg 백엔드가 추가로 읽을 폰트 폴더 (반복 가능)")
+    parser.add_argument("--font-file", action="append", default=[],
+                        help="resvg 백엔드가 추가로 읽을 폰트 파일, 예: Pretendard-Regular.otf (반복 가능)")
+    parser.add_argument("--font-family",
+                        help="resvg 백엔드의 sans-serif 폰트 (기본: RESVG_FAMILIES 중 글자를 그리는 첫 폰트)")
+    parser.add_argument("--no-cache", action="store_true", help="렌더 캐시를 무시하고 모두 다시 렌더링")
+    parser.add_argument("--widths", type=functools.partial(parse_list, cast=int),
+                        default=VARIANT_WIDTHS, help="반응형 변형 폭 (쉼표 구분, 기본 640,1280,1920,2752)")
+    parser.add_argument("--formats", type=parse_list, default=VARIANT_FORMATS,
+                        help="변형 포맷 (쉼표 구분, 기본 avif,webp,png)")
+    parser.add_argument("--no-variants", action="store_true", help="slide{n}.png 만 쓰고 반응형 변형은 건너뜀")
+    parser.add_argument("--png-colors", type=int, default=0,
+                        help="PNG를 N색 팔레트로 양자화 (디더링, 2-256; 기본 0 = 무손실)")
+    parser.add_argument("--min-psnr", type=float, default=MIN_PSNR,
+                        help=f"양자화 결과가 이 PSNR(dB) 미만이면 무손실로 되돌림 (기본 {MIN_PSNR:g})")
+    parser.add_argument("--no-optimize", action="store_true", help="렌더러가 준 PNG를 그대로 씀")
+    parser.add_argument("--watch", action="store_true",
+                        help="상주하면서 src/data 가 바뀌면 해당 슬라이드만 다시 만듦 (Ctrl-C 로 종료)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="단계별 소요 시간을 Chrome/Perfetto 트레이스(JSON)로 FILE 에 기록")
+    args = parser.parse_args(argv)
+    if any(fmt not in MIME for fmt in args.formats):
+        parser.error(f"--formats: choose from {', '.join(MIME)}")
+    if any(not 0 < w <= W for w in args.widths):
+        parser.error(f"--widths: each width must be between 1 and {W}")
+    if args.png_colors and not 2 <= args.png_colors <= 256:
+        parser.error("--png-colors: must be 0 or between 2 and 256")
+    if Image is None and not (args.no_variants and args.no_optimize):
+        sys.exit("PNG optimization and variants require: pip install Pillow "
+                 "(or pass --no-optimize --no-variants)")
+    png_options = {"colors": args.png_colors, "min_psnr": args.min_psnr}
+
+    backend = args.backend
+    if backend == "auto":
+        backend = "session" if chrome_path() or resvg_py is None else "resvg"
+    if args.watch:
+        watch_slides(args, png_options, backend)
+        return
+
+    if args.trace:
+        trace.enable("generate_heroes")
+    try:
+        with trace.span("generate_heroes"):
+            build(args, png_options, *make_renderer(backend, args))
+    finally:
+        if args.trace:
+            print(f"trace: {trace.write(args.trace)}")
+
+
+def make_renderer(backend, args, chrome=None):
+    """(render, 렌더러 설정). resvg 폰트는 여기서 한 번만 고른다."""
+    if backend == "session":
+        return functools.partial(render_session, tabs=args.tabs, chrome=chrome), renderer_settings(backend)
+    if backend == "resvg":
+        fonts = resvg_fonts(args.font_dir, args.font_file, args.font_family)
+        return functools.partial(render_resvg, fonts=fonts), renderer_settings(backend, fonts)
+    return render_cli, renderer_settings(backend)
+
+
+def watch_slides(args, png_options, backend):
+    """한 번 전체를 만든 뒤 상주하면서, 읽는 데이터 파일이 바뀐 슬라이드만 다시
+    만든다. 나머지 슬라이드의 SVG 는 메모리에 두고, session 백엔드는 Chrome 을
+    계속 띄워 둔다. 바뀌지 않은 슬라이드는 렌더·인코딩 캐시와 매니페스트에서 바로 나온다."""
+    from labdata.watch import watch
+    with contextlib.ExitStack() as stack:
+        chrome = None
+        if backend == "session":
+            with trace.span("chrome launch"):
+                chrome = stack.enter_context(ChromeSession())
+        render, settings = make_renderer(backend, args, chrome)
+        svgs = build(args, png_options, render, settings)
+
+        def rebuild(targets, changed):
+            for name in targets:
+                svgs.pop(name, None)
+            build(args, png_options, render, settings, svgs)
+
+        watch({name: files for name, files in SLIDE_DATA.items() if files}, rebuild)
+
+
+def build(args, png_options, render, settings, svgs=None):
+    """SVG 조립 → 래스터화(캐시) → PNG 재인코딩 → slide{n}.png·변형 쓰기.
+    settings 는 renderer_settings() 결과 (렌더 캐시 키).
+    svgs 에 이미 있는 슬라이드는 SVG 를 다시 만들지 않는다. 슬라이드별 SVG 를 반환."""
+    slides = dict(svgs or {})
+    for name, make in SLIDES.items():
+        if name not in slides:
+            with trace.span(f"svg {name}") as span:
+                slides[name] = make()
+                span["svg_bytes"] = len(slides[name])
+    slides = {name: slides[name] for name in SLIDES}
+    trace.counter("svg bytes", **{name: len(body) for name, body in slides.items()})
+    with trace.span("render", backend=settings["backend"]):
+        if args.no_cache:
+            pngs, rendered = render(slides), list(slides)
+        else:
+            pngs, rendered = render_cached(slides, render, settings)
+    trace.counter("png bytes (rendered)", **{name: len(png) for name, png in pngs.items()})
+    outputs, reports = dict(pngs), {}
+    if not args.no_optimize:
+        with trace.span("optimize"), ThreadPoolExecutor(max_workers=len(pngs)) as pool:
+            futures = {name: pool.submit(encode_cached, name, png, use_cache=not args.no_cache, **png_options)
+                       for name, png in pngs.items()}
+            for name, fut in futures.items():
+                outputs[name], reports[name] = fut.result()
+        trace.counter("png bytes (optimized)", **{name: len(png) for name, png in outputs.items()})
+    for name, png in outputs.items():
         target = OUT / f"{name}.png"
-        target.write_bytes(png.read_bytes())
-        print(f"OK {target}")
+        how = "rendered" if name in rendered else "cached"
+        if write_if_changed(target, png):
+            print(f"OK {target} ({how})")
+        else:
+            print(f"OK {target} (unchanged, {how})")
+        if name in reports:
+            print(f"   {reports[name]['line']}")
+    if not args.no_variants:
+        with trace.span("variants"):
+            write_manifest(pngs, args.widths, args.formats, png_options, force=args.no_cache,
+                           optimize=not args.no_optimize)
+    return slides
 
 
 if __name__ == "__main__":
@@ -0,0 +1,35 @@
+"""
+Shared access to the lab's website data (src/data/*.json) for the Python
+tools in this repository (cv-generator, hero-generator).
+
+    from labdata import store
+    journals = store.load("journals")        # parsed once, reloaded on change
+    by_year = store.index("journals").by_year
+    mine = store.index("journals").authors.publications("Ho Won Lee")
+
+Files are validated and normalized once into a cached compiled form
+(labdata.compiled): list entries are dicts with typed extras such as
+record.funding or record.start, read through labdata.normalize.
+
+labdata.trace records optional Chrome-trace spans for the build scripts, and
+labdata.files writes their caches and outputs atomically.
+
+Scripts outside the repository root put the root on sys.path first.
+"""
+
+from labdata import trace
+from labdata.authors import Author, AuthorIndex, Role, abbreviate_name, parse_authors
+from labdata.compiled import ImpactFactors, Record
+from labdata.files import atomic_open, atomic_write
+from labdata.normalize import (
+    funding_billion, impact_factor, journal_key, normalize_doi, period_dates, pub_sort_key, record_year,
+    start_year, title_key,
+)
+from labdata.store import DATA_DIR, DataStore, RecordIndex, store
+
+__all__ = [
+    "Author", "AuthorIndex", "DATA_DIR", "DataStore", "ImpactFactors", "Record", "RecordIndex", "Role",
+    "abbreviate_name", "atomic_open", "atomic_write", "funding_billion", "impact_factor", "journal_key",
+    "normalize_doi", "parse_authors", "period_dates", "pub_sort_key", "record_year", "start_year", "store",
+    "title_key", "trace",
+]
@@ -0,0 +1,25 @@
+"""Compile every data file now (python -m labdata) and report the ones that fail."""
+
+import sys
+
+from labdata.store import store
+
+
+def main():
+    errors = 0
+    store.invalidate()
+    for path in sorted(store.root.glob("*.json")):
+        try:
+            data = store.load(path.stem)
+        except (OSError, ValueError) as e:
+            print(f"error: {path.name}: {e}", file=sys.stderr)
+            errors += 1
+            continue
+        size = f"{len(data)} entries" if isinstance(data, (list, dict)) else type(data).__name__
+        print(f"{path.name}: {size}")
+    print(f"compiled cache: {store.compiled.dir}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
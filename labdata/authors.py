@@ -0,0 +1,147 @@
+"""
+Parsed author lists and a per-person publication index.
+
+Author strings carry role markers after the name: '*' corresponding author,
+'^' and '+' other annotations (e.g. "Ho Won Lee^*"). They are parsed once per
+distinct string and position; the same names recur across most entries.
+"""
+
+import functools
+from dataclasses import dataclass
+
+MARKERS = '^*+'
+
+
+@dataclass(frozen=True)
+class Author:
+    """One entry of an author list."""
+    name: str            # name without role markers
+    key: str             # lower-cased name, used for matching
+    position: int        # 0 = first author
+    corresponding: bool  # marked '*'
+    abbrev: str          # 'H.W. Lee'
+
+    def matches(self, name):
+        """Same (substring, case-insensitive) test the CV has always used."""
+        return name.lower() in self.key
+
+
+@dataclass(frozen=True)
+class Role:
+    """How a person appears on one publication."""
+    position: int        # first position where the person is listed
+    corresponding: bool  # listed as corresponding author
+
+    @property
+    def first(self):
+        return self.position == 0
+
+
+_STRIP_MARKERS = str.maketrans('', '', MARKERS)
+
+
+def clean_author(raw):
+    """Author string without role markers."""
+    return raw.translate(_STRIP_MARKERS)
+
+
+def abbreviate_name(full_name):
+    """Convert full name to abbreviated format:
+    'Ho Won Lee' -> 'H.W. Lee'
+    'Dong-Kyu Kim' -> 'D.-K. Kim'
+    """
+    parts = full_name.strip().split()
+    if len(parts) < 2:
+        return full_name
+    # Last word is the last name, everything else becomes initials
+    last_name = parts[-1]
+
+    initials_parts = []
+    for p in parts[:-1]:
+        # Handle hyphenated names like "Dong-Kyu" -> "D.-K."
+        if '-' in p:
+            hyphen_parts = p.split('-')
+            hyphen_initials = '-'.join([hp[0].upper() + '.' for hp in hyphen_parts if hp])
+            initials_parts.append(hyphen_initials)
+        else:
+            initials_parts.append(p[0].upper() + '.')
+
+    initials = ''.join(initials_parts)
+    return f"{initials} {last_name}"
+
+
+@functools.lru_cache(maxsize=16384)  # author lists hold several names; see _parse_authors
+def parse_author(raw, position=0):
+    name = clean_author(raw)
+    return Author(name, name.lower(), position, '*' in raw, abbreviate_name(name))
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_authors(authors):
+    return tuple(parse_author(raw, i) for i, raw in enumerate(authors))
+
+
+def parse_authors(authors):
+    """Parsed Author tuple for an author list (None or [] give ())."""
+    return _parse_authors(tuple(authors or ()))
+
+
+def role_of(authors, name):
+    """Role of name in a parsed author list, or None when not listed."""
+    position, corresponding = None, False
+    for author in authors:
+        if author.matches(name):
+            if position is None:
+                position = author.position
+            corresponding = corresponding or author.corresponding
+    return None if position is None else Role(position, corresponding)
+
+
+class AuthorIndex:
+    """Publications of every person in a record list, with their role.
+
+    by_person maps the lower-cased author name to (record, Author) pairs in file
+    order. Lookups by name use the substring match of Author.matches and are
+    cached per name."""
+
+    def __init__(self, records):
+        self.records = records
+        self.by_person = {}
+        self._parsed, self._position = {}, {}
+        for i, record in enumerate(records):
+            parsed = self._parsed[id(record)] = parse_authors(record.get('authors'))
+            self._position[id(record)] = i
+            for author in parsed:
+                self.by_person.setdefault(author.key, []).append((record, author))
+        self._roles = {}
+
+    def authors(self, record):
+        """Parsed authors of a record (parsed on the fly if not in this index)."""
+        parsed = self._parsed.get(id(record))
+        return parsed if parsed is not None else parse_authors(record.get('authors'))
+
+    def roles(self, name):
+        """{id(record): Role} for every record listing name."""
+        key = name.lower()
+        roles = self._roles.get(key)
+        if roles is None:
+            roles = {}
+            for person, entries in self.by_person.items():
+                if key in person:
+                    for record, _ in entries:
+                        roles[id(record)] = None
+            for record_id in roles:
+                roles[record_id] = role_of(self._parsed[record_id], key)
+            self._roles[key] = roles
+        return roles
+
+    def role(self, record, name):
+        """Role of name on record, or None when not listed."""
+        if id(record) in self._parsed:
+            return self.roles(name).get(id(record))
+        return role_of(self.authors(record), name)
+
+    def publications(self, name):
+        """Records listing name, in file order."""
+        order = sorted(self.roles(name), key=self._position.__getitem__)
+        return [self.records[self._position[record_id]] for record_id in order]
@@ -0,0 +1,162 @@
+"""
+Compiled form of the data files: each JSON file is validated and normalized
+once, kept in a pickle cache (labdata/.cache/) and recompiled only when the
+file's mtime or size changes. DataStore loads every file through it.
+
+Entries of list-valued files become Record objects: dicts with exactly the
+keys and values of the JSON, plus typed attributes derived from them once:
+
+    year      publication year as int (0 when missing)
+    sort_key  (-year, -id number): newest first, then highest id first
+    doi_key   normalized DOI ('' when absent)
+    funding   funding amount in billions of KRW (0.0 when absent)
+    start     (year, month) the period starts, or None (month 0 when not given)
+    end       (year, month) the period ends, or None when open ('Present')
+
+IF.json becomes ImpactFactors, the same journal -> text mapping with each
+journal's impact factor and JCR percentile parsed in .impact and .jcr, and
+lookup() for journal names spelled differently (labdata.impact). The
+labdata.normalize functions read the record attributes when present, so they
+work on raw dicts too.
+
+    python -m labdata      # compile every data file now and report errors
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+from pathlib import Path
+
+from labdata import trace
+from labdata.files import atomic_open
+from labdata.normalize import (
+    english, funding_billion, impact_factor, jcr_percent, normalize_doi, parse_period, pub_sort_key,
+    record_year,
+)
+
+# LABDATA_CACHE moves the cache (e.g. off a read-only checkout).
+CACHE_DIR = Path(os.environ.get("LABDATA_CACHE") or Path(__file__).resolve().parent / ".cache")
+
+# Bump to invalidate compiled caches after a change to what is compiled.
+COMPILED_VERSION = 2
+
+
+class Record(dict):
+    """One data entry: the JSON object, plus typed fields (see module doc)."""
+    __slots__ = ('year', 'sort_key', 'doi_key', 'funding', 'start', 'end')
+
+    @classmethod
+    def compile(cls, entry):
+        record = cls(entry)
+        record.year = record_year(entry)
+        record.sort_key = pub_sort_key(entry)
+        record.doi_key = normalize_doi(entry.get('doi'))
+        record.funding = funding_billion(entry)
+        record.start, record.end = parse_period(english(entry.get('period')))
+        return record
+
+
+class ImpactFactors(dict):
+    """IF.json: journal -> 'IF 10.7, JCR 3.6%', with .impact journal -> 10.7
+    and .jcr journal -> 3.6 (None when the text doesn't give one), and an
+    index of the journal names for lookup()."""
+    __slots__ = ('impact', 'jcr', 'index')
+
+    @classmethod
+    def compile(cls, data):
+        table = cls(data)
+        table.impact = {journal: impact_factor(text) for journal, text in data.items()}
+        table.jcr = {journal: jcr_percent(text) for journal, text in data.items()}
+        from labdata.impact import JournalIndex  # imports the store, which imports this module
+        table.index = JournalIndex(table)
+        return table
+
+    def lookup(self, name, fuzzy=False):
+        """IFMatch for a journal name spelled like an IF.json key, or as its
+        abbreviation (see labdata.impact), or None. fuzzy=True also accepts
+        near misses, which may be another journal."""
+        return self.index.lookup(name, fuzzy)
+
+
+def compile_data(name, data):
+    """Validated, normalized form of the parsed <name>.json. Raises ValueError
+    on entries the tools can't use."""
+    if isinstance(data, list):
+        for i, entry in enumerate(data):
+            if not isinstance(entry, dict):
+                raise ValueError(f"entry {i} is not an object: {str(entry)[:60]}")
+            data[i] = Record.compile(entry)  # in place: large files are not held twice
+        return data
+    if name == 'IF':
+        if not isinstance(data, dict):
+            raise ValueError("expected an object mapping journal names to impact factors")
+        bad = [journal for journal, text in data.items() if not isinstance(text, str)]
+        if bad:
+            raise ValueError(f"impact factor of '{bad[0]}' is not a string")
+        return ImpactFactors.compile(data)
+    return data
+
+
+class CompiledCache:
+    """Compiled files of one data directory, persisted as one pickle per file
+    so a change recompiles and rewrites only that file. cache_dir=None keeps
+    them in memory only."""
+
+    def __init__(self, root, cache_dir=CACHE_DIR):
+        self.root = Path(root)
+        self.dir = None
+        if cache_dir is not None:
+            key = hashlib.sha256(str(self.root.resolve()).encode()).hexdigest()[:12]
+            self.dir = Path(cache_dir) / f"{self.root.name}-{key}"
+        self._files = {}  # name -> (stamp, compiled data)
+
+    def path(self, name):
+        return self.dir / f"{name}.pickle"
+
+    def _read(self, name, stamp):
+        """Compiled data from the cache file when it was compiled from stamp."""
+        try:
+            with trace.span("compiled load", file=f"{name}.pickle"):
+                with open(self.path(name), 'rb') as f:
+                    state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+            return None
+        if (not isinstance(state, dict) or state.get('version') != COMPILED_VERSION
+                or state.get('stamp') != stamp):
+            return None
+        return state['data']
+
+    def _write(self, name, stamp, data):
+        try:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with atomic_open(self.path(name)) as f:
+                pickle.dump({'version': COMPILED_VERSION, 'stamp': stamp, 'data': data}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:  # the cache only saves time; carry on without it
+            print(f"warning: could not write {self.path(name)}: {e}", file=sys.stderr)
+
+    def load(self, name, stamp):
+        """Compiled <name>.json for its current (mtime_ns, size) stamp. Raises
+        OSError / ValueError when the file is missing or malformed."""
+        cached = self._files.get(name)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        data = self._read(name, stamp) if self.dir is not None else None
+        if data is None:
+            with trace.span("json compile", file=f"{name}.json", bytes=stamp[1]):
+                with open(self.root / f"{name}.json", encoding='utf-8') as f:
+                    data = compile_data(name, json.load(f))
+            if self.dir is not None:
+                self._write(name, stamp, data)
+        self._files[name] = (stamp, data)
+        return data
+
+    def forget(self, name=None):
+        """Drop one file (or everything) so the next load recompiles it."""
+        names = list(self._files) if name is None else [name]
+        for forgotten in names:
+            self._files.pop(forgotten, None)
+            if self.dir is not None:
+                self.path(forgotten).unlink(missing_ok=True)
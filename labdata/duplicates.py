@@ -0,0 +1,283 @@
+"""
+Likely duplicates across journals.json, conferences.json and preprints.json:
+the same work listed twice, or a preprint / conference paper that was later
+published in a journal under a slightly different title.
+
+    python -m labdata.duplicates                  # every pair scoring >= 0.6
+    python -m labdata.duplicates --min-score 0.8 --json
+
+Comparing every pair of records is quadratic, so candidates come from
+MinHash signatures of the titles with locality-sensitive hashing: each
+signature is cut into bands, and only records sharing a band (or a DOI) are
+compared. That finds most pairs whose titles share half their words and word
+pairs, and nearly all that share more, at a cost linear in the number of
+records. Signatures are kept in the compiled-data cache (minhash.pickle), so
+a rerun hashes only new or edited titles. Each candidate is then scored
+exactly:
+
+    score = 0.75 * title similarity + 0.25 * author similarity
+
+Titles are compared as sets of words and word pairs: the mean of their
+Jaccard similarity and the share of the shorter title found in the longer.
+Korean conference titles with an English translation in parentheses are
+compared on the translation. Authors are compared by the Jaccard similarity of
+their (surname, first initial) sets, so "H.W. Lee" and "Ho Won Lee" agree.
+Records without authors are scored on the title alone; the same DOI scores 1.
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import pickle
+import re
+import struct
+import sys
+import unicodedata
+from dataclasses import dataclass
+from pathlib import Path
+
+from labdata import trace
+from labdata.authors import clean_author
+from labdata.files import atomic_open
+from labdata.normalize import english, normalize_doi, record_year
+from labdata.store import store
+
+SOURCES = ("journals", "preprints", "conferences")
+
+NUM_PERM = 48   # MinHash signature length
+BANDS = 16      # LSH bands of NUM_PERM // BANDS rows
+MIN_SCORE = 0.6
+
+# Bump to invalidate cached signatures after a change to title_shingles().
+SIGNATURE_VERSION = 2
+
+# The NUM_PERM hash functions are 16-bit slices of blake2b digests of a
+# shingle: one digest per 32 of them, told apart by the personalization.
+_DIGESTS = [(f"minhash{n}".encode(), min(64, 2 * NUM_PERM - 64 * n))
+            for n in range(-(-2 * NUM_PERM // 64))]
+_unpack_hashes = struct.Struct(f"<{NUM_PERM}H").unpack
+
+_WORD = re.compile(r'\w+')
+_HANGUL = re.compile('[가-힣]')
+_TRANSLATED = re.compile(r'[^(]*\(([^가-힣]+)\)\s*')
+STOP_WORDS = frozenset(
+    "a an and as at by for from in into of on or the to under using via with".split())
+
+
+def comparable_title(title):
+    """English title; for "한글 제목 (English title)" the translation only."""
+    text = unicodedata.normalize('NFKC', str(english(title) or ''))
+    match = _TRANSLATED.fullmatch(text)
+    return match.group(1) if match and _HANGUL.search(text[:match.start(1)]) else text
+
+
+def title_shingles(title):
+    """Words of a title (NFKC, case-folded, stop words dropped) and pairs of
+    consecutive words."""
+    text = comparable_title(title).casefold()
+    words = [w for w in _WORD.findall(text) if w not in STOP_WORDS]
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def author_keys(authors):
+    """(surname, first initial) of each author, case-folded."""
+    keys = set()
+    for raw in authors or ():
+        parts = clean_author(raw).replace('.', '. ').split()
+        if parts:
+            keys.add((parts[-1].casefold(), parts[0][0].casefold() if len(parts) > 1 else ''))
+    return frozenset(keys)
+
+
+def minhash(shingles):
+    """MinHash signature (NUM_PERM ints) of a set of strings; () for an empty set."""
+    hashes = [_unpack_hashes(b"".join(hashlib.blake2b(data, digest_size=size, person=person).digest()
+                                      for person, size in _DIGESTS))
+              for data in (s.encode() for s in shingles)]
+    return tuple(map(min, zip(*hashes)))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def title_similarity(a, b):
+    """Mean of the Jaccard similarity and the containment of the shorter title
+    in the longer, so a title extended on publication still scores high."""
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return (common / (len(a) + len(b) - common) + common / min(len(a), len(b))) / 2
+
+
+@dataclass
+class Match:
+    """Two records that are probably the same work."""
+    score: float
+    kind: str        # 'duplicate', 'promotion' (preprint/conference -> journal) or 'related'
+    first: tuple     # (source, record)
+    second: tuple    # (source, record); the journal entry for promotions
+    title: float     # title similarity
+    authors: float   # author similarity, None when a record has no authors
+
+    def as_dict(self):
+        return {
+            'score': round(self.score, 3), 'kind': self.kind,
+            'first': {'source': self.first[0], 'id': self.first[1].get('id')},
+            'second': {'source': self.second[0], 'id': self.second[1].get('id')},
+            'title': round(self.title, 3),
+            'authors': None if self.authors is None else round(self.authors, 3),
+        }
+
+
+def _kind(first, second):
+    if first == second:
+        return 'duplicate'
+    if second == 'journals':
+        return 'promotion'
+    return 'related'
+
+
+class SignatureCache:
+    """MinHash signatures by title, kept in a pickle next to the compiled data
+    so later runs hash only new or edited titles. path=None keeps them in
+    memory only."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path is not None else None
+        self.signatures, self.changed = {}, False
+        if self.path is None:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError):
+            return
+        if isinstance(state, dict) and state.get('version') == (SIGNATURE_VERSION, NUM_PERM):
+            self.signatures = state['signatures']
+
+    def get(self, title):
+        """Signature of a title's shingles (see title_shingles); () when the
+        title has none (empty, or stop words only)."""
+        key = str(english(title) or '')
+        signature = self.signatures.get(key)
+        if signature is None:
+            signature = self.signatures[key] = minhash(title_shingles(key))
+            self.changed = True
+        return signature
+
+    def save(self, titles):
+        """Write the signatures of titles (others are dropped) when any were added."""
+        keep = {str(english(t) or '') for t in titles}
+        if self.path is None or not (self.changed or len(keep) < len(self.signatures)):
+            return
+        signatures = {k: v for k, v in self.signatures.items() if k in keep}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_open(self.path) as f:
+                pickle.dump({'version': (SIGNATURE_VERSION, NUM_PERM), 'signatures': signatures}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:  # the cache only saves time
+            print(f"warning: could not write {self.path}: {e}", file=sys.stderr)
+
+
+def find_duplicates(records, min_score=MIN_SCORE, signatures=None):
+    """Matches scoring at least min_score among (source, record) pairs, best
+    first. signatures is a SignatureCache to take MinHash signatures from."""
+    if signatures is None:
+        signatures = SignatureCache()
+    dois, buckets = [], {}
+    rows = NUM_PERM // BANDS
+    with trace.span("minhash", records=len(records)):
+        for i, (_, record) in enumerate(records):
+            # A title without shingles has no signature to band: all such
+            # records would share every bucket and pair up quadratically.
+            signature = signatures.get(record.get('title'))
+            for band in range(BANDS if signature else 0):
+                buckets.setdefault((band, signature[band * rows:(band + 1) * rows]), []).append(i)
+            doi = getattr(record, 'doi_key', None)
+            if doi is None:
+                doi = normalize_doi(record.get('doi'))
+            if doi:
+                buckets.setdefault(('doi', doi), []).append(i)
+            dois.append(doi)
+
+    with trace.span("lsh candidates", buckets=len(buckets)):
+        candidates = set()
+        for members in buckets.values():
+            if len(members) > 1:
+                candidates.update(itertools.combinations(members, 2))
+
+    # Shingles and author keys only for records that are candidates
+    shingles, authors = {}, {}
+    for i in {i for pair in candidates for i in pair}:
+        shingles[i] = title_shingles(records[i][1].get('title'))
+        authors[i] = author_keys(records[i][1].get('authors'))
+
+    matches = []
+    with trace.span("score", candidates=len(candidates)):
+        for i, j in candidates:
+            title = title_similarity(shingles[i], shingles[j])
+            same_doi = bool(dois[i]) and dois[i] == dois[j]
+            if 0.75 * title + 0.25 < min_score and not same_doi:
+                continue  # below min_score whatever the authors
+            author = jaccard(authors[i], authors[j]) if authors[i] and authors[j] else None
+            score = 1.0 if same_doi else title if author is None else 0.75 * title + 0.25 * author
+            if score < min_score:
+                continue
+            # Journal entry second; otherwise the later record
+            (source_i, record_i), (source_j, record_j) = records[i], records[j]
+            if source_i == 'journals' and source_j != 'journals' or (
+                    source_i == source_j and record_year(record_i) > record_year(record_j)):
+                i, j = j, i
+            matches.append(Match(score, _kind(records[i][0], records[j][0]),
+                                 records[i], records[j], title, author))
+    matches.sort(key=lambda m: (-m.score, m.first[0], str(m.first[1].get('id'))))
+    return matches
+
+
+def load_records(sources=SOURCES, data=store):
+    """(source, record) for every record of the given data files."""
+    return [(source, record) for source in sources for record in data.load(source)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report likely duplicate publications.")
+    parser.add_argument('--sources', default=",".join(SOURCES),
+                        help="data files to compare (default: %(default)s)")
+    parser.add_argument('--min-score', type=float, default=MIN_SCORE,
+                        help="lowest score reported, 0-1 (default: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="print the matches as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        records = load_records([s.strip() for s in args.sources.split(",") if s.strip()])
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    cache = store.compiled.dir and store.compiled.dir / "minhash.pickle"
+    signatures = SignatureCache(cache)
+    matches = find_duplicates(records, args.min_score, signatures)
+    signatures.save(record.get('title') for _, record in records)
+
+    if args.json:
+        print(json.dumps([m.as_dict() for m in matches], indent=2, ensure_ascii=False))
+        return 0
+    for m in matches:
+        (source_a, a), (source_b, b) = m.first, m.second
+        authors = "-" if m.authors is None else f"{m.authors:.2f}"
+        print(f"{m.score:.2f}  {m.kind:9}  {source_a}/{a.get('id')} -> {source_b}/{b.get('id')}"
+              f"  (title {m.title:.2f}, authors {authors})")
+        print(f"      {english(a.get('title'))}")
+        if english(b.get('title')) != english(a.get('title')):
+            print(f"      {english(b.get('title'))}")
+    print(f"{len(matches)} likely duplicates among {len(records)} records")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Atomic file writes for the generators' caches and outputs.
+
+Files are written to a temporary file next to the target and renamed over it
+(os.replace), so a parallel worker, a --watch rebuild or the dev server reads
+either the old file or the new one, never a partial file.
+"""
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def atomic_open(path):
+    """Binary file to write path's new contents to; path is replaced when the
+    block exits without an error, and left untouched otherwise."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def atomic_write(path, data):
+    """Replace path with data (bytes, or str written as UTF-8)."""
+    with atomic_open(path) as f:
+        f.write(data.encode("utf-8") if isinstance(data, str) else data)
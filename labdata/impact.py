@@ -0,0 +1,183 @@
+"""
+Journal-name index over IF.json, so a journal spelled differently from its
+IF.json key ('Materials & Design', 'Int. J. Plast.', a dropped 'The') still
+gets its impact factor.
+
+ImpactFactors builds one when IF.json is compiled; it is cached with the
+compiled data. lookup() tries, in order:
+
+    exact         the IF.json key itself                       score 1.0
+    normalized    same normalize.journal_key()                 score 1.0
+    abbreviation  every word a prefix of the journal's words,  score 0.8-1.0
+                  stop words aside ('J. Mater. Process. Technol.')
+    fuzzy         character-trigram Dice similarity >= 0.85,   score = similarity
+                  same series letters and numbers ('Part B')
+
+Only the first three are used unless fuzzy=True: a fuzzy hit can be another
+journal of the same family, so it is a suggestion to check (the command line
+prints it as a warning), not an impact factor to print. The first three are
+dict lookups. The fuzzy pass counts trigrams shared
+through posting lists, skipping trigrams common to more than
+MAX_POSTING journals, so its cost does not grow with the table; results are
+cached per name.
+
+    python -m labdata.impact "Int. J. Plast." "Materials & Design"
+    python -m labdata.impact          # how every journal in the data matched
+"""
+
+import argparse
+import sys
+from collections import Counter
+from dataclasses import dataclass
+
+from labdata.normalize import impact_factor, jcr_percent, journal_key
+from labdata.store import store
+
+STOP_WORDS = frozenset("a an and at for in of on the".split())
+FUZZY_MIN = 0.85      # lowest trigram similarity accepted as a match
+MAX_POSTING = 200     # trigrams in more journals than this don't pick candidates
+FUZZY_CANDIDATES = 5  # best-counted candidates whose similarity is computed
+
+
+@dataclass(frozen=True)
+class IFMatch:
+    """The IF.json entry a journal name resolved to."""
+    journal: str            # IF.json key
+    text: str               # its value, e.g. 'IF 10.7, JCR 3.6%'
+    impact: float           # impact factor, None when not given
+    jcr_percent: float      # JCR rank percentile, None when given as a quartile
+    how: str                # 'exact', 'normalized', 'abbreviation' or 'fuzzy'
+    score: float            # 1.0 for exact and normalized matches
+
+
+def _content_words(key):
+    return [w for w in key.split() if w not in STOP_WORDS]
+
+
+def _trigrams(key):
+    padded = f" {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _series(key):
+    """Single letters and numbers of a journal key: series ('engineering a'),
+    parts ('part b') and volumes, which must agree for a fuzzy match."""
+    return {w for w in key.split() if len(w) == 1 or w.isdigit()}
+
+
+def _dice(a, b):
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+class JournalIndex:
+    """Lookup tables over the journal names of an IF.json mapping."""
+
+    def __init__(self, table):
+        self.table = table
+        self.by_key, self.by_initials, self.postings = {}, {}, {}
+        for journal in table:
+            key = journal_key(journal)
+            if not key or key in self.by_key:
+                continue
+            self.by_key[key] = journal
+            words = _content_words(key)
+            self.by_initials.setdefault(tuple(w[0] for w in words), []).append((journal, words))
+            for gram in _trigrams(key):
+                self.postings.setdefault(gram, []).append(journal)
+        self._cache = {}
+
+    def __getstate__(self):
+        return {name: value for name, value in self.__dict__.items() if name != '_cache'}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state, _cache={})
+
+    def _match(self, journal, how, score):
+        text = self.table[journal]
+        return IFMatch(journal, text, impact_factor(text), jcr_percent(text), how, round(score, 3))
+
+    def lookup(self, name, fuzzy=False):
+        """IFMatch for a journal name, or None when nothing matches well enough;
+        fuzzy matches only when fuzzy is true."""
+        try:
+            match = self._cache[name]
+        except KeyError:
+            match = self._cache[name] = self._find(name)
+        except TypeError:  # unhashable
+            return None
+        return match if fuzzy or match is None or match.how != 'fuzzy' else None
+
+    def _find(self, name):
+        if name in self.table:
+            return self._match(name, 'exact', 1.0)
+        key = journal_key(name)
+        if not key:
+            return None
+        if key in self.by_key:
+            return self._match(self.by_key[key], 'normalized', 1.0)
+        return self._abbreviation(key) or self._fuzzy(key)
+
+    def _abbreviation(self, key):
+        words = _content_words(key)
+        if len(words) < 2:
+            return None
+        best, best_cover = None, 0.0
+        for journal, full in self.by_initials.get(tuple(w[0] for w in words), ()):
+            if all(f.startswith(w) for w, f in zip(words, full)):
+                cover = sum(map(len, words)) / sum(map(len, full))
+                if cover > best_cover:
+                    best, best_cover = journal, cover
+        return best and self._match(best, 'abbreviation', 0.8 + 0.2 * best_cover)
+
+    def _fuzzy(self, key):
+        grams, series = _trigrams(key), _series(key)
+        counts = Counter()
+        for gram in grams:
+            journals = self.postings.get(gram, ())
+            if len(journals) <= MAX_POSTING:
+                counts.update(journals)
+        best, best_score = None, FUZZY_MIN
+        for journal, _ in counts.most_common(FUZZY_CANDIDATES):
+            other = journal_key(journal)
+            if _series(other) != series:
+                continue
+            score = _dice(grams, _trigrams(other))
+            if score >= best_score:
+                best, best_score = journal, score
+        return best and self._match(best, 'fuzzy', best_score)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Look up journal names in IF.json.")
+    parser.add_argument('names', nargs='*',
+                        help="journal names (default: every journal in journals.json and preprints.json)")
+    args = parser.parse_args(argv)
+
+    try:
+        table = store.load('IF')
+        names = args.names or list(dict.fromkeys(
+            record.get('journal') for source in ('journals', 'preprints')
+            for record in store.load(source) if record.get('journal')))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    found = 0
+    for name in names:
+        match = table.lookup(name, fuzzy=True)
+        if match is None:
+            print(f"{'-':13}{name}: not in IF.json")
+            continue
+        if match.how == 'fuzzy':
+            print(f"warning: {name}: not in IF.json; did you mean {match.journal}? "
+                  f"(score {match.score}, not used in the CV)", file=sys.stderr)
+            continue
+        found += 1
+        if args.names or match.how != 'exact':
+            print(f"{match.how:13}{name} -> {match.journal} ({match.text}, score {match.score})")
+    print(f"{found} of {len(names)} journal names found in IF.json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
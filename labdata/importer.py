@@ -0,0 +1,440 @@
+"""
+Import a publications spreadsheet (e.g. 2026_publications.xlsx) into
+journals.json.
+
+    python -m labdata.importer 2026_publications.xlsx --dry-run --diff
+    python -m labdata.importer 2026_publications.xlsx
+
+The sheet is streamed row by row (stdlib zipfile + iterparse, no spreadsheet
+library). Expected columns: Title, Journal, Author1..AuthorN, optionally Year,
+Volume, Pages and DOI; the year defaults to the one in the file name. Each row
+is matched against journals.json through hash indexes on the normalized DOI
+and title (Journals.by_doi / by_title), so matching costs the same per row
+however long the file is. Rows are never held: the sheet is streamed once to
+learn names and once to merge, and only the changes are kept.
+
+Matched entries are updated only where the sheet differs (title, journal,
+author names, and volume/pages/DOI when given); ids, role markers ('^', '*')
+and other fields are kept. Korean author names are taken from the matched
+entry, or translated with the Korean/English pairs learned from matched rows
+and professor.json. Unmatched rows become new entries with the next pubN id;
+authors known as lab members get '^', and the sheet's 1저자/책임저자 flags are
+printed so '*' markers can be checked by hand.
+
+journals.json is rewritten atomically, with unchanged entries copied verbatim
+so a diff shows only the imported changes.
+"""
+
+import argparse
+import difflib
+import json
+import re
+import sys
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from xml.etree import ElementTree
+
+from labdata.authors import MARKERS, clean_author
+from labdata.files import atomic_write
+from labdata.normalize import normalize_doi, title_key
+from labdata.store import DATA_DIR
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+FIRST_AUTHOR_COLUMN = '1저자'    # O/X: the lab has the first author
+CORRESPONDING_COLUMN = '책임저자'  # O/X: the lab has a corresponding author
+
+# Optional sheet columns -> journals.json keys, in the file's key order.
+EXTRA_COLUMNS = [('Volume', 'volume'), ('Pages', 'pages'), ('DOI', 'doi')]
+
+
+# ---------------------------------------------------------------------------
+# Streaming xlsx reader
+# ---------------------------------------------------------------------------
+def _column_index(ref):
+    """'C12' -> 2."""
+    index = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - 64)
+    return index - 1
+
+
+def _text(elem):
+    """Concatenated <t> runs of a shared or inline string."""
+    return ''.join(t.text or '' for t in elem.iter(f"{MAIN_NS}t"))
+
+
+def _first_sheet(z):
+    """Zip path of the workbook's first worksheet."""
+    workbook = ElementTree.fromstring(z.read("xl/workbook.xml"))
+    sheet = workbook.find(f"{MAIN_NS}sheets/{MAIN_NS}sheet")
+    rel_id = sheet.get(f"{REL_NS}id")
+    for rel in ElementTree.fromstring(z.read("xl/_rels/workbook.xml.rels")).iter(f"{PKG_REL_NS}Relationship"):
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target")
+            return target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+    raise ValueError("workbook has no worksheet")
+
+
+def _shared_strings(z):
+    if "xl/sharedStrings.xml" not in z.namelist():
+        return []
+    strings = []
+    with z.open("xl/sharedStrings.xml") as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f"{MAIN_NS}si":
+                strings.append(_text(elem))
+                elem.clear()
+    return strings
+
+
+def _cell_value(cell, strings):
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return _text(cell)
+    value = cell.find(f"{MAIN_NS}v")
+    if value is None or value.text is None:
+        return None
+    if kind == "s":
+        return strings[int(value.text)]
+    if kind in ("str", "e"):
+        return value.text
+    if kind == "b":
+        return "TRUE" if value.text == "1" else "FALSE"
+    number = float(value.text)  # numbers: '218' rather than '218.0'
+    return str(int(number)) if number.is_integer() else value.text
+
+
+def read_rows(path):
+    """Cell values (str, None for empty cells) of each non-empty row of the
+    first worksheet, streamed: parsed rows are released as they are yielded."""
+    with zipfile.ZipFile(path) as z:
+        strings = _shared_strings(z)
+        with z.open(_first_sheet(z)) as f:
+            for _, elem in ElementTree.iterparse(f):
+                if elem.tag != f"{MAIN_NS}row":
+                    continue
+                values = []
+                for cell in elem.iter(f"{MAIN_NS}c"):
+                    column = _column_index(cell.get("r", "")) if cell.get("r") else len(values)
+                    values.extend([None] * (column - len(values) + 1))
+                    value = _cell_value(cell, strings)
+                    values[column] = value.strip() if isinstance(value, str) else value
+                elem.clear()
+                if any(values):
+                    yield values
+
+
+def read_publications(path):
+    """Each row with a title as {column name: value}, author columns gathered
+    into 'authors' in column order."""
+    rows = read_rows(path)
+    header = next(rows, None)
+    if header is None:
+        return
+    header = [str(name or '').strip() for name in header]
+    author_columns = sorted((int(m.group(1)), i) for i, name in enumerate(header)
+                            if (m := re.fullmatch(r'Author\s*(\d+)', name, re.I)))
+    for values in rows:
+        values += [None] * (len(header) - len(values))
+        row = {name: values[i] for i, name in enumerate(header) if name}
+        if not row.get('Title'):
+            continue
+        row['authors'] = [values[i] for _, i in author_columns if values[i]]
+        yield row
+
+
+# ---------------------------------------------------------------------------
+# Merge
+# ---------------------------------------------------------------------------
+def is_korean(name):
+    return any('가' <= ch <= '힣' for ch in name)
+
+
+@dataclass
+class Change:
+    kind: str                   # 'new' or 'changed'
+    entry: dict                 # the merged entry
+    position: int = None        # index of the replaced entry ('changed')
+    fields: list = field(default_factory=list)  # changed keys ('changed')
+    notes: list = field(default_factory=list)   # things to check by hand
+
+
+@dataclass
+class Journals:
+    """journals.json as text plus each entry's span in it, so entries can be
+    replaced without reformatting the others. Entries are decoded while the
+    text is scanned and then dropped, keeping only the DOI/title indexes
+    (key -> position); entry() decodes one again on demand."""
+    text: str
+    spans: list
+    by_doi: dict
+    by_title: dict
+    marked: set         # names that carry '^' somewhere in the file
+    next_number: int    # the number of the next pubN id
+
+    @classmethod
+    def parse(cls, text):
+        decoder = json.JSONDecoder()
+        spans, by_doi, by_title, marked, last = [], {}, {}, set(), 0
+        i = text.index('[') + 1
+        while True:
+            while text[i].isspace():
+                i += 1
+            if text[i] == ']':
+                break
+            entry, end = decoder.raw_decode(text, i)
+            position = len(spans)
+            spans.append((i, end))
+            if doi := normalize_doi(entry.get('doi')):
+                by_doi.setdefault(doi, position)
+            by_title.setdefault(title_key(entry.get('title')), position)
+            marked.update(clean_author(a) for a in entry.get('authors') or [] if '^' in a)
+            if match := re.search(r'\d+', str(entry.get('id', ''))):
+                last = max(last, int(match.group()))
+            i = end
+            while text[i].isspace():
+                i += 1
+            if text[i] == ',':
+                i += 1
+        return cls(text, spans, by_doi, by_title, marked, last + 1)
+
+    def entry(self, position):
+        start, end = self.spans[position]
+        return json.loads(self.text[start:end])
+
+    def find(self, row):
+        """Position of the entry a sheet row matches (DOI, then title), or None."""
+        doi = normalize_doi(row.get('DOI'))
+        position = self.by_doi.get(doi) if doi else None
+        return position if position is not None else self.by_title.get(title_key(row['Title']))
+
+    def render(self, changes):
+        """The file text with changed entries replaced and new ones appended."""
+        replaced = {c.position: c.entry for c in changes if c.kind == 'changed'}
+        parts, pos = [], 0
+        for i, (start, end) in enumerate(self.spans):
+            if i in replaced:
+                parts += [self.text[pos:start], _dump(replaced[i])]
+                pos = end
+        new = [c.entry for c in changes if c.kind == 'new']
+        if new:
+            last = self.spans[-1][1] if self.spans else self.text.index('[') + 1
+            parts.append(self.text[pos:last])
+            sep = ",\n    " if self.spans else "\n    "
+            parts.append("".join(sep + _dump(entry) for entry in new))
+            pos = last
+        parts.append(self.text[pos:])
+        return "".join(parts)
+
+
+def _dump(entry):
+    """An entry formatted like the file's (4-space indents, one level deep)."""
+    return json.dumps(entry, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+
+
+def _marked(name, original):
+    """name with the role markers of original (same person, other spelling)."""
+    return name + ''.join(ch for ch in original if ch in MARKERS)
+
+
+def learn_names(pairs, rows, journals):
+    """Add Korean -> English author names from rows that match existing
+    entries with the same number of authors."""
+    for row in rows:
+        position = journals.find(row)
+        if position is None:
+            continue
+        entry = journals.entry(position)
+        if len(entry.get('authors') or []) != len(row['authors']):
+            continue
+        for name, existing in zip(row['authors'], entry['authors']):
+            if is_korean(name):
+                pairs.setdefault(name, clean_author(existing))
+
+
+def merge(journals, rows, year, korean_names, lab_names):
+    """Changes that bring journals.json in line with the sheet rows, and a
+    Counter of the rows by outcome: 'new', 'changed', 'unchanged', or
+    'repeated' for a row matching an entry an earlier row already matched.
+    Rows are consumed one at a time; only the changes are kept."""
+    changes, counts = {}, Counter()  # position or new id -> Change
+    new_by_doi, new_by_title = {}, {}
+    seen = set()
+    next_number = journals.next_number
+    for row in rows:
+        position = journals.find(row)
+        if position is None:
+            doi, key = normalize_doi(row.get('DOI')), title_key(row['Title'])
+            pub_id = (new_by_doi.get(doi) if doi else None) or new_by_title.get(key)
+            if pub_id is not None:  # repeated row of a new entry
+                counts['repeated'] += 1
+                continue
+            change = _new(row, f"pub{next_number}", year, korean_names, lab_names)
+            next_number += 1
+            changes[change.entry['id']] = change
+            # Index the new entry, so a row repeated in the sheet is merged into it
+            new_by_title[key] = change.entry['id']
+            if change.entry.get('doi'):
+                new_by_doi[normalize_doi(change.entry['doi'])] = change.entry['id']
+            counts['new'] += 1
+            continue
+        change = _update(journals.entry(position), row, korean_names)
+        if position in seen:  # a repeated row updates its change
+            counts['repeated'] += 1
+        else:
+            seen.add(position)
+            counts['changed' if change is not None else 'unchanged'] += 1
+        if change is not None:
+            change.position = position
+            changes[position] = change
+    return list(changes.values()), counts
+
+
+def _update(existing, row, korean_names):
+    entry = dict(existing)
+    notes = []
+    if row['Title'] != existing.get('title') and title_key(row['Title']) != title_key(existing.get('title')):
+        entry['title'] = row['Title']
+    if row.get('Journal') and row['Journal'] != existing.get('journal'):
+        entry['journal'] = row['Journal']
+    old_authors = existing.get('authors') or []
+    if len(row['authors']) == len(old_authors):
+        # Same list: Korean names stand for the entry's; other spellings win
+        # but keep the markers of the author they replace
+        authors = [old if is_korean(name) or name == clean_author(old) else _marked(name, old)
+                   for name, old in zip(row['authors'], old_authors)]
+    else:
+        kept = {clean_author(old): old for old in old_authors}
+        authors = []
+        for name in row['authors']:
+            english = korean_names.get(name, name)
+            authors.append(kept.get(english, english))
+            if is_korean(english):
+                notes.append(f"no English name for {english}")
+        notes.append("author list changed: check the role markers")
+    if authors != old_authors:
+        entry['authors'] = authors
+    for column, key in EXTRA_COLUMNS:
+        if row.get(column) and row[column] != existing.get(key):
+            entry[key] = row[column]
+    fields = [key for key in entry if entry.get(key) != existing.get(key)]
+    if not fields:
+        return None
+    return Change('changed', entry, fields=fields, notes=notes)
+
+
+def _new(row, pub_id, year, korean_names, lab_names):
+    authors, notes = [], []
+    for name in row['authors']:
+        english = korean_names.get(name, name)
+        if is_korean(english):
+            notes.append(f"no English name for {english}")
+        authors.append(english + ('^' if english in lab_names else ''))
+    entry = {'id': pub_id, 'type': 'journal', 'title': row['Title'], 'authors': authors,
+             'journal': row.get('Journal') or '', 'year': int(row.get('Year') or year)}
+    for column, key in EXTRA_COLUMNS:
+        if row.get(column):
+            entry[key] = row[column]
+    entry['featured'] = False
+    flags = [f"{label} {row[column]}" for column, label in [(FIRST_AUTHOR_COLUMN, 'first author'),
+                                                          (CORRESPONDING_COLUMN, 'corresponding')]
+             if row.get(column)]
+    if flags:
+        notes.append(f"sheet: {', '.join(flags)}; add '*' markers by hand")
+    return Change('new', entry, notes=notes)
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+def lab_people(data_dir):
+    """The professor and members from professor.json / members.json."""
+    people = []
+    for filename in ("professor.json", "members.json"):
+        try:
+            data = json.loads((data_dir / filename).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if filename == "members.json":  # {group: [member, ...]}
+            data = [member for group in data.values() for member in group]
+        else:
+            data = [data]
+        people += [p for p in data if isinstance(p, dict) and p.get('name')]
+    return people
+
+
+def lab_names(people, journals):
+    """Names that get '^': the professor, members and anyone marked before."""
+    return journals.marked | {p['name'] for p in people}
+
+
+def korean_pairs(people):
+    """Korean -> English names of the lab people that have a 'ko' name."""
+    return {p['ko']['name']: p['name'] for p in people
+            if isinstance(p.get('ko'), dict) and p['ko'].get('name')}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('xlsx', type=Path, help="spreadsheet to import")
+    parser.add_argument('--journals', type=Path, default=DATA_DIR / "journals.json",
+                        help="file to merge into (default: src/data/journals.json)")
+    parser.add_argument('--year', type=int,
+                        help="year of new entries without a Year column (default: from the file name)")
+    parser.add_argument('--dry-run', action='store_true', help="report the changes without writing")
+    parser.add_argument('--diff', action='store_true', help="print a unified diff of journals.json")
+    args = parser.parse_args(argv)
+
+    year = args.year
+    if year is None:
+        match = re.match(r'(\d{4})', args.xlsx.name)
+        if not match:
+            parser.error("no year in the file name; pass --year")
+        year = int(match.group(1))
+
+    # journals.json is read whole (it is rewritten by splicing its text); the
+    # sheet is streamed twice, once to learn Korean names and once to merge.
+    people = lab_people(args.journals.parent)
+    names = korean_pairs(people)
+    try:
+        journals = Journals.parse(args.journals.read_text(encoding="utf-8"))
+        learn_names(names, read_publications(args.xlsx), journals)
+        changes, counts = merge(journals, read_publications(args.xlsx), year, names,
+                                lab_names(people, journals))
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile, ElementTree.ParseError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    for change in changes:
+        entry = change.entry
+        detail = f" ({', '.join(change.fields)})" if change.fields else ""
+        print(f"{change.kind:8} {entry['id']}: {entry['title'][:70]}{detail}")
+        for note in change.notes:
+            print(f"         ! {note}")
+    print(f"{sum(counts.values())} rows: {counts['new']} new, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged, {counts['repeated']} repeated")
+
+    if not changes:
+        return 0
+    text = journals.render(changes)
+    if args.diff:
+        sys.stdout.writelines(difflib.unified_diff(
+            journals.text.splitlines(keepends=True), text.splitlines(keepends=True),
+            fromfile=f"a/{args.journals.name}", tofile=f"b/{args.journals.name}"))
+    if args.dry_run:
+        print("dry run: nothing written")
+    else:
+        atomic_write(args.journals, text)
+        print(f"wrote {args.journals}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Typed values derived from data records.
+
+Compiled records (labdata.compiled.Record) carry these precomputed as
+attributes; for any other dict they are derived on the spot, so callers can
+use the functions below on either.
+"""
+
+import re
+import unicodedata
+
+_YEAR_MONTH = re.compile(r'(\d{4})(?:\.(\d{1,2}))?')
+_BILLION = re.compile(r'([\d.]+)B')
+_IMPACT_FACTOR = re.compile(r'IF\s*([\d.]+)')
+_JCR_PERCENT = re.compile(r'JCR\s*([\d.]+)\s*%')
+_NUMBER = re.compile(r'\d+')
+_WORD = re.compile(r'\w+')
+
+
+def english(value):
+    """value['en'] for {'en':.., 'ko':..} bilingual fields, else value itself."""
+    return value.get('en', value) if isinstance(value, dict) else value
+
+
+def record_year(record):
+    """Publication year as int (0 when missing); accepts 2024 or '2024.03'."""
+    try:
+        return record.year
+    except AttributeError:
+        pass
+    try:
+        return int(str(record.get('year') or 0)[:4] or 0)
+    except ValueError:
+        return 0
+
+
+def normalize_doi(doi):
+    """Lower-cased DOI without the resolver prefix, or '' when absent."""
+    doi = (doi or '').strip().lower()
+    for prefix in ('https://doi.org/', 'http://doi.org/', 'https://dx.doi.org/', 'doi:'):
+        if doi.startswith(prefix):
+            doi = doi[len(prefix):]
+    return doi
+
+
+def title_key(title):
+    """Title for matching entries: NFKC, case-folded, letters and digits only
+    (so '–' vs '-' or a trailing period don't matter)."""
+    text = unicodedata.normalize('NFKC', str(title or '')).casefold()
+    return ''.join(ch for ch in text if ch.isalnum())
+
+
+def journal_key(name):
+    """Journal name for matching: NFKC, case-folded, '&' read as 'and',
+    punctuation dropped, no leading 'The' ('The Journal of Mater. & Design' ->
+    'journal of mater and design')."""
+    text = unicodedata.normalize('NFKC', str(name or '')).casefold().replace('&', ' and ')
+    words = _WORD.findall(text)
+    if words[:1] == ['the'] and len(words) > 1:
+        words = words[1:]
+    return ' '.join(words)
+
+
+def pub_sort_key(record):
+    """Newest year first, then highest id number first: (-year, -number)."""
+    try:
+        return record.sort_key
+    except AttributeError:
+        pass
+    match = _NUMBER.search(record.get('id') or '')
+    return (-record_year(record), -int(match.group()) if match else 0)
+
+
+def funding_billion(record):
+    """Funding amount in billions of KRW ('30.5B KRW' -> 30.5), 0.0 when absent
+    or unreadable."""
+    try:
+        return record.funding
+    except AttributeError:
+        pass
+    if not record.get('fundingAmount'):
+        return 0.0
+    match = _BILLION.search(str(english(record['fundingAmount'])))
+    try:
+        return float(match.group(1)) if match else 0.0
+    except ValueError:
+        return 0.0
+
+
+def parse_period(text):
+    """('2021.03 - 2025.12') -> ((2021, 3), (2025, 12)); month 0 when not given,
+    end None when the period is open ('2023.3-Present') or has a single date,
+    start None when there is no year at all."""
+    dates = [(int(year), int(month or 0)) for year, month in _YEAR_MONTH.findall(str(text or ''))]
+    return (dates[0] if dates else None), (dates[1] if len(dates) > 1 else None)
+
+
+def period_dates(record):
+    """(start, end) of a record's 'period' as parse_period() gives them."""
+    try:
+        return record.start, record.end
+    except AttributeError:
+        return parse_period(english(record.get('period')))
+
+
+def start_year(record):
+    """First year of a record's period, or 0 (used for sorting)."""
+    start, _ = period_dates(record)
+    return start[0] if start else 0
+
+
+def impact_factor(text):
+    """The impact factor in an IF.json value ('IF 10.7, JCR 3.6%' -> 10.7), or None."""
+    match = _IMPACT_FACTOR.search(str(text or ''))
+    try:
+        return float(match.group(1)) if match else None
+    except ValueError:
+        return None
+
+
+def jcr_percent(text):
+    """The JCR rank percentile in an IF.json value ('IF 10.7, JCR 3.6%' -> 3.6),
+    or None; lower is better (3.6 = top 3.6%)."""
+    match = _JCR_PERCENT.search(str(text or ''))
+    try:
+        return float(match.group(1)) if match else None
+    except ValueError:
+        return None
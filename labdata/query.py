@@ -0,0 +1,376 @@
+"""
+SQLite query engine over the publication and grant data.
+
+The journal, conference, preprint, project and impact-factor files are loaded
+into an indexed SQLite database next to the compiled cache (labdata/.cache/).
+Before each query, a table whose source file changed (mtime or size) is
+reloaded; the others are left alone.
+
+    from labdata.query import LabDB
+    db = LabDB()
+    db.publications(person="Ho Won Lee", corresponding=True, since=2020, max_jcr=10)
+    db.grants(roles=("PI",), status="ongoing", min_funding=1.0)
+    db.sql("SELECT year, count(*) AS n FROM publications GROUP BY year")
+
+Rows are sqlite3.Row; db.records(rows) maps them back to the loaded records.
+Author names match like the CV's highlighting does: case-insensitive
+substring of the listed name.
+
+    python -m labdata.query "SELECT venue, count(*) FROM publications GROUP BY venue"
+    python -m labdata.query --publications --person "Ho Won Lee" --corresponding --since 2020 --max-jcr 10
+    python -m labdata.query --grants --role PI --status ongoing --min-funding 1
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+from labdata.authors import parse_authors
+from labdata.normalize import english, funding_billion, normalize_doi, period_dates, pub_sort_key, record_year
+from labdata.store import store as default_store
+
+# Bump when the schema or what is loaded changes; older databases are rebuilt.
+SCHEMA_VERSION = 3
+
+PUBLICATION_SOURCES = ('journals', 'conferences', 'preprints')
+
+SCHEMA = """
+CREATE TABLE sources (name TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE publications (
+    source TEXT NOT NULL,        -- data file: journals, conferences or preprints
+    position INTEGER NOT NULL,   -- index in that file
+    id TEXT, type TEXT, title TEXT,
+    venue TEXT,                  -- journal, or conference name
+    if_journal TEXT,             -- IF.json key the journal matched (ImpactFactors.lookup)
+    year INTEGER NOT NULL,       -- 0 when missing
+    number INTEGER NOT NULL,     -- number in the id ('pub12' -> 12), for ordering
+    status TEXT NOT NULL,        -- lower-cased, '' for published entries
+    doi TEXT NOT NULL,           -- normalized, '' when absent
+    PRIMARY KEY (source, position)
+);
+CREATE INDEX publications_year ON publications (source, year);
+CREATE INDEX publications_status ON publications (status);
+CREATE INDEX publications_venue ON publications (venue);
+CREATE INDEX publications_doi ON publications (doi);
+CREATE INDEX publications_if_journal ON publications (if_journal);
+CREATE TABLE authors (
+    source TEXT NOT NULL, position INTEGER NOT NULL,  -- the publication
+    rank INTEGER NOT NULL,       -- 0 = first author
+    name TEXT NOT NULL,          -- without role markers
+    key TEXT NOT NULL,           -- lower-cased name, for matching
+    corresponding INTEGER NOT NULL
+);
+CREATE INDEX authors_publication ON authors (source, position);
+CREATE INDEX authors_key ON authors (key);
+CREATE TABLE projects (
+    source TEXT NOT NULL, position INTEGER NOT NULL,
+    id TEXT, title TEXT, title_ko TEXT,
+    role TEXT NOT NULL,          -- upper-cased English role ('PI', 'CO-PI', ...)
+    agency TEXT,
+    funding REAL NOT NULL,       -- billions of KRW, 0 when absent
+    start_year INTEGER NOT NULL, start_month INTEGER NOT NULL,  -- 0 when unknown
+    end_year INTEGER, end_month INTEGER,                        -- NULL while open
+    status TEXT NOT NULL,
+    PRIMARY KEY (source, position)
+);
+CREATE INDEX projects_status ON projects (status, role);
+CREATE INDEX projects_funding ON projects (funding);
+CREATE TABLE impact_factors (
+    journal TEXT PRIMARY KEY,
+    impact REAL,                 -- NULL when not given
+    jcr_percent REAL             -- JCR rank percentile, lower is better
+);
+CREATE VIEW publications_if AS
+    SELECT p.*, f.impact, f.jcr_percent
+    FROM publications p LEFT JOIN impact_factors f ON f.journal = p.if_journal;
+"""
+
+
+def _publication_rows(name, records, impact_factors):
+    pubs, authors = [], []
+    for position, r in enumerate(records):
+        doi = getattr(r, 'doi_key', None)
+        if doi is None:
+            doi = normalize_doi(r.get('doi'))
+        match = impact_factors.lookup(r['journal']) if impact_factors and r.get('journal') else None
+        pubs.append((name, position, r.get('id'), r.get('type'), r.get('title'),
+                     r.get('journal', r.get('Conference Name')), match and match.journal,
+                     record_year(r), -pub_sort_key(r)[1], (r.get('status') or '').lower(), doi))
+        authors.extend((name, position, a.position, a.name, a.key, int(a.corresponding))
+                       for a in parse_authors(r.get('authors')))
+    return pubs, authors
+
+
+def _project_rows(name, records):
+    rows = []
+    for position, r in enumerate(records):
+        start, end = period_dates(r)
+        title = r.get('title')
+        rows.append((name, position, r.get('id'), english(title),
+                     title.get('ko') if isinstance(title, dict) else None,
+                     str(english(r.get('role')) or '').upper(), english(r.get('fundingAgency')),
+                     funding_billion(r), *(start or (0, 0)), *(end or (None, None)),
+                     (r.get('status') or '').lower()))
+    return rows
+
+
+class _GivenRecords:
+    """Record lists in memory, in the place of a DataStore (see LabDB.over)."""
+
+    def __init__(self, data):
+        self.data = data
+
+    def load(self, name):
+        try:
+            return self.data[name]
+        except KeyError:
+            raise OSError(f"no {name} records given") from None
+
+    def stamp(self, name):
+        self.load(name)
+        return (0, 0)  # never changes: loaded once per connection
+
+
+class LabDB:
+    """The query database of one DataStore. path=None puts it in the store's
+    compiled cache directory (in memory when that is disabled)."""
+
+    def __init__(self, store=default_store, path=None):
+        self.store = store
+        if path is None:
+            cache = store.compiled.dir
+            path = ':memory:' if cache is None else cache / 'lab.sqlite'
+        self.path = path
+        self._conn, self._pid = None, None
+
+    @classmethod
+    def over(cls, **data):
+        """In-memory database over record lists the caller already holds, e.g.
+        LabDB.over(projects=records), instead of the store's files; sources
+        not given are empty."""
+        return cls(_GivenRecords(data), ':memory:')
+
+    @property
+    def conn(self):
+        # A connection must not cross a fork (parallel CV workers).
+        if self._conn is None or self._pid != os.getpid():
+            if self.path != ':memory:':
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                self._create(conn)
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    @staticmethod
+    def _create(conn):
+        """(Re)create the schema, unless another process just did."""
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            for kind, name in conn.execute("SELECT type, name FROM sqlite_master WHERE type IN "
+                                           "('view', 'table') AND name NOT LIKE 'sqlite_%'").fetchall():
+                conn.execute(f"DROP {kind} IF EXISTS {name}")
+            for statement in SCHEMA.split(';'):
+                if statement.strip():
+                    conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+
+    def _stamps(self, names):
+        stamps = {}
+        for name in names:
+            try:
+                stamps[name] = self.store.stamp(name)
+            except OSError:
+                stamps[name] = None
+        return stamps
+
+    def refresh(self):
+        """Reload the tables of every source file that changed since it was
+        last loaded; returns their names."""
+        names = PUBLICATION_SOURCES + ('projects', 'IF')
+        current = self._stamps(names)
+        loaded = {row['name']: (row['mtime_ns'], row['size'])
+                  for row in self.conn.execute("SELECT * FROM sources")}
+        stale = [name for name in names if current[name] != loaded.get(name)]
+        if 'IF' in stale:  # publications hold the IF.json key their journal matched
+            stale = list(dict.fromkeys(PUBLICATION_SOURCES + tuple(stale)))
+        if not stale:
+            return []
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for name in stale:
+                self._reload(conn, name, current[name] is not None)
+                if current[name] is None:
+                    conn.execute("DELETE FROM sources WHERE name = ?", (name,))
+                else:
+                    conn.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?)", (name, *current[name]))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return stale
+
+    def _reload(self, conn, name, exists):
+        if name == 'IF':
+            conn.execute("DELETE FROM impact_factors")
+            if exists:
+                table = self.store.load(name)
+                conn.executemany("INSERT INTO impact_factors VALUES (?, ?, ?)",
+                                 [(journal, table.impact[journal], table.jcr[journal]) for journal in table])
+        elif name == 'projects':
+            conn.execute("DELETE FROM projects WHERE source = ?", (name,))
+            if exists:
+                conn.executemany(f"INSERT INTO projects VALUES ({', '.join('?' * 13)})",
+                                 _project_rows(name, self.store.load(name)))
+        else:
+            conn.execute("DELETE FROM publications WHERE source = ?", (name,))
+            conn.execute("DELETE FROM authors WHERE source = ?", (name,))
+            if exists:
+                pubs, authors = _publication_rows(name, self.store.load(name), self._impact_factors())
+                conn.executemany(f"INSERT INTO publications VALUES ({', '.join('?' * 11)})", pubs)
+                conn.executemany("INSERT INTO authors VALUES (?, ?, ?, ?, ?, ?)", authors)
+
+    def _impact_factors(self):
+        try:
+            return self.store.load('IF')
+        except (OSError, ValueError):
+            return None
+
+    def sql(self, query, params=()):
+        """Rows of any query over the (refreshed) tables."""
+        self.refresh()
+        return self.conn.execute(query, params).fetchall()
+
+    def publications(self, source='journals', person=None, first=False, corresponding=False,
+                     since=None, until=None, status='', max_jcr=None, min_if=None):
+        """Publications of one source file, newest first. person limits them to
+        entries listing that author; first/corresponding additionally require
+        that role. status is the lower-cased status ('' = published, None = any);
+        max_jcr/min_if filter on the venue's impact factor."""
+        where, params = ["p.source = ?"], [source]
+        if person is not None:
+            role = "".join([" AND a.rank = 0" if first else "",
+                            " AND a.corresponding" if corresponding else ""])
+            where.append("EXISTS (SELECT 1 FROM authors a WHERE a.source = p.source AND "
+                         f"a.position = p.position AND instr(a.key, ?) > 0{role})")
+            params.append(person.lower())
+        for clause, value in [("p.year >= ?", since), ("p.year <= ?", until), ("p.status = ?", status),
+                              ("p.jcr_percent <= ?", max_jcr), ("p.impact >= ?", min_if)]:
+            if value is not None:
+                where.append(clause)
+                params.append(value)
+        return self.sql(f"SELECT p.* FROM publications_if p WHERE {' AND '.join(where)} "
+                        "ORDER BY p.year DESC, p.number DESC, p.position", params)
+
+    @staticmethod
+    def _grant_filter(roles, status, min_funding):
+        where, params = ["1"], []
+        if roles:
+            where.append(f"role IN ({', '.join('?' * len(roles))})")
+            params.extend(role.upper() for role in roles)
+        if status is not None:
+            where.append("status = ?")
+            params.append(status.lower())
+        if min_funding is not None:
+            where.append("funding >= ?")
+            params.append(min_funding)
+        return " AND ".join(where), params
+
+    def grants(self, roles=None, status=None, min_funding=None):
+        """Projects with one of roles (e.g. ('PI', 'CO-PI')), a status and at
+        least min_funding billion KRW, latest start first (file order within
+        a year)."""
+        where, params = self._grant_filter(roles, status, min_funding)
+        return self.sql(f"SELECT * FROM projects WHERE {where} ORDER BY start_year DESC, position", params)
+
+    def grant_totals(self, roles=None, status=None, min_funding=None):
+        """Row(count, funding, first_year) over the projects grants() selects:
+        funding in billions of KRW, first_year the earliest start (0 when none)."""
+        where, params = self._grant_filter(roles, status, min_funding)
+        return self.sql("SELECT count(*) AS count, total(funding) AS funding, "
+                        f"coalesce(min(start_year), 0) AS first_year FROM projects WHERE {where}", params)[0]
+
+    def records(self, rows):
+        """The loaded records the rows were built from."""
+        return [self.store.load(row['source'])[row['position']] for row in rows]
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+def status_filter(text, default):
+    """CLI --status value: None for 'any', default when not given."""
+    if text is None:
+        return default
+    return None if text.lower() == 'any' else text.lower()
+
+
+def print_rows(rows, as_json=False):
+    if as_json:
+        print(json.dumps([dict(row) for row in rows], ensure_ascii=False, indent=2))
+        return
+    if rows:
+        print("\t".join(rows[0].keys()))
+    for row in rows:
+        print("\t".join("" if v is None else str(v) for v in row))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the lab's publication and grant data with SQL.")
+    parser.add_argument('query', nargs='?', help="SQL to run (tables: publications, authors, projects, "
+                                                  "impact_factors; view: publications_if)")
+    parser.add_argument('--publications', nargs='?', const='journals', choices=PUBLICATION_SOURCES,
+                        metavar='SOURCE', help="list publications (default source: journals)")
+    parser.add_argument('--grants', action='store_true', help="list projects")
+    parser.add_argument('--person', help="author name (case-insensitive substring)")
+    parser.add_argument('--first', action='store_true', help="person is first author")
+    parser.add_argument('--corresponding', action='store_true', help="person is corresponding author")
+    parser.add_argument('--since', type=int, metavar='YEAR')
+    parser.add_argument('--until', type=int, metavar='YEAR')
+    parser.add_argument('--status', help="status to match, or 'any' (publications default to published "
+                                         "entries, projects to any status)")
+    parser.add_argument('--max-jcr', type=float, metavar='PERCENT', help="JCR rank within the top PERCENT")
+    parser.add_argument('--min-if', type=float, metavar='IF', help="impact factor at least IF")
+    parser.add_argument('--role', action='append', help="project role, repeatable (PI, CO-PI, ...)")
+    parser.add_argument('--min-funding', type=float, metavar='BILLION', help="funding in billions of KRW")
+    parser.add_argument('--schema', action='store_true', help="print the schema")
+    parser.add_argument('--json', action='store_true', help="print rows as JSON")
+    args = parser.parse_args(argv)
+
+    db = LabDB()
+    try:
+        if args.schema:
+            db.refresh()
+            for (sql,) in db.conn.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL"):
+                print(sql + ";")
+            return 0
+        if args.publications:
+            rows = db.publications(args.publications, person=args.person, first=args.first,
+                                   corresponding=args.corresponding, since=args.since, until=args.until,
+                                   status=status_filter(args.status, default=''),
+                                   max_jcr=args.max_jcr, min_if=args.min_if)
+        elif args.grants:
+            rows = db.grants(roles=args.role, status=status_filter(args.status, default=None),
+                             min_funding=args.min_funding)
+        elif args.query:
+            rows = db.sql(args.query)
+        else:
+            parser.error("give a query, --publications, --grants or --schema")
+    except sqlite3.Error as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db.close()
+    print_rows(rows, args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+In-process cache and indexes over src/data/*.json.
+
+Files are loaded lazily on first use, in their compiled form (labdata.compiled),
+and reloaded only when their mtime or size changes. Loaded data and indexes
+are shared between callers and must be treated as read-only.
+"""
+
+import functools
+import os
+import threading
+from pathlib import Path
+
+from labdata.authors import AuthorIndex
+from labdata.compiled import CACHE_DIR, CompiledCache
+from labdata.normalize import normalize_doi, record_year, title_key
+
+# LABDATA_DIR points the tools at another copy of the data (e.g. synthetic
+# data for benchmarks).
+DATA_DIR = Path(os.environ.get("LABDATA_DIR") or Path(__file__).resolve().parent.parent / "src" / "data")
+
+
+class RecordIndex:
+    """Lookup tables over a list of records, built in one pass.
+
+    by_id, by_doi and by_title (normalize.title_key) map to a single record;
+    by_year, by_status and by_type map to lists in file order. Status is
+    lower-cased, with '' for records that have none (published entries); year
+    is record_year() (0 when missing)."""
+
+    def __init__(self, records):
+        self.records = records
+        self.by_id, self.by_doi, self.by_title = {}, {}, {}
+        self.by_year, self.by_status, self.by_type = {}, {}, {}
+        for record in records:
+            if record.get('id'):
+                self.by_id[record['id']] = record
+            doi = getattr(record, 'doi_key', None)
+            if doi is None:
+                doi = normalize_doi(record.get('doi'))
+            if doi:
+                self.by_doi.setdefault(doi, record)
+            title = title_key(record.get('title'))
+            if title:
+                self.by_title.setdefault(title, record)
+            self.by_year.setdefault(record_year(record), []).append(record)
+            self.by_status.setdefault((record.get('status') or '').lower(), []).append(record)
+            self.by_type.setdefault(record.get('type') or '', []).append(record)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    @functools.cached_property
+    def authors(self):
+        """AuthorIndex over the records, built on first use."""
+        return AuthorIndex(self.records)
+
+    def years(self, reverse=False):
+        """Years that have records (0 excluded), sorted."""
+        return sorted((y for y in self.by_year if y), reverse=reverse)
+
+    def status(self, *names):
+        """Records whose status is one of names, in file order."""
+        if len(names) == 1:
+            return self.by_status.get(names[0], [])
+        wanted = set(names)
+        return [r for r in self.records if (r.get('status') or '').lower() in wanted]
+
+
+class DataStore:
+    """Lazily loaded, mtime-validated cache of the JSON files in one directory.
+    cache_dir is where their compiled form is kept (None: in memory only)."""
+
+    def __init__(self, root=DATA_DIR, cache_dir=CACHE_DIR):
+        self.root = Path(root)
+        self.compiled = CompiledCache(self.root, cache_dir)
+        self._lock = threading.Lock()
+        self._files = {}    # name -> (stamp, data)
+        self._indexes = {}  # name -> (stamp, RecordIndex)
+
+    def path(self, name):
+        return self.root / f"{name}.json"
+
+    def stamp(self, name):
+        """(mtime_ns, size) of <name>.json; raises OSError when it is missing."""
+        st = os.stat(self.path(name))
+        return st.st_mtime_ns, st.st_size
+
+    def load(self, name):
+        """Compiled contents of <name>.json. Raises OSError / ValueError like
+        open() and json.load() when the file is missing or malformed."""
+        stamp = self.stamp(name)
+        with self._lock:
+            cached = self._files.get(name)
+            if cached and cached[0] == stamp:
+                return cached[1]
+            data = self.compiled.load(name, stamp)
+            self._files[name] = (stamp, data)
+        return data
+
+    def index(self, name):
+        """RecordIndex over a list-valued <name>.json, rebuilt when it changes."""
+        data = self.load(name)
+        with self._lock:
+            cached = self._indexes.get(name)
+            if cached and cached[0] is data:
+                return cached[1]
+        idx = RecordIndex(data)
+        with self._lock:
+            self._indexes[name] = (data, idx)
+        return idx
+
+    def invalidate(self, name=None):
+        """Forget one file (or everything) regardless of mtime."""
+        with self._lock:
+            for table in (self._files, self._indexes):
+                if name is None:
+                    table.clear()
+                else:
+                    table.pop(name, None)
+            self.compiled.forget(name)
+
+
+# Process-wide default store over src/data.
+store = DataStore()
@@ -0,0 +1,109 @@
+"""
+Optional build tracing in the Chrome trace-event format, viewable in
+https://ui.perfetto.dev or chrome://tracing.
+
+    from labdata import trace
+    trace.enable()
+    with trace.span("load_cv_data"):
+        ...
+    trace.counter("pdf", pages=12, bytes=81234)
+    trace.write("trace.json")
+
+Spans nest by time on each thread. While tracing is disabled (the default),
+span() and counter() only check a flag. Timestamps come from the system-wide
+monotonic clock, so events recorded in worker processes line up with the
+parent's after merge().
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+_events = None  # list of trace events while enabled
+_lock = threading.Lock()
+_named_threads = set()
+
+
+def enabled():
+    return _events is not None
+
+
+def enable(process_name=None):
+    """Start recording in this process (idempotent)."""
+    global _events
+    if _events is None:
+        _events = []
+        _meta("process_name", os.getpid(), 0, process_name or os.path.basename(sys.argv[0]) or "python")
+
+
+def _now_us():
+    return time.perf_counter_ns() / 1000
+
+
+def _meta(kind, pid, tid, name):
+    _events.append({"ph": "M", "name": kind, "pid": pid, "tid": tid, "args": {"name": name}})
+
+
+def _record(event):
+    pid, tid = os.getpid(), threading.get_ident()
+    event["pid"], event["tid"] = pid, tid
+    with _lock:
+        if _events is None:
+            return
+        if (pid, tid) not in _named_threads:
+            _named_threads.add((pid, tid))
+            _meta("thread_name", pid, tid, threading.current_thread().name)
+        _events.append(event)
+
+
+@contextlib.contextmanager
+def _span(name, cat, args):
+    start = _now_us()
+    try:
+        yield args
+    finally:
+        _record({"ph": "X", "name": name, "cat": cat, "ts": start, "dur": _now_us() - start,
+                 "args": args})
+
+
+def span(name, cat="build", **args):
+    """Context manager timing a block. It yields the args dict, so values
+    known only at the end (sizes, counts) can still be attached."""
+    if _events is None:
+        return contextlib.nullcontext({})
+    return _span(name, cat, args)
+
+
+def counter(name, **values):
+    """Counter sample(s), e.g. counter("pdf", pages=3)."""
+    if _events is not None:
+        _record({"ph": "C", "name": name, "ts": _now_us(), "args": values})
+
+
+def drain():
+    """Events recorded so far (and forget them), e.g. to return them from a
+    worker process."""
+    global _events
+    with _lock:
+        events, _events = _events or [], ([] if _events is not None else None)
+        _named_threads.clear()
+    return events
+
+
+def merge(events):
+    """Add events recorded elsewhere (another process)."""
+    if _events is not None and events:
+        with _lock:
+            _events.extend(events)
+
+
+def write(path):
+    """Write everything recorded so far as a trace JSON file."""
+    with _lock:
+        events = list(_events or [])
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return path
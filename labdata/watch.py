@@ -0,0 +1,71 @@
+"""
+Polling watcher behind the generators' --watch modes (no extra dependency).
+
+Each generator declares which data files every artifact reads; after a burst
+of edits settles, only the artifacts depending on a changed file are rebuilt,
+in the same warm process.
+"""
+
+import os
+import time
+
+from labdata.store import DATA_DIR
+
+
+def snapshot(root, names):
+    """{name: (mtime_ns, size)} for the files, None for missing ones."""
+    stamps = {}
+    for name in names:
+        try:
+            st = os.stat(os.path.join(root, name))
+            stamps[name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            stamps[name] = None
+    return stamps
+
+
+def affected(deps, changed):
+    """Artifacts (in deps order) that read any of the changed files."""
+    changed = set(changed)
+    return [artifact for artifact, files in deps.items() if changed.intersection(files)]
+
+
+def watch(deps, rebuild, root=DATA_DIR, debounce=0.3, interval=0.1):
+    """Call rebuild(artifacts, changed_files) whenever files that artifacts
+    depend on change, until interrupted (Ctrl-C).
+
+    deps maps each artifact to the data file names it reads. A change is acted
+    on once the files have been quiet for `debounce` seconds, so an editor's
+    save (or a script rewriting several files) triggers one rebuild. Errors
+    from rebuild, including SystemExit from input validation, are reported
+    and watching continues."""
+    names = sorted({name for files in deps.values() for name in files})
+    seen = snapshot(root, names)
+    print(f"watching {len(names)} file(s) in {root} (Ctrl-C to stop)", flush=True)
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(root, names)
+            if current == seen:
+                continue
+            quiet_since = time.monotonic()
+            while time.monotonic() - quiet_since < debounce:
+                time.sleep(interval)
+                latest = snapshot(root, names)
+                if latest != current:
+                    current, quiet_since = latest, time.monotonic()
+            changed = [name for name in names if current[name] != seen[name]]
+            seen = current
+            targets = affected(deps, changed)
+            if not targets:
+                continue
+            print(f"changed: {', '.join(changed)} -> rebuilding {', '.join(map(str, targets))}", flush=True)
+            start = time.perf_counter()
+            try:
+                rebuild(targets, changed)
+            except (Exception, SystemExit) as e:
+                print(f"rebuild failed: {type(e).__name__}: {e}", flush=True)
+                continue
+            print(f"done in {time.perf_counter() - start:.2f} s", flush=True)
+    except KeyboardInterrupt:
+        print("stopped watching")